@@ -1,101 +1,158 @@
 import argparse
+import math
+import sys
 
-from conflict_math import compute_conflict_geometry, compute_initial_positions_type2
-from plan_writer import (
-    write_plan_file,
-    write_waypoints_file,
-    write_kml_file,
-    write_combined_kml_file
+from conflict_math import (
+    compute_conflict_geometry,
+    compute_initial_positions_type2,
+    print_conflict_summary
 )
-from yaml_writer import write_yaml_file
-from units import ft_to_m, m_to_ft, kt_to_mps, mps_to_kt, fpm_to_mps
+from bundle import ScenarioBundle, build_scenario_bundle
+from units import ft_to_m, m_to_ft, kt_to_mps, mps_to_kt, fpm_to_mps, mmss_to_sec
 
-def mmss_to_sec(mmss):
-    m, s = mmss.split(":")
-    return int(m) * 60 + int(s)
 
 # =========================================================
 # ARGUMENTS
 # =========================================================
 
-parser = argparse.ArgumentParser()
+# Options given as mm:ss text
+TIME_OPTIONS = ("tcpa", "post_cpa")
 
-parser.add_argument("--mode", default="type1")
 
-parser.add_argument("--os_callsign", default="OWN01")
-parser.add_argument("--tgt_callsign", default="TGT01")
+def build_parser(exit_on_error=True):
 
-parser.add_argument("--tcpa", default="01:00")
-parser.add_argument("--post_cpa", default="10:00")
+    parser = argparse.ArgumentParser(exit_on_error=exit_on_error)
 
-parser.add_argument("--cpa", type=float, default=20)
+    parser.add_argument("--mode", default="type1")
 
-parser.add_argument("--os_lat", type=float)
-parser.add_argument("--os_lon", type=float)
+    parser.add_argument("--os_callsign", default="OWN01")
+    parser.add_argument("--tgt_callsign", default="TGT01")
 
-parser.add_argument("--os_alt", type=float, default=50)
-parser.add_argument("--os_course", type=float, default=90)
-parser.add_argument("--os_speed", type=float, default=20)
-parser.add_argument("--os_vspeed", type=float, default=1)
+    parser.add_argument("--tcpa", default="01:00")
+    parser.add_argument("--post_cpa", default="10:00")
 
-parser.add_argument("--rel_speed", type=float, default=10)
+    parser.add_argument("--cpa", type=float, default=20)
 
-# ✅ NEW (only addition)
-parser.add_argument("--tgt_speed", type=float, default=None)
+    parser.add_argument("--os_lat", type=float)
+    parser.add_argument("--os_lon", type=float)
 
-parser.add_argument("--conflict_dh", type=float, default=30)
-parser.add_argument("--tgt_alto", type=float, default=20)
-parser.add_argument("--relative_heading", type=float, default=95)
+    parser.add_argument("--os_alt", type=float, default=50)
+    parser.add_argument("--os_course", type=float, default=90)
+    parser.add_argument("--os_speed", type=float, default=20)
+    parser.add_argument("--os_vspeed", type=float, default=1)
 
-# TYPE 2 INPUTS
-parser.add_argument("--os_start_lat", type=float)
-parser.add_argument("--os_start_lon", type=float)
-parser.add_argument("--os_end_lat", type=float)
-parser.add_argument("--os_end_lon", type=float)
+    parser.add_argument("--rel_speed", type=float, default=10)
 
-parser.add_argument("--tgt_start_lat", type=float)
-parser.add_argument("--tgt_start_lon", type=float)
-parser.add_argument("--tgt_end_lat", type=float)
-parser.add_argument("--tgt_end_lon", type=float)
+    # ✅ NEW (only addition)
+    parser.add_argument("--tgt_speed", type=float, default=None)
 
-parser.add_argument("--cpa_lat", type=float)
-parser.add_argument("--cpa_lon", type=float)
+    parser.add_argument("--conflict_dh", type=float, default=30)
+    parser.add_argument("--tgt_alto", type=float, default=20)
+    parser.add_argument("--relative_heading", type=float, default=95)
 
-args = parser.parse_args()
+    # TYPE 2 INPUTS
+    parser.add_argument("--os_start_lat", type=float)
+    parser.add_argument("--os_start_lon", type=float)
+    parser.add_argument("--os_end_lat", type=float)
+    parser.add_argument("--os_end_lon", type=float)
 
-# =========================================================
-# CONVERSIONS
-# =========================================================
+    parser.add_argument("--tgt_start_lat", type=float)
+    parser.add_argument("--tgt_start_lon", type=float)
+    parser.add_argument("--tgt_end_lat", type=float)
+    parser.add_argument("--tgt_end_lon", type=float)
+
+    parser.add_argument("--cpa_lat", type=float)
+    parser.add_argument("--cpa_lon", type=float)
+
+    # Compressed / compact outputs
+    parser.add_argument("--compact_json", action="store_true", help="Plan JSON without indentation")
+    parser.add_argument("--kmz", action="store_true", help="Write KML files as KMZ")
+    parser.add_argument("--archive", default=None, help="Write everything into one .zip / .tar.gz / .tar.xz")
+
+    # Mission path conditioning (see path_tools.py)
+    parser.add_argument("--simplify_tol_ft", type=float, default=None, help="Douglas-Peucker cross-track tolerance")
+    parser.add_argument("--max_leg_ft", type=float, default=None, help="Split mission legs longer than this")
+
+    # Reuse files from an earlier run with identical inputs
+    parser.add_argument("--cache_dir", default=None)
+    parser.add_argument("--cache_max_mb", type=float, default=256)
 
-tcpa_sec = mmss_to_sec(args.tcpa)
-post_cpa_sec = mmss_to_sec(args.post_cpa)
+    return parser
 
 # =========================================================
-# TYPE SWITCH
+# SCENARIO
 # =========================================================
 
-if args.mode == "type1":
+# Position options each mode cannot do without (no defaults)
+TYPE1_POSITION_OPTIONS = ("os_lat", "os_lon")
+TYPE2_POSITION_OPTIONS = (
+    "cpa_lat", "cpa_lon",
+    "os_start_lat", "os_start_lon", "os_end_lat", "os_end_lon",
+    "tgt_start_lat", "tgt_start_lon", "tgt_end_lat", "tgt_end_lon",
+)
 
-    points = compute_conflict_geometry(
-        tcpa_sec=tcpa_sec,
-        cpa_horiz_m=ft_to_m(args.cpa),
-        os_lat_deg=args.os_lat,
-        os_lon_deg=args.os_lon,
-        os_alt_m=ft_to_m(args.os_alt),
-        os_course_deg=args.os_course,
-        os_speed_mps=kt_to_mps(args.os_speed),
-        os_vspeed_mps=fpm_to_mps(args.os_vspeed),
-        rel_speed_mps=kt_to_mps(args.rel_speed),
-        conflict_dh_m=ft_to_m(args.conflict_dh),
-        target_alto_m=ft_to_m(args.tgt_alto),
-        relative_heading_deg=args.relative_heading,
-        post_cpa_sec=post_cpa_sec
-    )
 
-else:
+def require_positions(args):
+    """Raise ValueError naming every missing / non-finite position option."""
+
+    names = TYPE1_POSITION_OPTIONS if args.mode == "type1" else TYPE2_POSITION_OPTIONS
+
+    missing = [
+        name for name in names
+        if getattr(args, name) is None or not math.isfinite(getattr(args, name))
+    ]
+
+    if missing:
+        raise ValueError(
+            f"{args.mode} needs " + ", ".join(f"--{name}" for name in missing)
+        )
+
+
+def geometry_inputs(args):
+    """
+    Keyword arguments of compute_conflict_geometry for one scenario
+    (type1, or type2 for any other mode). Solving them separately lets
+    callers stack many scenarios into compute_conflict_geometry_batch.
+    """
+
+    require_positions(args)
+
+    tcpa_sec = mmss_to_sec(args.tcpa)
+    post_cpa_sec = mmss_to_sec(args.post_cpa)
+
+    if args.mode == "type1":
+
+        return dict(
+            tcpa_sec=tcpa_sec,
+            cpa_horiz_m=ft_to_m(args.cpa),
+            os_lat_deg=args.os_lat,
+            os_lon_deg=args.os_lon,
+            os_alt_m=ft_to_m(args.os_alt),
+            os_course_deg=args.os_course,
+            os_speed_mps=kt_to_mps(args.os_speed),
+            os_vspeed_mps=fpm_to_mps(args.os_vspeed),
+            rel_speed_mps=kt_to_mps(args.rel_speed),
+            conflict_dh_m=ft_to_m(args.conflict_dh),
+            target_alto_m=ft_to_m(args.tgt_alto),
+            relative_heading_deg=args.relative_heading,
+            post_cpa_sec=post_cpa_sec
+        )
 
-    init_t2 = compute_initial_positions_type2(
-        tcpa_sec=tcpa_sec,
+    init_t2 = compute_initial_positions_type2(**type2_position_inputs(args))
+
+    return type2_geometry_inputs(args, init_t2)
+
+
+def type2_position_inputs(args):
+    """
+    Keyword arguments of compute_initial_positions_type2 for a type2
+    scenario (stackable into compute_initial_positions_type2_batch).
+    """
+
+    require_positions(args)
+
+    return dict(
+        tcpa_sec=mmss_to_sec(args.tcpa),
         cpa_lat=args.cpa_lat,
         cpa_lon=args.cpa_lon,
         os_s_lat=args.os_start_lat,
@@ -110,6 +167,10 @@ else:
         tgt_speed_mps=kt_to_mps(args.tgt_speed if args.tgt_speed is not None else args.os_speed + args.rel_speed)
     )
 
+
+def type2_geometry_inputs(args, init_t2):
+    """geometry_inputs for a type2 scenario, given its solved initial positions."""
+
     os_course = init_t2["os_course_deg"]
     tgt_course = init_t2["tgt_course_deg"]
 
@@ -122,8 +183,8 @@ else:
         else args.rel_speed
     )
 
-    points = compute_conflict_geometry(
-        tcpa_sec=tcpa_sec,
+    return dict(
+        tcpa_sec=mmss_to_sec(args.tcpa),
         cpa_horiz_m=0.0,
         os_lat_deg=init_t2["os_init"][0],
         os_lon_deg=init_t2["os_init"][1],
@@ -135,105 +196,149 @@ else:
         conflict_dh_m=ft_to_m(args.conflict_dh),
         target_alto_m=ft_to_m(args.tgt_alto),
         relative_heading_deg=relative_heading,
-        post_cpa_sec=post_cpa_sec
+        post_cpa_sec=mmss_to_sec(args.post_cpa)
     )
 
+
+def compute_scenario_points(args, report=print_conflict_summary):
+    """ConflictGeometry for one scenario."""
+    return compute_conflict_geometry(**geometry_inputs(args), report=report)
+
+
+def build_bundle(args, points):
+    """Every output file of the scenario, rendered in memory."""
+
+    tgt_start = points["tgt_start"]
+    tgt_alt_ft = round(m_to_ft(tgt_start[2]), 2)
+
+    return build_scenario_bundle(
+        points,
+        os_callsign=args.os_callsign,
+        tgt_callsign=args.tgt_callsign,
+        os_state={
+            "lat_deg": points["os_start"][0],
+            "lon_deg": points["os_start"][1],
+            "alt_ft": args.os_alt,
+            "course_deg": args.os_course,
+            "ground_speed_kt": args.os_speed,
+            "vertical_speed_fpm": args.os_vspeed
+        },
+        tgt_state={
+            "lat_deg": tgt_start[0],
+            "lon_deg": tgt_start[1],
+            "alt_ft": tgt_alt_ft,
+            "course_deg": points["tgt_course_deg"],
+            "ground_speed_kt": args.tgt_speed,
+            "vertical_speed_fpm": 0.0
+        },
+        positions_rows=[
+            {
+                "start_lat": points["os_start"][0],
+                "start_lon": points["os_start"][1],
+                "start_alt": args.os_alt,
+                "end_lat": points["os_end"][0],
+                "end_lon": points["os_end"][1],
+                "end_alt": round(m_to_ft(points["os_end"][2]), 2),
+                "gspeed": args.os_speed,
+                "vspeed": args.os_vspeed,
+                "course": args.os_course
+            },
+            {
+                "start_lat": points["tgt_start"][0],
+                "start_lon": points["tgt_start"][1],
+                "start_alt": round(m_to_ft(points["tgt_start"][2]), 2),
+                "end_lat": points["tgt_end"][0],
+                "end_lon": points["tgt_end"][1],
+                "end_alt": round(m_to_ft(points["tgt_end"][2]), 2),
+                "gspeed": args.rel_speed,
+                "vspeed": 0.0,
+                "course": points["tgt_course_deg"]
+            }
+        ],
+        compact=args.compact_json,
+        kmz=args.kmz,
+        simplify_tol_m=ft_to_m(args.simplify_tol_ft) if args.simplify_tol_ft is not None else None,
+        max_leg_m=ft_to_m(args.max_leg_ft) if args.max_leg_ft is not None else None
+    )
+
+
+def generate_scenario(args, report=print_conflict_summary):
+    """(points, bundle) for one parsed argument set."""
+    points = compute_scenario_points(args, report=report)
+    return points, build_bundle(args, points)
+
+
 # =========================================================
-# EVERYTHING BELOW UNCHANGED
+# MAIN
 # =========================================================
 
-import pandas as pd
-
-positions_df = pd.DataFrame([
-    {
-        "start_lat": points["os_start"][0],
-        "start_lon": points["os_start"][1],
-        "start_alt": args.os_alt,
-        "end_lat": points["os_end"][0],
-        "end_lon": points["os_end"][1],
-        "end_alt": round(m_to_ft(points["os_end"][2]), 2),
-        "gspeed": args.os_speed,
-        "vspeed": args.os_vspeed,
-        "course": args.os_course
-    },
-    {
-        "start_lat": points["tgt_start"][0],
-        "start_lon": points["tgt_start"][1],
-        "start_alt": round(m_to_ft(points["tgt_start"][2]), 2),
-        "end_lat": points["tgt_end"][0],
-        "end_lon": points["tgt_end"][1],
-        "end_alt": round(m_to_ft(points["tgt_end"][2]), 2),
-        "gspeed": args.rel_speed,
-        "vspeed": 0.0,
-        "course": points["tgt_course_deg"]
+# Options that only say where files go or how the cache behaves;
+# they never change the generated files
+OUTPUT_OPTIONS = ("archive",)
+
+
+def cache_inputs(args):
+    """The args that determine a scenario's files (its cache key inputs)."""
+    return {
+        k: v for k, v in vars(args).items()
+        if not k.startswith("cache_") and k not in OUTPUT_OPTIONS
     }
-])
 
-positions_df.to_csv("positions.csv", index=False)
 
-print("positions.csv generated successfully")
+def main(argv=None):
 
-ownship_prefix = f"Ownship_{args.os_callsign}"
-target_prefix = f"Target_{args.tgt_callsign}"
+    argv = sys.argv[1:] if argv is None else argv
 
-ownship_plan = f"{ownship_prefix}.plan"
-target_plan = f"{target_prefix}.plan"
+    # python app.py batch scenarios.csv --out runs ...
+    if argv and argv[0] == "batch":
+        from batch_runner import main as batch_main
+        return batch_main(argv[1:])
 
-ownship_wp = f"{ownship_prefix}.waypoints"
-target_wp = f"{target_prefix}.waypoints"
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
-ownship_yaml = f"{ownship_prefix}.yaml"
-target_yaml = f"{target_prefix}.yaml"
+    for name in ("simplify_tol_ft", "max_leg_ft"):
+        value = getattr(args, name)
+        if value is not None and not value > 0:
+            parser.error(f"--{name} must be positive")
 
-ownship_kml = f"{ownship_prefix}.kml"
-target_kml = f"{target_prefix}.kml"
+    # ---- Cache ----
+    cache = None
 
-combined_kml = f"{ownship_prefix}_{target_prefix}.kml"
+    if args.cache_dir:
 
-home = points["os_start"]
+        from artifact_cache import ArtifactCache, scenario_key
 
-write_plan_file(ownship_plan, [points["os_start"], points["os_cpa"], points["os_end"]], home)
-write_plan_file(target_plan, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]], home)
+        cache = ArtifactCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
 
-write_waypoints_file(ownship_wp, [points["os_start"], points["os_cpa"], points["os_end"]])
-write_waypoints_file(target_wp, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]])
+        cache_key = scenario_key(cache_inputs(args))
 
-write_kml_file(ownship_kml, [points["os_start"], points["os_cpa"], points["os_end"]])
-write_kml_file(target_kml, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]])
+        if args.archive:
+            hit = cache.get(cache_key)
+            if hit is not None:
+                ScenarioBundle(hit["files"]).to_archive(args.archive)
+                print(f"✅ {args.archive} restored from cache ({cache_key[:12]})")
+                return
 
-write_combined_kml_file(
-    combined_kml,
-    [points["os_start"], points["os_cpa"], points["os_end"]],
-    [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]]
-)
+        elif cache.restore(cache_key) is not None:
+            print(f"✅ All files restored from cache ({cache_key[:12]})")
+            return
 
-write_yaml_file(
-    path=ownship_yaml,
-    callsign=args.os_callsign,
-    sysid=1,
-    lat_deg=points["os_start"][0],
-    lon_deg=points["os_start"][1],
-    alt_ft=args.os_alt,
-    course_deg=args.os_course,
-    ground_speed_kt=args.os_speed,
-    vertical_speed_fpm=args.os_vspeed,
-    waypoints_file=ownship_wp
-)
+    # ---- Files ----
+    points, bundle = generate_scenario(args)
+
+    if args.archive:
+        bundle.to_archive(args.archive)
+        print(f"{args.archive} generated successfully")
+    else:
+        bundle.to_dir(".")
+        print("positions.csv generated successfully")
+
+    if cache is not None:
+        cache.put(cache_key, bundle.files)
+
+    print("✅ All files generated successfully!")
 
-tgt_start = points["tgt_start"]
-tgt_alt_ft = round(m_to_ft(tgt_start[2]), 2)
-
-write_yaml_file(
-    path=target_yaml,
-    callsign=args.tgt_callsign,
-    sysid=2,
-    lat_deg=tgt_start[0],
-    lon_deg=tgt_start[1],
-    alt_ft=tgt_alt_ft,
-    course_deg=points["tgt_course_deg"],
-    ground_speed_kt=args.tgt_speed,
-    vertical_speed_fpm=0.0,
-    waypoints_file=target_wp
-)
 
-print("✅ All files generated successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
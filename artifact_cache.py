@@ -0,0 +1,246 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+
+# =========================================================
+# ARTIFACT CACHE
+# Generated scenario files (plan, waypoints, KML, YAML,
+# scenario log, positions.csv) keyed on a canonical hash of
+# the normalized scenario inputs. A hit hands back the stored
+# bytes without recomputing the geometry or re-rendering any
+# file, so re-running a regression suite only pays for the
+# scenarios whose inputs changed.
+#
+# Layout:  <root>/<key[:2]>/<key>/manifest.json + files
+# Eviction: least recently used entries (manifest mtime,
+# touched on every hit) go first once the cache grows past
+# max_bytes. Each manifest records its entry's size and each
+# process keeps a running total, so a put costs one entry's
+# I/O; the full scan only runs when the total passes
+# max_bytes (or on an explicit evict()), and then trims to
+# EVICT_TO of it. Other processes' writes are picked up at
+# that scan.
+# =========================================================
+
+# Bump when generated file contents change for the same inputs
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction after a put trims to this fraction of max_bytes, so a full
+# cache is not rescanned on every write
+EVICT_TO = 0.9
+
+MANIFEST = "manifest.json"
+
+
+def _normalize(value):
+    # Same scenario -> same JSON text: numbers as floats (20 == 20.0),
+    # numpy scalars / arrays as plain Python, -0.0 as 0.0
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+
+    if isinstance(value, (int, float)):
+        value = float(value)
+        if not math.isfinite(value):
+            return repr(value)
+        return value + 0.0
+
+    return str(value)
+
+
+def scenario_key(inputs):
+    """Hex SHA-256 of the normalized inputs dict."""
+    text = json.dumps(
+        {"version": CACHE_VERSION, "inputs": _normalize(inputs)},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+        # Bytes in the cache as of this process's last scan plus its own
+        # puts since; None until the first put
+        self._total = None
+
+    def _entry(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    # ---------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------
+
+    def get(self, key):
+        """
+        Return {"files": {name: bytes}, "meta": ...} or None on a miss.
+        A hit marks the entry as most recently used.
+        """
+        entry = self._entry(key)
+        manifest_path = os.path.join(entry, MANIFEST)
+
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            files = {}
+            for name in manifest["files"]:
+                with open(os.path.join(entry, name), "rb") as f:
+                    files[name] = f.read()
+
+        except (OSError, ValueError, KeyError):
+            # Missing or half-evicted entry: treat as a miss
+            return None
+
+        os.utime(manifest_path)
+
+        return {"files": files, "meta": manifest.get("meta")}
+
+    def restore(self, key, dest_dir="."):
+        """
+        Write a cached entry's files into dest_dir. Files already there
+        with identical contents are left untouched. Returns the entry
+        (as from get) or None on a miss.
+        """
+        hit = self.get(key)
+        if hit is None:
+            return None
+
+        for name, data in hit["files"].items():
+            path = os.path.join(dest_dir, name)
+
+            if os.path.exists(path) and os.path.getsize(path) == len(data):
+                with open(path, "rb") as f:
+                    if f.read() == data:
+                        continue
+
+            with open(path, "wb") as f:
+                f.write(data)
+
+        return hit
+
+    # ---------------------------------------------------------
+    # Store
+    # ---------------------------------------------------------
+
+    def put(self, key, files, meta=None):
+        """
+        Store {name: bytes} (plus optional JSON-able meta) under key.
+        The entry appears atomically; concurrent writers of the same key
+        simply keep whichever finished first.
+        """
+        entry = self._entry(key)
+        if os.path.exists(os.path.join(entry, MANIFEST)):
+            return
+
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(entry))
+
+        try:
+            size = 0
+            for name, data in files.items():
+                with open(os.path.join(tmp, name), "wb") as f:
+                    f.write(data)
+                size += len(data)
+
+            manifest = json.dumps({
+                "files": list(files),
+                "meta": meta,
+                "created": time.time(),
+                "bytes": size
+            })
+            with open(os.path.join(tmp, MANIFEST), "w") as f:
+                f.write(manifest)
+            size += len(manifest)
+
+            os.rename(tmp, entry)
+
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.exists(os.path.join(entry, MANIFEST)):
+                raise
+            return
+
+        if self._total is None:
+            # First write from this process: one full scan
+            self.evict()
+        else:
+            self._total += size
+            if self._total > self.max_bytes:
+                self.evict(self.max_bytes * EVICT_TO)
+
+    def put_paths(self, key, paths, meta=None):
+        """Store files that were just written to disk, by basename."""
+        files = {}
+        for path in paths:
+            with open(path, "rb") as f:
+                files[os.path.basename(path)] = f.read()
+        self.put(key, files, meta=meta)
+
+    # ---------------------------------------------------------
+    # Eviction
+    # ---------------------------------------------------------
+
+    def entries(self):
+        """[(last_used, size_bytes, path)] for every complete entry."""
+        out = []
+
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    manifest_path = os.path.join(entry.path, MANIFEST)
+                    stat = os.stat(manifest_path)
+                    with open(manifest_path) as f:
+                        size = json.load(f).get("bytes")
+                    if size is None:
+                        # Entry from before sizes were recorded
+                        size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                    else:
+                        size += stat.st_size
+                except (OSError, ValueError):
+                    continue
+                last_used = stat.st_mtime
+                out.append((last_used, size, entry.path))
+
+        return out
+
+    def evict(self, max_bytes=None):
+        """Drop least recently used entries until under max_bytes (default: the cache's)."""
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+        self._total = total
+        return total
@@ -0,0 +1,296 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app import (
+    OUTPUT_OPTIONS,
+    TIME_OPTIONS,
+    build_bundle,
+    build_parser,
+    compute_scenario_points,
+    require_positions
+)
+from campaign_writer import scenario_dir
+from units import mmss_to_sec
+
+# =========================================================
+# BATCH RUNS
+# Many app.py scenarios in one process pool. Each row of a
+# CSV or JSONL spec holds app.py options by name (tcpa,
+# os_lat, ..., mode); missing or empty fields take the
+# app.py defaults. Every scenario's bundle goes to its own
+# directory under --out:
+#
+#   <out>/manifest.jsonl          one line per row (status,
+#                                 timings, error if any)
+#   <out>/<name or shard/sNNNNNNN>/Ownship_OWN01.plan ...
+#
+# A name is one plain directory name (no "/", "..", or
+# absolute path) and unique within the spec. A bad row is
+# reported in the manifest and the summary; it never stops
+# the run.
+# =========================================================
+
+STAGES = ("geometry", "render", "write")
+
+# Spec fields that are not app.py options
+ROW_NAME = "name"
+
+
+def read_rows(path):
+    """Rows of a .csv (header line) or .jsonl spec as dicts."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+# Raises argparse.ArgumentError on a bad value instead of exiting
+_PARSER = build_parser(exit_on_error=False)
+
+# app.py option defaults; on/off flags are the ones defaulting to a bool
+_DEFAULTS = vars(_PARSER.parse_args([]))
+
+
+def row_to_args(row, mode=None):
+    """
+    argparse.Namespace for one spec row, parsed by app.py's own parser,
+    so every field is converted exactly as on the command line.
+    """
+    argv = [] if mode is None else [f"--mode={mode}"]
+
+    for key, value in row.items():
+        if key == ROW_NAME or value is None or value == "":
+            continue
+
+        if key not in _DEFAULTS or key.startswith("cache_") or key in OUTPUT_OPTIONS:
+            raise ValueError(f"Unknown field: {key}")
+
+        if isinstance(_DEFAULTS[key], bool):
+            if value if isinstance(value, bool) else str(value).strip().lower() in ("1", "true", "yes"):
+                argv.append(f"--{key}")
+        else:
+            # --key=value keeps negative numbers from reading as options
+            argv.append(f"--{key}={value}")
+
+    try:
+        args = _PARSER.parse_args(argv)
+    except argparse.ArgumentError as e:
+        raise ValueError(str(e)) from None
+
+    for key in TIME_OPTIONS:
+        try:
+            mmss_to_sec(getattr(args, key))
+        except ValueError as e:
+            raise ValueError(f"{key}: {e}") from None
+
+    # Missing positions would otherwise solve to NaN files
+    require_positions(args)
+
+    return args
+
+
+def name_errors(rows):
+    """
+    {row index: message} for rows whose name is not a single plain
+    directory name, or repeats an earlier row's name (the earlier row
+    keeps it).
+    """
+    errors = {}
+    first = {}
+
+    for index, row in enumerate(rows):
+        name = row.get(ROW_NAME)
+        if name is None or name == "":
+            continue
+
+        name = str(name)
+
+        if (
+            name in (".", "..")
+            or "/" in name
+            or "\\" in name
+            or os.path.isabs(name)
+        ):
+            errors[index] = f"Invalid name {name!r}: must be a single directory name"
+        elif name in first:
+            errors[index] = f"Duplicate name {name!r} (also row {first[name]})"
+        else:
+            first[name] = index
+
+    return errors
+
+
+def run_row(task):
+    """
+    Worker: one scenario end to end. Never raises; returns the manifest
+    entry for the row.
+    """
+    index, row, out, mode, shard_size, name_error = task
+
+    entry = {"row": index}
+    timings = {}
+
+    try:
+        if name_error is not None:
+            raise ValueError(name_error)
+
+        args = row_to_args(row, mode=mode)
+
+        entry["path"] = str(row.get(ROW_NAME) or scenario_dir(index, shard_size))
+
+        t0 = time.perf_counter()
+        points = compute_scenario_points(args, report=None)
+        t1 = time.perf_counter()
+        bundle = build_bundle(args, points)
+        t2 = time.perf_counter()
+        bundle.to_dir(os.path.join(out, entry["path"]))
+        t3 = time.perf_counter()
+
+        timings = {"geometry": t1 - t0, "render": t2 - t1, "write": t3 - t2}
+
+        entry.update(
+            status="ok",
+            files=len(bundle.files),
+            bytes=bundle.total_bytes(),
+            cpa_sep_3d_m=float(points["cpa_sep_3d_m"])
+        )
+
+    except Exception as e:
+        entry.update(status="error", error=f"{type(e).__name__}: {e}")
+
+    entry["timings"] = timings
+    return entry
+
+
+def run_batch(rows, out, mode=None, workers=None, shard_size=1000, progress=None):
+    """
+    Generate every row into out. Returns a summary dict (counts, wall
+    time, throughput, per-stage totals, errors).
+    """
+    os.makedirs(out, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    bad_names = name_errors(rows)
+    tasks = [(i, row, out, mode, shard_size, bad_names.get(i)) for i, row in enumerate(rows)]
+
+    totals = dict.fromkeys(STAGES, 0.0)
+    errors = []
+    ok = 0
+    written = 0
+
+    t0 = time.perf_counter()
+
+    with open(os.path.join(out, "manifest.jsonl"), "w") as manifest:
+
+        if workers == 1:
+            results = map(run_row, tasks)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, min(64, len(tasks) // (workers * 8)))
+            results = pool.map(run_row, tasks, chunksize=chunksize)
+
+        try:
+            for done, entry in enumerate(results, start=1):
+                manifest.write(json.dumps(entry) + "\n")
+
+                if entry["status"] == "ok":
+                    ok += 1
+                    written += entry["bytes"]
+                    for stage, sec in entry["timings"].items():
+                        totals[stage] += sec
+                else:
+                    errors.append((entry["row"], entry["error"]))
+
+                if progress is not None:
+                    progress(done, len(tasks), entry)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "rows": len(tasks),
+        "ok": ok,
+        "failed": len(errors),
+        "errors": errors,
+        "bytes": written,
+        "elapsed_sec": elapsed,
+        "scenarios_per_sec": ok / elapsed if elapsed > 0 else 0.0,
+        "stage_sec": totals,
+        "workers": workers,
+    }
+
+
+def print_summary(summary):
+
+    print(f"\nRows: {summary['rows']}  ok: {summary['ok']}  failed: {summary['failed']}  workers: {summary['workers']}")
+
+    ok = max(summary["ok"], 1)
+    for stage in STAGES:
+        total = summary["stage_sec"][stage]
+        print(f"  {stage:<9} {total:8.2f} s total  {1000 * total / ok:8.2f} ms/scenario")
+
+    print(
+        f"Throughput: {summary['scenarios_per_sec']:.1f} scenarios/s "
+        f"({summary['bytes'] / 1e6:.1f} MB in {summary['elapsed_sec']:.2f} s)"
+    )
+
+    for row, error in summary["errors"][:20]:
+        print(f"❌ row {row}: {error}")
+    if summary["failed"] > 20:
+        print(f"... {summary['failed'] - 20} more in manifest.jsonl")
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog="app.py batch",
+        description="Generate one scenario bundle per row of a CSV / JSONL spec"
+    )
+
+    parser.add_argument("spec", help="CSV (header = app.py option names) or JSONL")
+    parser.add_argument("--mode", default=None, choices=["type1", "type2"], help="Default mode for rows without one")
+    parser.add_argument("--out", default="batch_out")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--shard_size", type=int, default=1000)
+
+    args = parser.parse_args(argv)
+
+    rows = read_rows(args.spec)
+    step = max(1, len(rows) // 20)
+
+    def progress(done, total, entry):
+        if done % step == 0 or done == total:
+            print(f"{done}/{total} scenarios", flush=True)
+
+    summary = run_batch(
+        rows,
+        args.out,
+        mode=args.mode,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        progress=progress
+    )
+
+    print_summary(summary)
+
+    if summary["ok"]:
+        print(f"✅ {summary['ok']} scenarios written to {args.out}")
+
+    return summary
+
+
+if __name__ == "__main__":
+    main()
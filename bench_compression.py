@@ -0,0 +1,131 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from bundle import bundle_from_geometry
+from conflict_math import compute_conflict_geometry_batch
+from kml_tracks import write_encounter_tracks
+
+# =========================================================
+# COMPRESSION BENCHMARK
+# Size and write time of a batch of scenario bundles in each
+# output mode: indented text (the default), compact JSON,
+# KMZ, and per-scenario zip-deflate / tar.gz archives. Also
+# compares one dense 10 Hz gx:Track export as KML and KMZ.
+# =========================================================
+
+MODES = [
+    # name, compact, kmz, archive suffix
+    ("text (default)", False, False, None),
+    ("compact json", True, False, None),
+    ("compact json + kmz", True, True, None),
+    ("zip deflate", False, False, ".zip"),
+    ("tar.gz", False, False, ".tar.gz"),
+    ("compact + kmz + tar.gz", True, True, ".tar.gz"),
+]
+
+
+def sample_scenarios(n, seed=0):
+    rng = np.random.default_rng(seed)
+
+    tcpa_sec = rng.uniform(30, 180, n)
+
+    points = compute_conflict_geometry_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_horiz_m=rng.uniform(0, 300, n),
+        os_lat_deg=37.618805,
+        os_lon_deg=-122.375416,
+        os_alt_m=rng.uniform(15, 120, n),
+        os_course_deg=rng.uniform(0, 360, n),
+        os_speed_mps=rng.uniform(5, 30, n),
+        os_vspeed_mps=0.0,
+        rel_speed_mps=rng.uniform(-5, 10, n),
+        conflict_dh_m=rng.uniform(-30, 30, n),
+        target_alto_m=rng.uniform(0, 30, n),
+        relative_heading_deg=rng.uniform(0, 360, n),
+        post_cpa_sec=600
+    )
+
+    for i in range(n):
+        yield float(tcpa_sec[i]), points.row(i)
+
+
+def dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Compressed output benchmark")
+
+    parser.add_argument("--n", type=int, default=500, help="Scenarios per mode")
+    parser.add_argument("--track_hours", type=float, default=1.0)
+
+    args = parser.parse_args(argv)
+
+    scenarios = list(sample_scenarios(args.n))
+
+    print(f"{args.n} scenario bundles per mode\n")
+    print(f"{'mode':<26}{'MB':>10}{'ratio':>8}{'write s':>10}")
+
+    baseline = None
+
+    for name, compact, kmz, suffix in MODES:
+
+        out = tempfile.mkdtemp(prefix="bench_")
+
+        try:
+            t0 = time.perf_counter()
+
+            for i, (tcpa_sec, points) in enumerate(scenarios):
+                bundle = bundle_from_geometry(points, tcpa_sec, compact=compact, kmz=kmz)
+                target = os.path.join(out, f"{i:06d}")
+                if suffix is None:
+                    bundle.to_dir(target)
+                else:
+                    bundle.to_archive(target + suffix)
+
+            elapsed = time.perf_counter() - t0
+            size = dir_size(out)
+
+        finally:
+            shutil.rmtree(out, ignore_errors=True)
+
+        baseline = baseline or size
+        print(f"{name:<26}{size / 1e6:>10.3f}{size / baseline:>8.2f}{elapsed:>10.2f}")
+
+    # ---- Dense track ----
+    _, points = scenarios[0]
+    duration = args.track_hours * 3600.0
+
+    print(f"\n{args.track_hours:g} h, 10 Hz, two-aircraft gx:Track")
+    print(f"{'format':<26}{'MB':>10}{'ratio':>8}{'write s':>10}")
+
+    out = tempfile.mkdtemp(prefix="bench_")
+
+    try:
+        sizes = {}
+        for ext in (".kml", ".kmz"):
+            path = os.path.join(out, "track" + ext)
+
+            t0 = time.perf_counter()
+            write_encounter_tracks(path, points, duration, 10.0)
+            elapsed = time.perf_counter() - t0
+
+            sizes[ext] = os.path.getsize(path)
+            print(f"{ext:<26}{sizes[ext] / 1e6:>10.3f}{sizes[ext] / sizes['.kml']:>8.2f}{elapsed:>10.2f}")
+
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# =========================================================
+# STARTUP BENCHMARK
+# Import cost of the CLI entry points, measured with
+# python -X importtime in fresh interpreters. Fails (exit 1)
+# when the median import time exceeds the budget or when a
+# heavy optional dependency is loaded at import time; those
+# must stay behind the code paths that need them.
+# =========================================================
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Median "import <module>" budget in ms (cumulative, as reported
+# by -X importtime, including numpy)
+DEFAULT_BUDGET_MS = 250.0
+
+# Must never load just by importing a CLI module
+LAZY_MODULES = ("pandas", "matplotlib", "pymavlink", "streamlit", "scipy")
+
+MODULES = ("app", "batch_runner", "campaign_writer", "mission_reader")
+
+
+def import_profile(module):
+    """
+    One fresh interpreter importing module: ({name: cumulative_us},
+    [top-level packages loaded]).
+    """
+    code = (
+        f"import {module}, sys; "
+        "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: self [us] | cumulative | imported package"
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative_us)
+
+    return times, result.stdout.split()
+
+
+def cli_wall_ms(args):
+    """Wall time of one python app.py ... run (interpreter start included)."""
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=HERE, capture_output=True, check=True)
+    return 1000.0 * (time.perf_counter() - t0)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="CLI startup-time benchmark with a regression budget")
+
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget_ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per module")
+
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    print(f"{'module':<18}{'median ms':>11}{'min ms':>9}{'budget':>9}")
+
+    for module in args.modules:
+
+        samples = []
+        for _ in range(args.runs):
+            times, loaded = import_profile(module)
+            samples.append(times[module] / 1000.0)
+
+        median = statistics.median(samples)
+        status = "ok" if median <= args.budget_ms else "OVER"
+        print(f"{module:<18}{median:>11.1f}{min(samples):>9.1f}{args.budget_ms:>9.0f}  {status}")
+
+        if median > args.budget_ms:
+            failures.append(f"import {module}: {median:.1f} ms > {args.budget_ms:.0f} ms")
+
+        eager = sorted(set(loaded) & set(LAZY_MODULES))
+        if eager:
+            failures.append(f"import {module} loads {', '.join(eager)}")
+
+        slowest = sorted(
+            ((us, name) for name, us in times.items() if name != module and "." not in name),
+            reverse=True
+        )[:args.top]
+        print("    " + ", ".join(f"{name} {us / 1000.0:.1f}" for us, name in slowest))
+
+    help_ms = statistics.median(cli_wall_ms(["app.py", "--help"]) for _ in range(args.runs))
+    print(f"\npython app.py --help: {help_ms:.1f} ms wall (median of {args.runs})")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+    print("✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+
+from path_tools import condition_path
+from plan_writer import (
+    render_plan,
+    render_waypoints,
+    render_kml,
+    render_combined_kml,
+    kml_to_kmz
+)
+from yaml_writer import render_yaml
+from units import m_to_ft, mps_to_kt, mps_to_fpm
+from validation_logger import build_validation_log
+
+# =========================================================
+# SCENARIO BUNDLE
+# Every artifact of one scenario (positions.csv, plan,
+# waypoints, KML, YAML, validation log) rendered in one pass
+# into memory. The bundle can then be handed out as bytes,
+# written to a directory, or streamed straight into a zip or
+# tar archive, without writing and re-reading each file.
+# =========================================================
+
+POSITIONS_COLUMNS = [
+    "start_lat", "start_lon", "start_alt",
+    "end_lat", "end_lon", "end_alt",
+    "gspeed", "vspeed", "course"
+]
+
+
+class ScenarioBundle:
+    """Ordered {file name: bytes}."""
+
+    def __init__(self, files=None):
+        self.files = dict(files or {})
+
+    def add(self, name, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[name] = content
+
+    def names(self, suffix=None):
+        """File names in order, optionally only those ending in suffix."""
+        if suffix is None:
+            return list(self.files)
+        return [name for name in self.files if name.endswith(suffix)]
+
+    def __getitem__(self, name):
+        return self.files[name]
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def _select(self, names):
+        if names is None:
+            return self.files.items()
+        return [(name, self.files[name]) for name in names]
+
+    def total_bytes(self):
+        return sum(len(data) for data in self.files.values())
+
+    # ---------------------------------------------------------
+    # Outputs
+    # ---------------------------------------------------------
+
+    def to_dir(self, path=".", names=None):
+        """Write the files into path; returns the written paths."""
+        os.makedirs(path, exist_ok=True)
+
+        written = []
+        for name, data in self._select(names):
+            target = os.path.join(path, name)
+            with open(target, "wb") as f:
+                f.write(data)
+            written.append(target)
+
+        return written
+
+    def to_zip(self, target=None, names=None, compression=zipfile.ZIP_STORED):
+        """
+        Stream the files into a zip archive. target may be a path or a
+        binary file object; with no target the archive bytes are returned.
+        """
+        buffer = io.BytesIO() if target is None else target
+
+        stamp = time.localtime()[:6]
+
+        with zipfile.ZipFile(buffer, "w", compression=compression) as z:
+            for name, data in self._select(names):
+                info = zipfile.ZipInfo(name, date_time=stamp)
+                info.compress_type = compression
+                info.external_attr = 0o644 << 16
+                z.writestr(info, data)
+
+        if target is None:
+            return buffer.getvalue()
+
+    def to_tar(self, target=None, names=None, mode="w"):
+        """
+        Stream the files into a tar archive (mode "w", "w:gz", ...).
+        target may be a path or a binary file object; with no target the
+        archive bytes are returned.
+        """
+        buffer = io.BytesIO() if target is None else target
+
+        stamp = time.time()
+
+        if isinstance(buffer, (str, os.PathLike)):
+            archive = tarfile.open(buffer, mode)
+        else:
+            archive = tarfile.open(fileobj=buffer, mode=mode)
+
+        with archive:
+            for name, data in self._select(names):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = stamp
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+
+        if target is None:
+            return buffer.getvalue()
+
+    def to_archive(self, path, names=None):
+        """
+        Compressed archive chosen by suffix: .zip (deflate), .tar.gz /
+        .tgz (gzip), .tar.xz, or plain .tar. Returns path.
+        """
+        lower = path.lower()
+
+        if lower.endswith(".zip"):
+            self.to_zip(path, names=names, compression=zipfile.ZIP_DEFLATED)
+        elif lower.endswith((".tar.gz", ".tgz")):
+            self.to_tar(path, names=names, mode="w:gz")
+        elif lower.endswith(".tar.xz"):
+            self.to_tar(path, names=names, mode="w:xz")
+        elif lower.endswith(".tar"):
+            self.to_tar(path, names=names, mode="w")
+        else:
+            raise ValueError(f"Unknown archive type: {path}")
+
+        return path
+
+
+# ---------------------------------------------------------
+# Renderers
+# ---------------------------------------------------------
+
+def render_positions_csv(rows):
+    """
+    positions.csv text for the world plot. Matches the original
+    DataFrame.to_csv output: a column holding any float is written
+    entirely as floats, otherwise as integers.
+    """
+    lines = [",".join(POSITIONS_COLUMNS)]
+
+    columns = []
+    for key in POSITIONS_COLUMNS:
+        values = [row[key] for row in rows]
+        if any(not isinstance(v, (int, bool)) for v in values):
+            columns.append([repr(float(v)) for v in values])
+        else:
+            columns.append([str(int(v)) for v in values])
+
+    lines += [",".join(cells) for cells in zip(*columns)]
+
+    return "\n".join(lines) + "\n"
+
+
+def scenario_file_names(os_callsign, tgt_callsign):
+    """File names used by app.py / streamlit_app.py for one scenario."""
+    ownship_prefix = f"Ownship_{os_callsign}"
+    target_prefix = f"Target_{tgt_callsign}"
+
+    return {
+        "ownship_plan": f"{ownship_prefix}.plan",
+        "target_plan": f"{target_prefix}.plan",
+        "ownship_wp": f"{ownship_prefix}.waypoints",
+        "target_wp": f"{target_prefix}.waypoints",
+        "ownship_kml": f"{ownship_prefix}.kml",
+        "target_kml": f"{target_prefix}.kml",
+        "combined_kml": f"{ownship_prefix}_{target_prefix}.kml",
+        "ownship_yaml": f"{ownship_prefix}.yaml",
+        "target_yaml": f"{target_prefix}.yaml",
+    }
+
+
+def build_scenario_bundle(
+    points,
+    os_callsign,
+    tgt_callsign,
+    os_state,
+    tgt_state,
+    positions_rows,
+    log=None,
+    positions_name="positions.csv",
+    log_name="scenario_log.json",
+    compact=False,
+    kmz=False,
+    simplify_tol_m=None,
+    max_leg_m=None
+):
+    """
+    Render every artifact of one scenario.
+
+    points: ConflictGeometry (or dict with the same keys)
+    os_state / tgt_state: YAML initial state per vehicle, keys
+        lat_deg, lon_deg, alt_ft, course_deg, ground_speed_kt,
+        vertical_speed_fpm
+    positions_rows: two dicts keyed by POSITIONS_COLUMNS
+    log: validation log dict (see build_validation_log), optional
+    compact: plan and log JSON without indentation
+    kmz: KML files zipped as .kmz
+    simplify_tol_m / max_leg_m: mission paths go through
+        path_tools.condition_path (the CPA waypoint is always kept)
+    """
+    names = scenario_file_names(os_callsign, tgt_callsign)
+
+    os_wps = [points["os_start"], points["os_cpa"], points["os_end"]]
+    tgt_wps = [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]]
+
+    if simplify_tol_m is not None or max_leg_m is not None:
+        os_wps, tgt_wps = (
+            condition_path(wps, simplify_tol_m=simplify_tol_m, max_leg_m=max_leg_m, keep=[1])
+            for wps in (os_wps, tgt_wps)
+        )
+
+    home = points["os_start"]
+
+    bundle = ScenarioBundle()
+
+    bundle.add(positions_name, render_positions_csv(positions_rows))
+
+    if log is not None:
+        if compact:
+            bundle.add(log_name, json.dumps(log, separators=(",", ":")))
+        else:
+            bundle.add(log_name, json.dumps(log, indent=4))
+
+    bundle.add(names["ownship_plan"], render_plan(os_wps, home, compact=compact))
+    bundle.add(names["target_plan"], render_plan(tgt_wps, home, compact=compact))
+
+    bundle.add(names["ownship_wp"], render_waypoints(os_wps))
+    bundle.add(names["target_wp"], render_waypoints(tgt_wps))
+
+    kml_files = [
+        (names["ownship_kml"], render_kml(os_wps)),
+        (names["target_kml"], render_kml(tgt_wps)),
+        (names["combined_kml"], render_combined_kml(os_wps, tgt_wps)),
+    ]
+
+    for name, text in kml_files:
+        if kmz:
+            bundle.add(name[:-len(".kml")] + ".kmz", kml_to_kmz(text))
+        else:
+            bundle.add(name, text)
+
+    bundle.add(names["ownship_yaml"], render_yaml(
+        callsign=os_callsign,
+        sysid=1,
+        waypoints_file=names["ownship_wp"],
+        **os_state
+    ))
+
+    bundle.add(names["target_yaml"], render_yaml(
+        callsign=tgt_callsign,
+        sysid=2,
+        waypoints_file=names["target_wp"],
+        **tgt_state
+    ))
+
+    return bundle
+
+
+def bundle_from_geometry(
+    points,
+    tcpa_sec,
+    inputs=None,
+    os_callsign="OWN01",
+    tgt_callsign="TGT01",
+    compact=False,
+    kmz=False,
+    simplify_tol_m=None,
+    max_leg_m=None
+):
+    """
+    Bundle for a generated scenario with no UI inputs: YAML states,
+    positions rows and the validation log all come from the scalar
+    ConflictGeometry itself (aviation units, as in app.py).
+    """
+    os_start = points["os_start"]
+    tgt_start = points["tgt_start"]
+
+    os_alt_ft = round(m_to_ft(os_start[2]), 2)
+    tgt_alt_ft = round(m_to_ft(tgt_start[2]), 2)
+
+    os_speed_kt = round(mps_to_kt(points["os_speed_mps"]), 2)
+    tgt_speed_kt = round(mps_to_kt(points["tgt_speed_mps"]), 2)
+    os_vspeed_fpm = round(mps_to_fpm(points["os_vspeed_mps"]), 2)
+
+    def row(start, end, speed_kt, vspeed_fpm, course_deg):
+        return {
+            "start_lat": start[0],
+            "start_lon": start[1],
+            "start_alt": round(m_to_ft(start[2]), 2),
+            "end_lat": end[0],
+            "end_lon": end[1],
+            "end_alt": round(m_to_ft(end[2]), 2),
+            "gspeed": speed_kt,
+            "vspeed": vspeed_fpm,
+            "course": course_deg
+        }
+
+    inputs = dict(inputs or {})
+    inputs.setdefault("tcpa_sec", tcpa_sec)
+    inputs.setdefault("os_vspeed_fpm", os_vspeed_fpm)
+
+    return build_scenario_bundle(
+        points,
+        os_callsign=os_callsign,
+        tgt_callsign=tgt_callsign,
+        os_state={
+            "lat_deg": os_start[0],
+            "lon_deg": os_start[1],
+            "alt_ft": os_alt_ft,
+            "course_deg": points["os_course_deg"],
+            "ground_speed_kt": os_speed_kt,
+            "vertical_speed_fpm": os_vspeed_fpm
+        },
+        tgt_state={
+            "lat_deg": tgt_start[0],
+            "lon_deg": tgt_start[1],
+            "alt_ft": tgt_alt_ft,
+            "course_deg": points["tgt_course_deg"],
+            "ground_speed_kt": tgt_speed_kt,
+            "vertical_speed_fpm": 0.0
+        },
+        positions_rows=[
+            row(os_start, points["os_end"], os_speed_kt, os_vspeed_fpm, points["os_course_deg"]),
+            row(tgt_start, points["tgt_end"], tgt_speed_kt, 0.0, points["tgt_course_deg"])
+        ],
+        log=build_validation_log(inputs, points, tcpa_sec),
+        compact=compact,
+        kmz=kmz,
+        simplify_tol_m=simplify_tol_m,
+        max_leg_m=max_leg_m
+    )
@@ -0,0 +1,282 @@
+import argparse
+import collections
+import io
+import json
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from bundle import bundle_from_geometry
+from monte_carlo import generator_from_config
+from scenario_catalog import ScenarioCatalog
+
+# =========================================================
+# CAMPAIGN WRITER
+# Lays out thousands of scenario bundles without name
+# clashes: every scenario gets its own directory inside a
+# sharded tree (or its own prefix inside one archive), and
+# manifest.jsonl indexes them all.
+#
+#   <out>/manifest.jsonl
+#   <out>/0000/s0000000/Ownship_OWN01.plan ...
+#   <out>/0000/s0000001/...
+#   <out>/0001/s0001000/...        (shard_size scenarios per shard)
+#
+# Geometry and rendering stay on the calling thread; file I/O
+# goes to a bounded thread pool so the main path never waits
+# on individual writes. At most max_pending bundles are in
+# flight, which bounds memory.
+# =========================================================
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.xz")
+
+
+def scenario_dir(index, shard_size=1000):
+    """Relative directory of scenario index: <shard>/s<index>."""
+    return f"{index // shard_size:04d}/s{index:07d}"
+
+
+class CampaignWriter:
+    """
+    out: directory for the sharded tree, or a path ending in .zip /
+         .tar / .tar.gz / .tgz / .tar.xz for one archive
+    io_workers: writer threads for the directory tree (an archive is
+         always appended by a single thread, in order)
+    """
+
+    def __init__(self, out, shard_size=1000, io_workers=8, max_pending=None):
+        self.out = out
+        self.shard_size = shard_size
+        self.archive = out.lower().endswith(ARCHIVE_SUFFIXES)
+
+        workers = 1 if self.archive else io_workers
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.max_pending = max_pending or 4 * workers
+        self.pending = collections.deque()
+
+        self.count = 0
+        self.bytes_written = 0
+
+        if self.archive:
+            self._manifest = io.StringIO()
+            self._open_archive()
+        else:
+            os.makedirs(out, exist_ok=True)
+            self._manifest = open(os.path.join(out, "manifest.jsonl"), "w")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------------------------------------------------
+    # Archive target
+    # ---------------------------------------------------------
+
+    def _open_archive(self):
+        lower = self.out.lower()
+
+        self._zip = self._tar = None
+
+        if lower.endswith(".zip"):
+            self._zip = zipfile.ZipFile(self.out, "w", compression=zipfile.ZIP_DEFLATED)
+        elif lower.endswith((".tar.gz", ".tgz")):
+            self._tar = tarfile.open(self.out, "w:gz")
+        elif lower.endswith(".tar.xz"):
+            self._tar = tarfile.open(self.out, "w:xz")
+        else:
+            self._tar = tarfile.open(self.out, "w")
+
+    def _archive_member(self, name, data, stamp):
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+            return
+
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = stamp
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def _archive_bundle(self, prefix, bundle):
+        stamp = time.time()
+        for name, data in bundle.files.items():
+            self._archive_member(f"{prefix}/{name}", data, stamp)
+
+    # ---------------------------------------------------------
+    # Writing
+    # ---------------------------------------------------------
+
+    def add(self, index, bundle, record=None):
+        """
+        Queue one scenario bundle. record (JSON-able dict) is stored in
+        the manifest next to its path, file list and size.
+        """
+        prefix = scenario_dir(index, self.shard_size)
+
+        entry = {
+            "scenario": index,
+            "path": prefix,
+            "files": bundle.names(),
+            "bytes": bundle.total_bytes(),
+        }
+        entry.update(record or {})
+
+        # Bounded window: once full, wait for the oldest write (this also
+        # surfaces I/O errors promptly)
+        while len(self.pending) >= self.max_pending:
+            self.pending.popleft().result()
+
+        if self.archive:
+            future = self.pool.submit(self._archive_bundle, prefix, bundle)
+        else:
+            future = self.pool.submit(bundle.to_dir, os.path.join(self.out, prefix))
+
+        self.pending.append(future)
+        self._manifest.write(json.dumps(entry) + "\n")
+
+        self.count += 1
+        self.bytes_written += entry["bytes"]
+
+    def close(self):
+        if self.pool is None:
+            return
+
+        try:
+            while self.pending:
+                self.pending.popleft().result()
+        finally:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+            if self.archive:
+                text = self._manifest.getvalue().encode("utf-8")
+                self._archive_member("manifest.jsonl", text, time.time())
+                (self._zip or self._tar).close()
+            else:
+                self._manifest.close()
+
+
+# =========================================================
+# MONTE CARLO CAMPAIGNS
+# =========================================================
+
+def write_campaign(
+    config,
+    n_total,
+    out,
+    batch_size=1000,
+    shard_size=1000,
+    io_workers=8,
+    compact=False,
+    kmz=False,
+    progress=None,
+    catalog=None
+):
+    """
+    Generate n_total encounters from a monte_carlo config and write a
+    full bundle per scenario. Geometry is solved a batch at a time with
+    the vectorized solver; bundles are rendered here and handed to the
+    CampaignWriter pool. catalog (ScenarioCatalog) gets every
+    scenario's validation log, one bulk insert per batch. Returns the
+    writer (count, bytes_written).
+    """
+    generator = generator_from_config(config)
+
+    with CampaignWriter(out, shard_size=shard_size, io_workers=io_workers) as writer:
+
+        for first, params, points in generator.iter_batches(n_total, batch_size):
+
+            tcpa = params["tcpa_sec"]
+            n = tcpa.shape[0]
+            logs = []
+
+            for k in range(n):
+                inputs = {name: float(values[k]) for name, values in params.items()}
+                scenario = points.row(k)
+
+                bundle = bundle_from_geometry(
+                    scenario,
+                    float(tcpa[k]),
+                    inputs=inputs,
+                    compact=compact,
+                    kmz=kmz
+                )
+
+                writer.add(
+                    first + k,
+                    bundle,
+                    record={
+                        "inputs": inputs,
+                        "cpa_sep_3d_m": scenario.cpa_sep_3d_m,
+                    }
+                )
+
+                if catalog is not None:
+                    logs.append(json.loads(bundle["scenario_log.json"]))
+
+            if catalog is not None:
+                catalog.add_many(logs, source=out)
+
+            if progress is not None:
+                progress(first + n, n_total)
+
+    return writer
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Write a Monte Carlo campaign as scenario bundles")
+
+    parser.add_argument("--config", required=True, help="JSON model config (see monte_carlo.py)")
+    parser.add_argument("--n", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=None, help="Overrides the config seed")
+    parser.add_argument("--out", default="campaign", help="Directory, or .zip / .tar.gz / .tar.xz archive")
+    parser.add_argument("--batch_size", type=int, default=1000)
+    parser.add_argument("--shard_size", type=int, default=1000)
+    parser.add_argument("--io_workers", type=int, default=8)
+    parser.add_argument("--compact_json", action="store_true")
+    parser.add_argument("--kmz", action="store_true")
+    parser.add_argument("--catalog", default=None, help="Also append every scenario to this SQLite catalog")
+
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        config = json.load(f)
+
+    if args.seed is not None:
+        config["seed"] = args.seed
+
+    catalog = ScenarioCatalog(args.catalog) if args.catalog else None
+
+    t0 = time.perf_counter()
+
+    writer = write_campaign(
+        config,
+        args.n,
+        args.out,
+        batch_size=args.batch_size,
+        shard_size=args.shard_size,
+        io_workers=args.io_workers,
+        compact=args.compact_json,
+        kmz=args.kmz,
+        catalog=catalog
+    )
+
+    if catalog is not None:
+        catalog.close()
+
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {writer.count} scenarios ({writer.bytes_written / 1e6:.1f} MB) written to {args.out} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
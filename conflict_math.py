@@ -1,33 +1,110 @@
-import math
+from typing import NamedTuple
+
+import numpy as np
+
+from projection import LocalProjector
 from units import m_to_ft
 
 
 def meters_to_latlon(lato_deg, lono_deg, dx_m, dy_m):
-    R = 6378137.0
-    lato_rad = math.radians(lato_deg)
+    return LocalProjector(lato_deg, lono_deg).to_latlon(dx_m, dy_m)
+
 
-    dlat = dy_m / R
-    dlon = dx_m / (R * math.cos(lato_rad))
+def latlon_to_local_m(ref_lat_deg, ref_lon_deg, lat_deg, lon_deg):
+    return LocalProjector(ref_lat_deg, ref_lon_deg).to_local(lat_deg, lon_deg)
 
-    lat = lato_deg + math.degrees(dlat)
-    lon = lono_deg + math.degrees(dlon)
-    return lat, lon
 
+class ConflictGeometry(NamedTuple):
+    """
+    Result of compute_conflict_geometry (floats and (lat, lon, alt)
+    tuples) or compute_conflict_geometry_batch (arrays).
 
-def latlon_to_local_m(ref_lat_deg, ref_lon_deg, lat_deg, lon_deg):
-    R = 6378137.0
-    ref_lat_rad = math.radians(ref_lat_deg)
+    Also readable like the dict it replaces: points["os_start"],
+    points.get("tgt_course_deg"), "os_start" in points, points.items().
+    """
 
-    dlat = math.radians(lat_deg - ref_lat_deg)
-    dlon = math.radians(lon_deg - ref_lon_deg)
+    os_start: tuple
+    os_cpa: tuple
+    os_end: tuple
 
-    dy_m = dlat * R
-    dx_m = dlon * R * math.cos(ref_lat_rad)
+    tgt_start: tuple
+    tgt_cpa: tuple
+    tgt_end: tuple
 
-    return dx_m, dy_m
+    tgt_course_deg: float
+    cpa_sep_horiz_m: float
+    cpa_sep_vert_m: float
+    cpa_sep_3d_m: float
+    os_speed_mps: float
+    os_vspeed_mps: float
+    os_course_deg: float
 
+    tgt_speed_mps: float
 
-def compute_conflict_geometry(
+    vx_os: float
+    vy_os: float
+    vz_os: float
+    vx_tgt: float
+    vy_tgt: float
+    vz_tgt: float
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def keys(self):
+        return self._fields
+
+    def items(self):
+        return tuple(zip(self._fields, self))
+
+    def row(self, i):
+        """Scenario i of a batch result, as a scalar ConflictGeometry."""
+        return ConflictGeometry._make(
+            tuple(value[i].tolist()) if value.ndim > 1 else value[i].item()
+            for value in self
+        )
+
+
+def print_conflict_summary(points, conflict_dh_m, target_alto_m):
+    """Report hook: the human-readable CPA summary for the console."""
+
+    print("OS CPA ALT (ft):", round(m_to_ft(points.os_cpa[2]), 3))
+    print("Target CPA ALT (ft):", round(m_to_ft(points.tgt_cpa[2]), 3))
+    print("Conflict DH Input (ft):", round(m_to_ft(conflict_dh_m), 3))
+    print("Target Alt Offset Input (ft):", round(m_to_ft(target_alto_m), 3))
+    print("Horizontal CPA Separation (ft):", round(m_to_ft(points.cpa_sep_horiz_m), 3))
+    print("Vertical CPA Separation (ft):", round(m_to_ft(points.cpa_sep_vert_m), 3))
+    print("3D CPA Separation (ft):", round(m_to_ft(points.cpa_sep_3d_m), 3))
+
+
+def _rows_suffix(mask):
+    # Point at the offending rows when validating a batch
+    if mask.ndim == 0:
+        return ""
+    return f" (rows {np.flatnonzero(mask).tolist()})"
+
+
+def _check_finite(**inputs):
+    # A missing input (None) arrives here as NaN; never let it reach the
+    # output files
+    for name, value in inputs.items():
+        bad = ~np.isfinite(value)
+        if np.any(bad):
+            raise ValueError(f"{name} is missing or not finite{_rows_suffix(bad)}")
+
+
+def compute_conflict_geometry_batch(
     tcpa_sec,
     cpa_horiz_m,
     os_lat_deg,
@@ -40,13 +117,50 @@ def compute_conflict_geometry(
     conflict_dh_m,
     target_alto_m,
     relative_heading_deg,
-    post_cpa_sec=0
+    post_cpa_sec=0,
+    ellipsoidal=False
 ):
+    """
+    Vectorized compute_conflict_geometry.
+
+    Every input may be a scalar or an array; inputs are broadcast against
+    each other. Returns a ConflictGeometry whose fields are arrays of the
+    broadcast shape. Position fields (os_start, os_cpa, ...) carry a
+    trailing axis of 3: (lat, lon, alt). Nothing is printed. Raises
+    ValueError if any input is missing (None) or not finite.
+
+    ellipsoidal: place offsets with the WGS-84 ENU projector instead of
+    the spherical approximation (see projection.LocalProjector).
+    """
+
+    (
+        tcpa_sec, cpa_horiz_m,
+        os_lat_deg, os_lon_deg, os_alt_m,
+        os_course_deg, os_speed_mps, os_vspeed_mps,
+        rel_speed_mps, conflict_dh_m, target_alto_m,
+        relative_heading_deg, post_cpa_sec
+    ) = np.broadcast_arrays(*[
+        np.asarray(v, dtype=float) for v in (
+            tcpa_sec, cpa_horiz_m,
+            os_lat_deg, os_lon_deg, os_alt_m,
+            os_course_deg, os_speed_mps, os_vspeed_mps,
+            rel_speed_mps, conflict_dh_m, target_alto_m,
+            relative_heading_deg, post_cpa_sec
+        )
+    ])
+
+    _check_finite(
+        tcpa_sec=tcpa_sec, cpa_horiz_m=cpa_horiz_m,
+        os_lat_deg=os_lat_deg, os_lon_deg=os_lon_deg, os_alt_m=os_alt_m,
+        os_course_deg=os_course_deg, os_speed_mps=os_speed_mps, os_vspeed_mps=os_vspeed_mps,
+        rel_speed_mps=rel_speed_mps, conflict_dh_m=conflict_dh_m, target_alto_m=target_alto_m,
+        relative_heading_deg=relative_heading_deg, post_cpa_sec=post_cpa_sec
+    )
 
-    os_course_rad = math.radians(os_course_deg % 360.0)
+    os_course_rad = np.radians(os_course_deg % 360.0)
 
-    vx_os = os_speed_mps * math.sin(os_course_rad)
-    vy_os = os_speed_mps * math.cos(os_course_rad)
+    vx_os = os_speed_mps * np.sin(os_course_rad)
+    vy_os = os_speed_mps * np.cos(os_course_rad)
     vz_os = os_vspeed_mps
 
     dx_os = vx_os * tcpa_sec
@@ -56,17 +170,21 @@ def compute_conflict_geometry(
     os_alt_cpa = os_alt_m + dz_os
 
     tgt_course_deg = (os_course_deg + (relative_heading_deg % 360.0)) % 360.0
-    tgt_course_rad = math.radians(tgt_course_deg)
+    tgt_course_rad = np.radians(tgt_course_deg)
 
     tgt_speed_mps = os_speed_mps + rel_speed_mps
 
-    vx_tgt = tgt_speed_mps * math.sin(tgt_course_rad)
-    vy_tgt = tgt_speed_mps * math.cos(tgt_course_rad)
+    vx_tgt = tgt_speed_mps * np.sin(tgt_course_rad)
+    vy_tgt = tgt_speed_mps * np.cos(tgt_course_rad)
 
-    if abs(tcpa_sec) < 1e-9:
-        vz_tgt = vz_os
-    else:
-        vz_tgt = vz_os + ((conflict_dh_m - target_alto_m) / tcpa_sec)
+    # Zero TCPA: target keeps ownship vertical speed (avoid dividing by 0)
+    tcpa_zero = np.abs(tcpa_sec) < 1e-9
+    safe_tcpa = np.where(tcpa_zero, 1.0, tcpa_sec)
+    vz_tgt = np.where(
+        tcpa_zero,
+        vz_os,
+        vz_os + ((conflict_dh_m - target_alto_m) / safe_tcpa)
+    )
 
     dz_tgt = vz_tgt * tcpa_sec
     dx_tgt = vx_tgt * tcpa_sec
@@ -76,115 +194,145 @@ def compute_conflict_geometry(
     vy_rel = vy_tgt - vy_os
     vz_rel = vz_tgt - vz_os
 
-    vrel_h = math.hypot(vx_rel, vy_rel)
+    vrel_h = np.hypot(vx_rel, vy_rel)
 
-    if vrel_h < 1e-6:
-        ux_perp = 0.0
-        uy_perp = 1.0
-    else:
-        ux_perp = -vy_rel / vrel_h
-        uy_perp = vx_rel / vrel_h
+    # No horizontal closure: offset the CPA due north
+    parallel = vrel_h < 1e-6
+    safe_vrel_h = np.where(parallel, 1.0, vrel_h)
+    ux_perp = np.where(parallel, 0.0, -vy_rel / safe_vrel_h)
+    uy_perp = np.where(parallel, 1.0, vx_rel / safe_vrel_h)
 
     r_cpa_x = ux_perp * cpa_horiz_m
     r_cpa_y = uy_perp * cpa_horiz_m
-    r_cpa_z = conflict_dh_m
 
     r0_x = r_cpa_x - vx_rel * tcpa_sec
     r0_y = r_cpa_y - vy_rel * tcpa_sec
     r0_z = target_alto_m
 
-    os_start = (os_lat_deg, os_lon_deg, os_alt_m)
+    # Every offset is taken from the ownship start
+    projector = LocalProjector(os_lat_deg, os_lon_deg, ellipsoidal=ellipsoidal)
 
-    os_cpa_lat, os_cpa_lon = meters_to_latlon(os_lat_deg, os_lon_deg, dx_os, dy_os)
-    os_cpa = (os_cpa_lat, os_cpa_lon, os_alt_cpa)
+    os_start = np.stack([os_lat_deg, os_lon_deg, os_alt_m], axis=-1)
 
-    tgt_start_lat, tgt_start_lon = meters_to_latlon(os_lat_deg, os_lon_deg, r0_x, r0_y)
+    os_cpa_lat, os_cpa_lon = projector.to_latlon(dx_os, dy_os)
+    os_cpa = np.stack([os_cpa_lat, os_cpa_lon, os_alt_cpa], axis=-1)
+
+    tgt_start_lat, tgt_start_lon = projector.to_latlon(r0_x, r0_y)
     tgt_start_alt = os_alt_m + r0_z
-    tgt_start = (tgt_start_lat, tgt_start_lon, tgt_start_alt)
+    tgt_start = np.stack([tgt_start_lat, tgt_start_lon, tgt_start_alt], axis=-1)
 
     tgt_cpa_dx = r0_x + dx_tgt
     tgt_cpa_dy = r0_y + dy_tgt
 
-    tgt_cpa_lat, tgt_cpa_lon = meters_to_latlon(os_lat_deg, os_lon_deg, tgt_cpa_dx, tgt_cpa_dy)
+    tgt_cpa_lat, tgt_cpa_lon = projector.to_latlon(tgt_cpa_dx, tgt_cpa_dy)
     tgt_alt_cpa = tgt_start_alt + dz_tgt
-    tgt_cpa = (tgt_cpa_lat, tgt_cpa_lon, tgt_alt_cpa)
-
-    # ============================================================
-    # ✅ FIXED POST-CPA CONTINUATION (ONLY CHANGE)
-    # ============================================================
+    tgt_cpa = np.stack([tgt_cpa_lat, tgt_cpa_lon, tgt_alt_cpa], axis=-1)
 
     # Ownship continues forward AFTER CPA
-    os_post_dx = vx_os * post_cpa_sec
-    os_post_dy = vy_os * post_cpa_sec
-    os_post_dz = vz_os * post_cpa_sec
-
-    os_total_dx = dx_os + os_post_dx
-    os_total_dy = dy_os + os_post_dy
+    os_total_dx = dx_os + vx_os * post_cpa_sec
+    os_total_dy = dy_os + vy_os * post_cpa_sec
 
-    os_end_lat, os_end_lon = meters_to_latlon(os_lat_deg, os_lon_deg, os_total_dx, os_total_dy)
-    os_end_alt = os_alt_cpa + os_post_dz
-    os_end = (os_end_lat, os_end_lon, os_end_alt)
+    os_end_lat, os_end_lon = projector.to_latlon(os_total_dx, os_total_dy)
+    os_end_alt = os_alt_cpa + vz_os * post_cpa_sec
+    os_end = np.stack([os_end_lat, os_end_lon, os_end_alt], axis=-1)
 
     # Target continues forward AFTER CPA
-    tgt_post_dx = vx_tgt * post_cpa_sec
-    tgt_post_dy = vy_tgt * post_cpa_sec
-    tgt_post_dz = vz_tgt * post_cpa_sec
+    tgt_total_dx = r0_x + dx_tgt + vx_tgt * post_cpa_sec
+    tgt_total_dy = r0_y + dy_tgt + vy_tgt * post_cpa_sec
 
-    tgt_total_dx = r0_x + dx_tgt + tgt_post_dx
-    tgt_total_dy = r0_y + dy_tgt + tgt_post_dy
-
-    tgt_end_lat, tgt_end_lon = meters_to_latlon(os_lat_deg, os_lon_deg, tgt_total_dx, tgt_total_dy)
-    tgt_end_alt = tgt_alt_cpa + tgt_post_dz
-    tgt_end = (tgt_end_lat, tgt_end_lon, tgt_end_alt)
-
-    # ============================================================
+    tgt_end_lat, tgt_end_lon = projector.to_latlon(tgt_total_dx, tgt_total_dy)
+    tgt_end_alt = tgt_alt_cpa + vz_tgt * post_cpa_sec
+    tgt_end = np.stack([tgt_end_lat, tgt_end_lon, tgt_end_alt], axis=-1)
 
     r_tcpa_x = r0_x + vx_rel * tcpa_sec
     r_tcpa_y = r0_y + vy_rel * tcpa_sec
     r_tcpa_z = r0_z + vz_rel * tcpa_sec
 
-    cpa_sep_horiz_m = math.hypot(r_tcpa_x, r_tcpa_y)
-    cpa_sep_vert_m = abs(r_tcpa_z)
-    cpa_sep_3d_m = math.sqrt(r_tcpa_x**2 + r_tcpa_y**2 + r_tcpa_z**2)
+    cpa_sep_horiz_m = np.hypot(r_tcpa_x, r_tcpa_y)
+    cpa_sep_vert_m = np.abs(r_tcpa_z)
+    cpa_sep_3d_m = np.sqrt(r_tcpa_x**2 + r_tcpa_y**2 + r_tcpa_z**2)
+
+    return ConflictGeometry(
+        os_start=os_start,
+        os_cpa=os_cpa,
+        os_end=os_end,
+
+        tgt_start=tgt_start,
+        tgt_cpa=tgt_cpa,
+        tgt_end=tgt_end,
+
+        tgt_course_deg=tgt_course_deg,
+        cpa_sep_horiz_m=cpa_sep_horiz_m,
+        cpa_sep_vert_m=cpa_sep_vert_m,
+        cpa_sep_3d_m=cpa_sep_3d_m,
+        os_speed_mps=os_speed_mps,
+        os_vspeed_mps=os_vspeed_mps,
+        os_course_deg=os_course_deg,
+
+        tgt_speed_mps=tgt_speed_mps,
+
+        vx_os=vx_os,
+        vy_os=vy_os,
+        vz_os=vz_os,
+        vx_tgt=vx_tgt,
+        vy_tgt=vy_tgt,
+        vz_tgt=vz_tgt,
+    )
 
-    print("OS CPA ALT (ft):", round(m_to_ft(os_cpa[2]), 3))
-    print("Target CPA ALT (ft):", round(m_to_ft(tgt_cpa[2]), 3))
-    print("Conflict DH Input (ft):", round(m_to_ft(conflict_dh_m), 3))
-    print("Target Alt Offset Input (ft):", round(m_to_ft(target_alto_m), 3))
-    print("Horizontal CPA Separation (ft):", round(m_to_ft(cpa_sep_horiz_m), 3))
-    print("Vertical CPA Separation (ft):", round(m_to_ft(cpa_sep_vert_m), 3))
-    print("3D CPA Separation (ft):", round(m_to_ft(cpa_sep_3d_m), 3))
-
-    return (
-        {
-            "os_start": os_start,
-            "os_cpa": os_cpa,
-            "os_end": os_end,
-
-            "tgt_start": tgt_start,
-            "tgt_cpa": tgt_cpa,
-            "tgt_end": tgt_end,
-
-            "tgt_course_deg": tgt_course_deg,
-            "cpa_sep_horiz_m": cpa_sep_horiz_m,
-            "cpa_sep_vert_m": cpa_sep_vert_m,
-            "cpa_sep_3d_m": cpa_sep_3d_m,
-            "os_speed_mps": os_speed_mps,
-            "os_vspeed_mps": os_vspeed_mps,
-            "os_course_deg": os_course_deg,
-
-            "tgt_speed_mps": tgt_speed_mps,
-            "tgt_course_deg": tgt_course_deg,
-
-            "vx_os": vx_os,
-            "vy_os": vy_os,
-            "vz_os": vz_os,
-            "vx_tgt": vx_tgt,
-            "vy_tgt": vy_tgt,
-            "vz_tgt": vz_tgt,
-        }
+
+def compute_conflict_geometry(
+    tcpa_sec,
+    cpa_horiz_m,
+    os_lat_deg,
+    os_lon_deg,
+    os_alt_m,
+    os_course_deg,
+    os_speed_mps,
+    os_vspeed_mps,
+    rel_speed_mps,
+    conflict_dh_m,
+    target_alto_m,
+    relative_heading_deg,
+    post_cpa_sec=0,
+    report=None,
+    ellipsoidal=False
+):
+    """
+    Solve one encounter; returns a ConflictGeometry.
+
+    report: optional hook called as report(points, conflict_dh_m,
+    target_alto_m), e.g. print_conflict_summary for console output.
+    ellipsoidal: use the WGS-84 ENU projector for long-range encounters.
+    """
+
+    batch = compute_conflict_geometry_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_horiz_m=cpa_horiz_m,
+        os_lat_deg=os_lat_deg,
+        os_lon_deg=os_lon_deg,
+        os_alt_m=os_alt_m,
+        os_course_deg=os_course_deg,
+        os_speed_mps=os_speed_mps,
+        os_vspeed_mps=os_vspeed_mps,
+        rel_speed_mps=rel_speed_mps,
+        conflict_dh_m=conflict_dh_m,
+        target_alto_m=target_alto_m,
+        relative_heading_deg=relative_heading_deg,
+        post_cpa_sec=post_cpa_sec,
+        ellipsoidal=ellipsoidal
+    )
+
+    # Unpack 0-d arrays back into plain floats / (lat, lon, alt) tuples
+    points = ConflictGeometry._make(
+        tuple(value.tolist()) if value.ndim else value.item()
+        for value in batch
     )
 
+    if report is not None:
+        report(points, conflict_dh_m, target_alto_m)
+
+    return points
+
 
 # ============================================================
 # TYPE 2
@@ -203,56 +351,165 @@ def compute_conflict_geometry(
 # - target course
 # ============================================================
 
-def compute_initial_positions_type2(
+def compute_initial_positions_type2_batch(
     tcpa_sec,
     cpa_lat,
     cpa_lon,
     os_s_lat, os_s_lon, os_e_lat, os_e_lon,
     tgt_s_lat, tgt_s_lon, tgt_e_lat, tgt_e_lon,
     os_speed_mps,
-    tgt_speed_mps
+    tgt_speed_mps,
+    ellipsoidal=False
 ):
+    """
+    Vectorized compute_initial_positions_type2.
+
+    Inputs may be scalars or arrays and are broadcast against each other.
+    Returns the same keys with array values; os_init / tgt_init carry a
+    trailing (lat, lon) axis. Raises ValueError if any path is degenerate.
+    """
+
+    (
+        tcpa_sec, cpa_lat, cpa_lon,
+        os_e_lat, os_e_lon, tgt_e_lat, tgt_e_lon,
+        os_speed_mps, tgt_speed_mps
+    ) = np.broadcast_arrays(*[
+        np.asarray(v, dtype=float) for v in (
+            tcpa_sec, cpa_lat, cpa_lon,
+            os_e_lat, os_e_lon, tgt_e_lat, tgt_e_lon,
+            os_speed_mps, tgt_speed_mps
+        )
+    ])
+
+    _check_finite(
+        tcpa_sec=tcpa_sec, cpa_lat=cpa_lat, cpa_lon=cpa_lon,
+        os_e_lat=os_e_lat, os_e_lon=os_e_lon, tgt_e_lat=tgt_e_lat, tgt_e_lon=tgt_e_lon,
+        os_speed_mps=os_speed_mps, tgt_speed_mps=tgt_speed_mps
+    )
+
+    projector = LocalProjector(cpa_lat, cpa_lon, ellipsoidal=ellipsoidal)
+
     # Ownship line direction
-    os_dx_line, os_dy_line = latlon_to_local_m(cpa_lat, cpa_lon, os_e_lat, os_e_lon)
-    os_mag = math.hypot(os_dx_line, os_dy_line)
-    if os_mag < 1e-9:
-        raise ValueError("Ownship path start/end cannot be identical")
+    os_dx_line, os_dy_line = projector.to_local(os_e_lat, os_e_lon)
+    os_mag = np.hypot(os_dx_line, os_dy_line)
+    if np.any(os_mag < 1e-9):
+        raise ValueError(f"Ownship path start/end cannot be identical{_rows_suffix(os_mag < 1e-9)}")
 
     os_ux = os_dx_line / os_mag
     os_uy = os_dy_line / os_mag
 
     # Target line direction
-    tgt_dx_line, tgt_dy_line = latlon_to_local_m(cpa_lat, cpa_lon, tgt_e_lat, tgt_e_lon)
-    tgt_mag = math.hypot(tgt_dx_line, tgt_dy_line)
-    if tgt_mag < 1e-9:
-        raise ValueError("Target path start/end cannot be identical")
+    tgt_dx_line, tgt_dy_line = projector.to_local(tgt_e_lat, tgt_e_lon)
+    tgt_mag = np.hypot(tgt_dx_line, tgt_dy_line)
+    if np.any(tgt_mag < 1e-9):
+        raise ValueError(f"Target path start/end cannot be identical{_rows_suffix(tgt_mag < 1e-9)}")
 
     tgt_ux = tgt_dx_line / tgt_mag
     tgt_uy = tgt_dy_line / tgt_mag
 
     # Reverse from CPA by tcpa to find initial positions
-    os_back_dx = os_ux * os_speed_mps * tcpa_sec
-    os_back_dy = os_uy * os_speed_mps * tcpa_sec
+    os_back = os_speed_mps * tcpa_sec
+    tgt_back = tgt_speed_mps * tcpa_sec
+
+    os_init_lat, os_init_lon = projector.to_latlon(-os_ux * os_back, -os_uy * os_back)
+    tgt_init_lat, tgt_init_lon = projector.to_latlon(-tgt_ux * tgt_back, -tgt_uy * tgt_back)
+
+    os_course_deg = (np.degrees(np.arctan2(os_ux, os_uy)) + 360.0) % 360.0
+    tgt_course_deg = (np.degrees(np.arctan2(tgt_ux, tgt_uy)) + 360.0) % 360.0
 
-    tgt_back_dx = tgt_ux * tgt_speed_mps * tcpa_sec
-    tgt_back_dy = tgt_uy * tgt_speed_mps * tcpa_sec
+    return {
+        "os_init": np.stack([os_init_lat, os_init_lon], axis=-1),
+        "tgt_init": np.stack([tgt_init_lat, tgt_init_lon], axis=-1),
+        "os_course_deg": os_course_deg,
+        "tgt_course_deg": tgt_course_deg
+    }
 
-    os_init_lat, os_init_lon = meters_to_latlon(
-        cpa_lat, cpa_lon,
-        -os_back_dx, -os_back_dy
+
+def compute_initial_positions_type2(
+    tcpa_sec,
+    cpa_lat,
+    cpa_lon,
+    os_s_lat, os_s_lon, os_e_lat, os_e_lon,
+    tgt_s_lat, tgt_s_lon, tgt_e_lat, tgt_e_lon,
+    os_speed_mps,
+    tgt_speed_mps,
+    ellipsoidal=False
+):
+    init = compute_initial_positions_type2_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_lat=cpa_lat,
+        cpa_lon=cpa_lon,
+        os_s_lat=os_s_lat, os_s_lon=os_s_lon, os_e_lat=os_e_lat, os_e_lon=os_e_lon,
+        tgt_s_lat=tgt_s_lat, tgt_s_lon=tgt_s_lon, tgt_e_lat=tgt_e_lat, tgt_e_lon=tgt_e_lon,
+        os_speed_mps=os_speed_mps,
+        tgt_speed_mps=tgt_speed_mps,
+        ellipsoidal=ellipsoidal
     )
 
-    tgt_init_lat, tgt_init_lon = meters_to_latlon(
-        cpa_lat, cpa_lon,
-        -tgt_back_dx, -tgt_back_dy
+    return {
+        "os_init": tuple(init["os_init"].tolist()),
+        "tgt_init": tuple(init["tgt_init"].tolist()),
+        "os_course_deg": init["os_course_deg"].item(),
+        "tgt_course_deg": init["tgt_course_deg"].item()
+    }
+
+
+def compute_conflict_geometry_type2_batch(
+    tcpa_sec,
+    cpa_lat,
+    cpa_lon,
+    os_s_lat, os_s_lon, os_e_lat, os_e_lon,
+    tgt_s_lat, tgt_s_lon, tgt_e_lat, tgt_e_lon,
+    os_speed_mps,
+    tgt_speed_mps,
+    os_alt_m,
+    os_vspeed_mps,
+    conflict_dh_m,
+    target_alto_m,
+    post_cpa_sec=0,
+    ellipsoidal=False
+):
+    """
+    Full TCT+ pipeline for many path pairs in one call: solve initial
+    positions and courses, then run them through
+    compute_conflict_geometry_batch exactly as the single-scenario flow
+    does (CPA on the paths, heading and speed taken relative to ownship).
+
+    Returns (init, points) with array values.
+    """
+
+    init = compute_initial_positions_type2_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_lat=cpa_lat,
+        cpa_lon=cpa_lon,
+        os_s_lat=os_s_lat, os_s_lon=os_s_lon, os_e_lat=os_e_lat, os_e_lon=os_e_lon,
+        tgt_s_lat=tgt_s_lat, tgt_s_lon=tgt_s_lon, tgt_e_lat=tgt_e_lat, tgt_e_lon=tgt_e_lon,
+        os_speed_mps=os_speed_mps,
+        tgt_speed_mps=tgt_speed_mps,
+        ellipsoidal=ellipsoidal
     )
 
-    os_course_deg = (math.degrees(math.atan2(os_ux, os_uy)) + 360.0) % 360.0
-    tgt_course_deg = (math.degrees(math.atan2(tgt_ux, tgt_uy)) + 360.0) % 360.0
+    os_course = init["os_course_deg"]
+    tgt_course = init["tgt_course_deg"]
+
+    relative_heading = (tgt_course - os_course + 360.0) % 360.0
+    rel_speed_mps = np.asarray(tgt_speed_mps, dtype=float) - np.asarray(os_speed_mps, dtype=float)
+
+    points = compute_conflict_geometry_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_horiz_m=0.0,
+        os_lat_deg=init["os_init"][..., 0],
+        os_lon_deg=init["os_init"][..., 1],
+        os_alt_m=os_alt_m,
+        os_course_deg=os_course,
+        os_speed_mps=os_speed_mps,
+        os_vspeed_mps=os_vspeed_mps,
+        rel_speed_mps=rel_speed_mps,
+        conflict_dh_m=conflict_dh_m,
+        target_alto_m=target_alto_m,
+        relative_heading_deg=relative_heading,
+        post_cpa_sec=post_cpa_sec,
+        ellipsoidal=ellipsoidal
+    )
 
-    return {
-        "os_init": (os_init_lat, os_init_lon),
-        "tgt_init": (tgt_init_lat, tgt_init_lon),
-        "os_course_deg": os_course_deg,
-        "tgt_course_deg": tgt_course_deg
-    }
\ No newline at end of file
+    return init, points
@@ -0,0 +1,307 @@
+import argparse
+import csv
+import inspect
+import json
+import math
+
+import numpy as np
+
+from conflict_math import (
+    compute_conflict_geometry_batch,
+    compute_conflict_geometry_type2_batch
+)
+
+# =========================================================
+# DESIGN OF EXPERIMENTS
+# Space-filling samples over the encounter parameter space so
+# the SITL envelope is covered with far fewer runs than a
+# grid: Latin hypercube, Sobol and Halton sequences, plus
+# adaptive refinement that adds points where validation
+# error is highest.
+#
+# Samplers return points in the unit hypercube [0, 1)^d;
+# scale_design maps them onto {parameter: (low, high)}.
+# =========================================================
+
+# Any numeric keyword of the TCT / TCT+ batch solvers may be designed over
+DESIGN_PARAMETERS = tuple(
+    name for name in dict.fromkeys(
+        list(inspect.signature(compute_conflict_geometry_batch).parameters)
+        + list(inspect.signature(compute_conflict_geometry_type2_batch).parameters)
+    )
+    if name != "ellipsoidal"
+)
+
+
+# ---------------------------------------------------------
+# Latin hypercube
+# ---------------------------------------------------------
+
+def latin_hypercube(n, d, seed=None, maximin_candidates=1):
+    """
+    One point per stratum in every dimension. With maximin_candidates
+    > 1, that many designs are drawn and the one with the largest
+    minimum pairwise distance is kept.
+    """
+    rng = np.random.default_rng(seed)
+
+    best, best_score = None, -1.0
+
+    for _ in range(max(1, maximin_candidates)):
+        strata = np.argsort(rng.random((d, n)), axis=1).T
+        sample = (strata + rng.random((n, d))) / n
+
+        if maximin_candidates <= 1:
+            return sample
+
+        score = _min_distance(sample)
+        if score > best_score:
+            best, best_score = sample, score
+
+    return best
+
+
+def _min_distance(points):
+    diff = points[:, None, :] - points[None, :, :]
+    dist = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+    np.fill_diagonal(dist, np.inf)
+    return float(dist.min())
+
+
+# ---------------------------------------------------------
+# Sobol (Joe & Kuo direction numbers, first 16 dimensions)
+# ---------------------------------------------------------
+
+# (s, a, m_1..m_s) for dimensions 2..16; dimension 1 is van der Corput
+_SOBOL_PARAMS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+]
+
+_SOBOL_BITS = 32
+
+
+def _sobol_directions(d):
+    if d > len(_SOBOL_PARAMS) + 1:
+        raise ValueError(f"Sobol sampler supports up to {len(_SOBOL_PARAMS) + 1} dimensions")
+
+    bits = _SOBOL_BITS
+    v = np.zeros((d, bits), dtype=np.uint64)
+
+    # Dimension 1: v_k = 2^(bits - k)
+    v[0] = [1 << (bits - 1 - k) for k in range(bits)]
+
+    for j in range(1, d):
+        s, a, m = _SOBOL_PARAMS[j - 1]
+        m = list(m)
+        for k in range(s, bits):
+            new = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    new ^= m[k - i] << i
+            m.append(new)
+        v[j] = [m[k] << (bits - 1 - k) for k in range(bits)]
+
+    return v
+
+
+def sobol(n, d, seed=None, skip=0):
+    """
+    First n points of the d-dimensional Sobol sequence (after skip).
+    With a seed, a random digital shift scrambles the sequence while
+    keeping its (t, m, s)-net structure. Use powers of two for n.
+    """
+    v = _sobol_directions(d)
+
+    index = np.arange(skip, skip + n, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+
+    x = np.zeros((n, d), dtype=np.uint64)
+    for k in range(_SOBOL_BITS):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        x[bit] ^= v[:, k]
+
+    if seed is not None:
+        shift = np.random.default_rng(seed).integers(0, 1 << _SOBOL_BITS, d, dtype=np.uint64)
+        x ^= shift
+
+    return x.astype(float) / float(1 << _SOBOL_BITS)
+
+
+# ---------------------------------------------------------
+# Halton
+# ---------------------------------------------------------
+
+def _primes(count):
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def halton(n, d, seed=None, skip=1):
+    """
+    Halton sequence (radical inverse in the first d primes). The origin
+    is skipped by default. With a seed, each dimension gets a random
+    Cranley-Patterson shift.
+    """
+    index = np.arange(skip, skip + n, dtype=np.int64)
+    out = np.empty((n, d))
+
+    for j, base in enumerate(_primes(d)):
+        value = np.zeros(n)
+        scale = 1.0 / base
+        rest = index.copy()
+        while rest.any():
+            value += (rest % base) * scale
+            rest //= base
+            scale /= base
+        out[:, j] = value
+
+    if seed is not None:
+        out = (out + np.random.default_rng(seed).random(d)) % 1.0
+
+    return out
+
+
+SAMPLERS = {
+    "lhs": latin_hypercube,
+    "sobol": sobol,
+    "halton": halton,
+}
+
+
+# ---------------------------------------------------------
+# Scaling to the encounter space
+# ---------------------------------------------------------
+
+def scale_design(unit, space):
+    """
+    Map unit-cube points onto space = {parameter: (low, high)}, in
+    column order. Returns {parameter: array}, ready to pass to
+    compute_conflict_geometry_batch / compute_conflict_geometry_type2_batch.
+    """
+    unknown = set(space) - set(DESIGN_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown design parameters: {sorted(unknown)}")
+
+    if unit.shape[1] != len(space):
+        raise ValueError(f"Design has {unit.shape[1]} columns for {len(space)} parameters")
+
+    return {
+        name: low + (high - low) * unit[:, j]
+        for j, (name, (low, high)) in enumerate(space.items())
+    }
+
+
+def make_design(method, n, space, seed=None):
+    """Sample n points with the named method; returns (unit, params)."""
+    try:
+        sampler = SAMPLERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown design method: {method}") from None
+
+    unit = sampler(n, len(space), seed=seed)
+    return unit, scale_design(unit, space)
+
+
+# ---------------------------------------------------------
+# Adaptive refinement
+# ---------------------------------------------------------
+
+def refine(unit, errors, n_new, seed=None, top_fraction=0.1, candidates_per_point=32):
+    """
+    Propose n_new unit-cube points where validation error is highest.
+
+    The worst top_fraction of evaluated points seed local candidate
+    clouds (a box as wide as the distance to their nearest neighbour).
+    Candidates are then picked greedily to maximise error-weighted
+    distance from every existing and already-picked point, so new runs
+    fill the gaps around bad regions instead of piling up.
+    """
+    rng = np.random.default_rng(seed)
+
+    unit = np.asarray(unit, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    n, d = unit.shape
+
+    k = max(1, int(math.ceil(top_fraction * n)))
+    worst = np.argsort(errors)[::-1][:k]
+
+    # Local scale: nearest-neighbour distance of each seed point
+    diff = unit[worst, None, :] - unit[None, :, :]
+    dist = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+    dist[np.arange(k), worst] = np.inf
+    radius = np.minimum(dist.min(axis=1), 0.5) if n > 1 else np.full(k, 0.5)
+
+    parent = np.repeat(np.arange(k), candidates_per_point)
+    cand = unit[worst][parent] + (rng.random((parent.size, d)) - 0.5) * 2.0 * radius[parent, None]
+    cand = np.clip(cand, 0.0, np.nextafter(1.0, 0.0))
+
+    span = errors.max() - errors.min()
+    weight = 1.0 + (errors[worst][parent] - errors.min()) / span if span > 0 else np.ones(parent.size)
+
+    # Distance from every candidate to the closest design point so far
+    diff = cand[:, None, :] - unit[None, :, :]
+    nearest = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff)).min(axis=1)
+
+    picked = []
+    for _ in range(min(n_new, cand.shape[0])):
+        best = int(np.argmax(nearest * weight))
+        picked.append(best)
+
+        step = cand - cand[best]
+        nearest = np.minimum(nearest, np.sqrt(np.einsum("ij,ij->i", step, step)))
+
+    return cand[picked]
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Space-filling encounter designs")
+
+    parser.add_argument("--method", choices=sorted(SAMPLERS), default="sobol")
+    parser.add_argument("--n", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=None)
+
+    # {"tcpa_sec": [30, 180], "relative_heading_deg": [0, 360], ...}
+    parser.add_argument("--space", required=True, help="JSON file of parameter ranges (SI)")
+    parser.add_argument("--out", default="design.csv")
+
+    args = parser.parse_args(argv)
+
+    with open(args.space) as f:
+        space = {k: tuple(v) for k, v in json.load(f).items()}
+
+    _, params = make_design(args.method, args.n, space, seed=args.seed)
+
+    with open(args.out, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(params)
+        writer.writerows(zip(*(values.tolist() for values in params.values())))
+
+    print(f"✅ {args.n} design points written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
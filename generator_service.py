@@ -0,0 +1,479 @@
+import argparse
+import base64
+import collections
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app import (
+    build_bundle,
+    cache_inputs,
+    geometry_inputs,
+    type2_geometry_inputs,
+    type2_position_inputs
+)
+from artifact_cache import ArtifactCache, DEFAULT_MAX_BYTES, scenario_key
+from batch_runner import row_to_args
+from bundle import ScenarioBundle
+from conflict_math import (
+    compute_conflict_geometry,
+    compute_conflict_geometry_batch,
+    compute_initial_positions_type2,
+    compute_initial_positions_type2_batch
+)
+
+# =========================================================
+# GENERATOR SERVICE
+# A resident scenario generator: imports, caches and the
+# process stay warm, so a scenario costs milliseconds
+# instead of a Python start-up.
+#
+# Protocol: one JSON object per request, one per response.
+# Request fields are app.py option names (mode, tcpa,
+# os_lat, ...), plus optional
+#
+#   id       echoed in the response
+#   out      write the bundle into this directory
+#   archive  write it into one .zip / .tar.gz / .tar.xz
+#   names    only these file names
+#
+# out / archive are relative to the service's output_root
+# (--output_root) and must resolve inside it; without an
+# output root the service never writes files.
+#
+# Responses: {"id", "ok": true, "cached", "paths": [...]} when
+# written to disk, else {"id", "ok": true, "cached", "files":
+# {name: base64}}; failures are {"id", "ok": false, "error"}.
+#
+# Transports: JSON lines on stdin/stdout (default), JSON
+# lines on a Unix socket (--unix), or HTTP POST /generate
+# with one request object or a list (--http).
+#
+# Requests arriving together (pipelined lines, concurrent
+# connections) are collected for up to window_ms and solved
+# together: one compute_initial_positions_type2_batch call
+# for the type2 requests, then one
+# compute_conflict_geometry_batch call for all of them.
+# =========================================================
+
+CONTROL_FIELDS = ("id", "out", "archive", "names")
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MEMORY_ENTRIES = 1024
+
+
+def _init_row(stacked, i):
+    # Row i of a type2 batch, shaped like compute_initial_positions_type2
+    return {
+        "os_init": tuple(stacked["os_init"][i].tolist()),
+        "tgt_init": tuple(stacked["tgt_init"][i].tolist()),
+        "os_course_deg": stacked["os_course_deg"][i].item(),
+        "tgt_course_deg": stacked["tgt_course_deg"][i].item(),
+    }
+
+
+def _solve_stacked(inputs, batch_solver, scalar_solver, row):
+    """
+    Solve a list of kwargs dicts in one batch_solver call; returns one
+    result per dict. A bad row spoils the stacked solve, so on failure
+    every row is solved on its own, with exceptions as results.
+    """
+    if not inputs:
+        return []
+
+    try:
+        stacked = batch_solver(**{name: [kw[name] for kw in inputs] for name in inputs[0]})
+        return [row(stacked, i) for i in range(len(inputs))]
+
+    except Exception:
+        solved = []
+        for kw in inputs:
+            try:
+                solved.append(scalar_solver(**kw))
+            except Exception as e:
+                solved.append(e)
+        return solved
+
+
+def _error(request, exc):
+    return {
+        "id": request.get("id") if isinstance(request, dict) else None,
+        "ok": False,
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+class ScenarioService:
+    """
+    service = ScenarioService(cache_dir=".artifact_cache")
+    response = service.generate({"tcpa": "01:00", "os_lat": 37.6, ...})
+
+    submit() is thread-safe and returns a Future; one worker thread
+    drains the queue in micro-batches. Rendered bundles are kept in an
+    in-memory LRU (memory_entries) and, with cache_dir, in the on-disk
+    ArtifactCache shared with app.py.
+
+    output_root: directory that request "out" / "archive" paths are
+    resolved under; None (default) rejects requests that ask for files
+    on disk.
+    """
+
+    def __init__(
+        self,
+        max_batch=DEFAULT_MAX_BATCH,
+        window_ms=DEFAULT_WINDOW_MS,
+        cache_dir=None,
+        cache_max_bytes=DEFAULT_MAX_BYTES,
+        memory_entries=DEFAULT_MEMORY_ENTRIES,
+        output_root=None
+    ):
+        self.max_batch = max_batch
+        self.output_root = os.path.realpath(output_root) if output_root is not None else None
+        self.window_sec = window_ms / 1000.0
+
+        self.cache = ArtifactCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        self.memory = collections.OrderedDict()
+        self.memory_entries = memory_entries
+
+        self.stats = collections.Counter()
+
+        self.queue = queue.Queue()
+        self._worker = threading.Thread(target=self._loop, name="generator", daemon=True)
+        self._worker.start()
+
+    def submit(self, request):
+        future = Future()
+        self.queue.put((request, future))
+        return future
+
+    def generate(self, request):
+        return self.submit(request).result()
+
+    def close(self):
+        self.queue.put(None)
+        self._worker.join()
+
+    # ---------------------------------------------------------
+    # Micro-batching
+    # ---------------------------------------------------------
+
+    def _loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.window_sec
+
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Finish this batch, then stop
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+
+        pending = []    # (request, future, args, key, geometry kwargs)
+        type2 = []      # (request, future, args, key, initial-position kwargs)
+
+        for request, future in batch:
+            try:
+                args = row_to_args({k: v for k, v in request.items() if k not in CONTROL_FIELDS})
+                # Same key as app.py --cache_dir, so both share cache entries
+                key = scenario_key(cache_inputs(args))
+
+                files = self._cached(key)
+                if files is not None:
+                    future.set_result(self._respond(request, ScenarioBundle(files), cached=True))
+                    continue
+
+                if args.mode == "type1":
+                    pending.append((request, future, args, key, geometry_inputs(args)))
+                else:
+                    type2.append((request, future, args, key, type2_position_inputs(args)))
+
+            except Exception as e:
+                future.set_result(_error(request, e))
+
+        # ---- Type 2: stacked initial positions, then the shared stage ----
+        inits = _solve_stacked(
+            [t[4] for t in type2],
+            compute_initial_positions_type2_batch,
+            compute_initial_positions_type2,
+            _init_row
+        )
+
+        for (request, future, args, key, _), init in zip(type2, inits):
+            try:
+                if isinstance(init, Exception):
+                    raise init
+                pending.append((request, future, args, key, type2_geometry_inputs(args, init)))
+            except Exception as e:
+                future.set_result(_error(request, e))
+
+        # ---- All: one stacked geometry solve ----
+        solved = _solve_stacked(
+            [p[4] for p in pending],
+            compute_conflict_geometry_batch,
+            compute_conflict_geometry,
+            lambda stacked, i: stacked.row(i)
+        )
+
+        for (request, future, args, key, _), points in zip(pending, solved):
+            try:
+                if isinstance(points, Exception):
+                    raise points
+
+                bundle = build_bundle(args, points)
+                self._store(key, bundle.files)
+                future.set_result(self._respond(request, bundle, cached=False))
+
+            except Exception as e:
+                future.set_result(_error(request, e))
+
+    # ---------------------------------------------------------
+    # Caches
+    # ---------------------------------------------------------
+
+    def _cached(self, key):
+        files = self.memory.get(key)
+        if files is not None:
+            self.memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return files
+
+        if self.cache is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.stats["disk_hits"] += 1
+                self._remember(key, hit["files"])
+                return hit["files"]
+
+        return None
+
+    def _remember(self, key, files):
+        self.memory[key] = files
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _store(self, key, files):
+        self._remember(key, files)
+        if self.cache is not None:
+            self.cache.put(key, files)
+
+    # ---------------------------------------------------------
+    # Responses
+    # ---------------------------------------------------------
+
+    def _output_path(self, path):
+        """
+        Resolve a client-supplied path under output_root. Absolute paths,
+        ".." and symlinks that lead outside it are rejected.
+        """
+        if self.output_root is None:
+            raise ValueError("This service does not write files (no output root)")
+
+        target = os.path.realpath(os.path.join(self.output_root, str(path)))
+
+        if os.path.commonpath([self.output_root, target]) != self.output_root:
+            raise ValueError(f"Path is outside the output root: {path}")
+
+        return target
+
+    def _respond(self, request, bundle, cached):
+        response = {"id": request.get("id"), "ok": True, "cached": cached}
+        names = request.get("names")
+
+        if request.get("archive"):
+            response["paths"] = [bundle.to_archive(self._output_path(request["archive"]), names=names)]
+        elif request.get("out"):
+            response["paths"] = bundle.to_dir(self._output_path(request["out"]), names=names)
+        else:
+            response["files"] = {
+                name: base64.b64encode(bundle[name]).decode("ascii")
+                for name in (names or bundle.names())
+            }
+
+        return response
+
+
+# =========================================================
+# TRANSPORTS
+# =========================================================
+
+def _parse(line):
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        return request, None
+    except ValueError as e:
+        return None, _error(None, e)
+
+
+def serve_lines(service, lines, write):
+    """
+    JSON-lines loop over any line source. Requests are submitted as
+    they are read (so pipelined requests batch together); responses
+    are written in request order.
+    """
+    responses = queue.Queue()
+
+    def writer():
+        while True:
+            item = responses.get()
+            if item is None:
+                return
+            write(json.dumps(item.result() if isinstance(item, Future) else item) + "\n")
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    for line in lines:
+        if not line.strip():
+            continue
+        request, error = _parse(line)
+        responses.put(error if error is not None else service.submit(request))
+
+    responses.put(None)
+    thread.join()
+
+
+def serve_stdio(service):
+
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    serve_lines(service, sys.stdin, write)
+
+
+def serve_unix(service, path):
+
+    class Handler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+
+            def write(text):
+                self.wfile.write(text.encode("utf-8"))
+                self.wfile.flush()
+
+            serve_lines(service, (line.decode("utf-8") for line in self.rfile), write)
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print(f"✅ Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def serve_http(service, host, port):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send(200, dict(service.stats))
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self._send(404, {"error": "not found"})
+                return
+
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            except ValueError as e:
+                self._send(400, _error(None, e))
+                return
+
+            if isinstance(payload, list):
+                futures = [service.submit(request) for request in payload]
+                self._send(200, [future.result() for future in futures])
+            else:
+                self._send(200, service.generate(payload))
+
+        def log_message(self, *args):
+            pass
+
+    with ThreadingHTTPServer((host, port), Handler) as server:
+        print(f"✅ Listening on http://{host}:{port}/generate", file=sys.stderr)
+        server.serve_forever()
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Resident scenario generator (JSON lines / Unix socket / HTTP)")
+
+    parser.add_argument("--unix", default=None, help="Serve JSON lines on this Unix socket path")
+    parser.add_argument("--http", default=None, help="Serve HTTP on HOST:PORT")
+    parser.add_argument("--max_batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--window_ms", type=float, default=DEFAULT_WINDOW_MS, help="How long to gather a batch")
+    parser.add_argument("--memory_entries", type=int, default=DEFAULT_MEMORY_ENTRIES)
+    parser.add_argument("--cache_dir", default=None, help="Also use the on-disk artifact cache")
+    parser.add_argument(
+        "--output_root", default=None,
+        help="Allow out / archive requests, resolved inside this directory"
+    )
+
+    args = parser.parse_args(argv)
+
+    service = ScenarioService(
+        max_batch=args.max_batch,
+        window_ms=args.window_ms,
+        cache_dir=args.cache_dir,
+        memory_entries=args.memory_entries,
+        output_root=args.output_root
+    )
+
+    try:
+        if args.unix:
+            serve_unix(service, args.unix)
+        elif args.http:
+            host, port = args.http.rsplit(":", 1)
+            serve_http(service, host, int(port))
+        else:
+            serve_stdio(service)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import argparse
+import datetime
+import io
+import json
+import shutil
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from plan_writer import TRACK_COLORS
+from trajectory import iter_states
+from units import ft_to_m
+
+# =========================================================
+# STREAMING KML TRACKS
+# KML for dense trajectories (10 Hz encounters, telemetry
+# replays). Coordinates are formatted a whole block at a
+# time and written straight to the output, so points may
+# come from arrays or from generators of chunks (e.g.
+# trajectory.iter_states) without ever sitting in memory.
+#
+# Tracks are time-stamped gx:Track elements, so Google
+# Earth can animate the encounter with its time slider.
+# =========================================================
+
+KML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2" xmlns:gx="http://www.google.com/kml/ext/2.2">\n'
+    '<Document>\n'
+)
+
+KML_FOOTER = '</Document>\n</kml>\n'
+
+# gx:coord blocks above this size spill from memory to a temp file
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+# ---------------------------------------------------------
+# Bulk formatting
+# ---------------------------------------------------------
+
+def coordinate_block(points, sep=",", precision=(8, 8, 2)):
+    """
+    Text for (N, 3) lat/lon/alt points as KML "lon<sep>lat<sep>alt"
+    lines, formatted in one operation for the whole block.
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    if pts.shape[0] == 0:
+        return ""
+
+    lat_p, lon_p, alt_p = precision
+    row = f"%.{lon_p}f{sep}%.{lat_p}f{sep}%.{alt_p}f\n"
+
+    return (row * pts.shape[0]) % tuple(pts[:, [1, 0, 2]].ravel().tolist())
+
+
+def when_block(t_sec, start_utc):
+    """<when> lines for times t_sec (seconds after the start_utc datetime)."""
+    t = np.asarray(t_sec, dtype=float).ravel()
+    if t.size == 0:
+        return ""
+
+    base = np.datetime64(start_utc.replace(tzinfo=None), "ms")
+    stamps = base + np.round(t * 1000.0).astype("timedelta64[ms]")
+    text = np.datetime_as_string(stamps, unit="ms")
+
+    return "<when>" + "Z</when>\n<when>".join(text.tolist()) + "Z</when>\n"
+
+
+def _chunks(samples):
+    # One (t, points) pair, or any iterable of them
+    if isinstance(samples, tuple) and len(samples) == 2:
+        yield samples
+    else:
+        yield from samples
+
+
+# ---------------------------------------------------------
+# Writer
+# ---------------------------------------------------------
+
+class KmlTrackWriter:
+    """
+    Streaming KML document:
+
+        with KmlTrackWriter("replay.kml", name="Replay") as kml:
+            kml.add_style("own", TRACK_COLORS[0])
+            kml.add_track("Ownship", (t, points), style_id="own")
+
+    target may be a path or a text file object. A .kmz path streams
+    the document straight into a deflated zip entry (doc.kml).
+    """
+
+    def __init__(self, target, name="Encounter", start_utc=None):
+        self._own = isinstance(target, str)
+        self._zip = None
+
+        if self._own and target.lower().endswith(".kmz"):
+            self._zip = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED)
+            self.f = io.TextIOWrapper(
+                self._zip.open("doc.kml", "w", force_zip64=True), encoding="utf-8"
+            )
+        elif self._own:
+            self.f = open(target, "w")
+        else:
+            self.f = target
+
+        self.start_utc = start_utc or datetime.datetime(2000, 1, 1)
+
+        self.f.write(KML_HEADER)
+        self.f.write(f'<name>{name}</name>\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.f is None:
+            return
+        self.f.write(KML_FOOTER)
+        if self._own:
+            self.f.close()
+        if self._zip is not None:
+            self._zip.close()
+        self.f = None
+
+    def add_style(self, style_id, color, width=3):
+        self.f.write(
+            f'<Style id="{style_id}">\n'
+            '<LineStyle>\n'
+            f'<color>{color}</color>\n'
+            f'<width>{width}</width>\n'
+            '</LineStyle>\n'
+            '</Style>\n'
+        )
+
+    def _placemark(self, name, style_id):
+        self.f.write('<Placemark>\n')
+        self.f.write(f'<name>{name}</name>\n')
+        if style_id is not None:
+            self.f.write(f'<styleUrl>#{style_id}</styleUrl>\n')
+
+    def add_line(self, name, points, style_id=None):
+        """
+        LineString placemark. points: (N, 3) lat/lon/alt array or list,
+        or an iterable of such chunks.
+        """
+        self._placemark(name, style_id)
+        self.f.write(
+            '<LineString>\n'
+            '<tessellate>1</tessellate>\n'
+            '<altitudeMode>absolute</altitudeMode>\n'
+            '<coordinates>\n'
+        )
+
+        if isinstance(points, (np.ndarray, list, tuple)):
+            points = [points]
+
+        for chunk in points:
+            self.f.write(coordinate_block(chunk))
+
+        self.f.write('</coordinates>\n</LineString>\n</Placemark>\n')
+
+    def add_track(self, name, samples, style_id=None, start_utc=None):
+        """
+        Time-stamped gx:Track placemark.
+
+        samples: (t_sec, points) with t_sec (N,) seconds after start_utc
+        and points (N, 3) lat/lon/alt, or an iterable of such chunks.
+        KML wants every <when> before the first <gx:coord>, so the
+        coordinates are spooled (to a temp file once large) while the
+        times stream straight out.
+        """
+        start_utc = start_utc or self.start_utc
+
+        self._placemark(name, style_id)
+        self.f.write('<gx:Track>\n<altitudeMode>absolute</altitudeMode>\n')
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES, mode="w+") as coords:
+
+            for t, points in _chunks(samples):
+                body = coordinate_block(points, sep=" ")
+                self.f.write(when_block(t, start_utc))
+                if body:
+                    coords.write("<gx:coord>")
+                    coords.write(body[:-1].replace("\n", "</gx:coord>\n<gx:coord>"))
+                    coords.write("</gx:coord>\n")
+
+            coords.seek(0)
+            shutil.copyfileobj(coords, self.f)
+
+        self.f.write('</gx:Track>\n</Placemark>\n')
+
+
+# ---------------------------------------------------------
+# Sources
+# ---------------------------------------------------------
+
+def write_encounter_tracks(
+    path,
+    points,
+    duration_sec,
+    rate_hz,
+    start_utc=None,
+    names=("Ownship", "Target"),
+    chunk_size=10000,
+    ellipsoidal=False
+):
+    """
+    Animated KML of one encounter (ConflictGeometry from
+    compute_conflict_geometry), sampled at rate_hz from the start for
+    duration_sec. States are propagated chunk by chunk.
+    """
+    with KmlTrackWriter(path, name=f"{names[0]} / {names[1]}", start_utc=start_utc) as kml:
+
+        for i in range(2):
+            kml.add_style(f"track{i}", TRACK_COLORS[i])
+
+        for i, key in enumerate(("os", "tgt")):
+            states = iter_states(
+                points, duration_sec, rate_hz,
+                chunk_size=chunk_size, ellipsoidal=ellipsoidal
+            )
+            kml.add_track(
+                names[i],
+                ((s["t"], s[key]) for s in states),
+                style_id=f"track{i}"
+            )
+
+
+def telemetry_tracks(frames):
+    """
+    Ownship / target samples from telemetry_logger frames:
+    {"ownship": (t, points), "target": (t, points), "start_utc": datetime}
+    with t in seconds after the first frame and altitude in metres.
+    """
+    stamps = np.array([frame["timestamp"] for frame in frames], dtype=float)
+    t = stamps - stamps[0]
+
+    out = {
+        "start_utc": datetime.datetime.fromtimestamp(stamps[0], datetime.timezone.utc)
+    }
+
+    for key in ("ownship", "target"):
+        pts = np.array(
+            [(f[key]["lat"], f[key]["lon"], f[key]["alt_ft"]) for f in frames],
+            dtype=float
+        )
+        pts[:, 2] = ft_to_m(pts[:, 2])
+        out[key] = (t, pts)
+
+    return out
+
+
+def write_telemetry_tracks(path, frames, names=("Ownship", "Target")):
+    """Animated KML replay of a telemetry_logger log."""
+    tracks = telemetry_tracks(frames)
+
+    with KmlTrackWriter(path, name="Telemetry Replay", start_utc=tracks["start_utc"]) as kml:
+
+        for i in range(2):
+            kml.add_style(f"track{i}", TRACK_COLORS[i])
+
+        kml.add_track(names[0], tracks["ownship"], style_id="track0")
+        kml.add_track(names[1], tracks["target"], style_id="track1")
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Animated KML replay of a telemetry log")
+
+    parser.add_argument("--telemetry", default="telemetry_log.json")
+    parser.add_argument("--out", default="telemetry_replay.kml")
+
+    args = parser.parse_args(argv)
+
+    with open(args.telemetry) as f:
+        frames = json.load(f)["frames"]
+
+    t0 = time.perf_counter()
+    write_telemetry_tracks(args.out, frames)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {len(frames)} frames written to {args.out} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import argparse
+import json
+import re
+import zipfile
+
+import numpy as np
+
+from projection import LocalProjector
+
+# =========================================================
+# MISSION READERS
+# Read .plan (QGC JSON), QGC WPL 110 .waypoints and KML /
+# KMZ back into (N, 3) float arrays of (lat, lon, alt), the
+# same point layout plan_writer accepts. The parsers pull
+# the numbers out of the text with one regex / one
+# np.fromstring per file instead of building a dict per
+# mission item, so thousands of files parse per second.
+# =========================================================
+
+_PARAMS = re.compile(r'"params"\s*:\s*\[([^\]]*)\]')
+_HOME = re.compile(r'"plannedHomePosition"\s*:\s*\[([^\]]*)\]')
+
+_LINE_COORDS = re.compile(
+    r"<Placemark>(?:(?!</Placemark>).)*?<name>([^<]*)</name>"
+    r"(?:(?!</Placemark>).)*?<LineString>.*?<coordinates>(.*?)</coordinates>",
+    re.S
+)
+_TRACK = re.compile(
+    r"<Placemark>(?:(?!</Placemark>).)*?<name>([^<]*)</name>"
+    r"(?:(?!</Placemark>).)*?<gx:Track>(.*?)</gx:Track>",
+    re.S
+)
+_WHEN = re.compile(r"<when>([^<]*)</when>")
+_GX_COORD = re.compile(r"<gx:coord>([^<]*)</gx:coord>")
+
+
+def _numbers(text, sep=","):
+    return np.fromstring(text.replace("null", "nan"), sep=sep)
+
+
+def _read_text(path):
+    if path.lower().endswith(".kmz"):
+        with zipfile.ZipFile(path) as z:
+            name = next(n for n in z.namelist() if n.lower().endswith(".kml"))
+            return z.read(name).decode("utf-8")
+
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+# ---------------------------------------------------------
+# .plan
+# ---------------------------------------------------------
+
+def read_plan(path, with_home=False):
+    """
+    Waypoints of a QGroundControl .plan as an (N, 3) array: params
+    4..6 (lat, lon, alt) of every SimpleItem. With with_home=True,
+    returns (points, home) where home is plannedHomePosition.
+
+    Plans with ComplexItems (surveys, ...) fall back to a full JSON
+    parse, keeping only SimpleItems.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    if '"ComplexItem"' in text:
+        return _read_plan_json(text, with_home)
+
+    blocks = _PARAMS.findall(text)
+
+    if blocks:
+        values = _numbers(",".join(blocks))
+        points = values.reshape(len(blocks), -1)[:, 4:7]
+    else:
+        points = np.empty((0, 3))
+
+    if not with_home:
+        return points
+
+    home = _HOME.search(text)
+    return points, (_numbers(home.group(1)) if home else None)
+
+
+def _read_plan_json(text, with_home):
+    data = json.loads(text)
+    mission = data["mission"]
+
+    points = np.array(
+        [
+            item["params"][4:7]
+            for item in mission["items"]
+            if item.get("type") == "SimpleItem"
+        ],
+        dtype=float
+    ).reshape(-1, 3)
+
+    if not with_home:
+        return points
+
+    home = mission.get("plannedHomePosition")
+    return points, (np.asarray(home, dtype=float) if home is not None else None)
+
+
+# ---------------------------------------------------------
+# .waypoints
+# ---------------------------------------------------------
+
+def read_waypoints(path):
+    """
+    QGC WPL 110 file as an (N, 3) array of (lat, lon, alt): columns
+    9..11 of every mission line.
+    """
+    with open(path, encoding="utf-8") as f:
+        header = f.readline()
+        body = f.read()
+
+    if not header.startswith("QGC WPL"):
+        raise ValueError(f"{path}: not a QGC WPL waypoints file")
+
+    values = np.fromstring(body, sep=" ")
+
+    if values.size % 12:
+        raise ValueError(f"{path}: expected 12 columns per waypoint line")
+
+    return values.reshape(-1, 12)[:, 8:11]
+
+
+# ---------------------------------------------------------
+# KML / KMZ
+# ---------------------------------------------------------
+
+def _kml_coordinates(block):
+    # "lon,lat[,alt] lon,lat[,alt] ..." -> (N, 3) lat/lon/alt
+    first = block.split(None, 1)[0] if block.strip() else ""
+    width = first.count(",") + 1 if first else 3
+
+    values = np.fromstring(block.replace(",", " "), sep=" ").reshape(-1, width)
+
+    points = np.zeros((values.shape[0], 3))
+    points[:, 0] = values[:, 1]
+    points[:, 1] = values[:, 0]
+    if width > 2:
+        points[:, 2] = values[:, 2]
+
+    return points
+
+
+def read_kml(path):
+    """
+    Every LineString in a KML or KMZ file, in document order, as a list
+    of (placemark name, (N, 3) lat/lon/alt array).
+    """
+    text = _read_text(path)
+
+    return [
+        (name.strip(), _kml_coordinates(coords))
+        for name, coords in _LINE_COORDS.findall(text)
+    ]
+
+
+def read_kml_tracks(path):
+    """
+    Every gx:Track in a KML or KMZ file (see kml_tracks.py), as a list
+    of (name, when, points): when is a datetime64[ms] array, points an
+    (N, 3) lat/lon/alt array.
+    """
+    text = _read_text(path)
+
+    tracks = []
+    for name, body in _TRACK.findall(text):
+        when = np.array(
+            [stamp.rstrip("Z") for stamp in _WHEN.findall(body)],
+            dtype="datetime64[ms]"
+        )
+        values = np.fromstring(" ".join(_GX_COORD.findall(body)), sep=" ").reshape(-1, 3)
+        tracks.append((name.strip(), when, values[:, [1, 0, 2]]))
+
+    return tracks
+
+
+# ---------------------------------------------------------
+# Dispatch / comparison
+# ---------------------------------------------------------
+
+def read_mission(path):
+    """(N, 3) lat/lon/alt of a .plan, .waypoints or KML/KMZ (first LineString)."""
+    lower = path.lower()
+
+    if lower.endswith(".plan"):
+        return read_plan(path)
+
+    if lower.endswith(".waypoints"):
+        return read_waypoints(path)
+
+    if lower.endswith((".kml", ".kmz")):
+        lines = read_kml(path)
+        if not lines:
+            raise ValueError(f"{path}: no LineString found")
+        return lines[0][1]
+
+    raise ValueError(f"Unknown mission format: {path}")
+
+
+def track_difference(a, b, ellipsoidal=False):
+    """
+    Point-by-point deviation between two (N, 3) tracks of equal length:
+    {"max_horiz_m", "max_vert_m"} (horizontal in the tangent plane at
+    the first point of a).
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+
+    if a.shape != b.shape:
+        raise ValueError(f"Tracks differ in shape: {a.shape} vs {b.shape}")
+
+    if a.shape[0] == 0:
+        return {"max_horiz_m": 0.0, "max_vert_m": 0.0}
+
+    projector = LocalProjector(a[0, 0], a[0, 1], ellipsoidal=ellipsoidal)
+    ax, ay = projector.to_local(a[:, 0], a[:, 1])
+    bx, by = projector.to_local(b[:, 0], b[:, 1])
+
+    return {
+        "max_horiz_m": float(np.max(np.hypot(ax - bx, ay - by))),
+        "max_vert_m": float(np.max(np.abs(a[:, 2] - b[:, 2]))),
+    }
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Read mission files / compare two of them")
+
+    parser.add_argument("paths", nargs="+", help="One file to print, or two to compare")
+
+    args = parser.parse_args(argv)
+
+    tracks = [read_mission(p) for p in args.paths]
+
+    if len(tracks) == 1:
+        for lat, lon, alt in tracks[0].tolist():
+            print(f"{lat:.8f}\t{lon:.8f}\t{alt:.2f}")
+        return
+
+    for path, track in zip(args.paths[1:], tracks[1:]):
+        diff = track_difference(tracks[0], track)
+        print(
+            f"{path}: max horizontal {diff['max_horiz_m']:.3f} m, "
+            f"max vertical {diff['max_vert_m']:.3f} m"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+import argparse
+import collections
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from conflict_math import compute_conflict_geometry_batch
+
+# =========================================================
+# MONTE CARLO ENCOUNTERS
+# Draws encounter parameters from per-parameter distributions
+# and/or a correlated encounter-model table, solves them with
+# the batch geometry and streams the scenarios out.
+#
+# Reproducibility: batch b always uses the random stream
+# SeedSequence(seed, spawn_key=(b,)), independent of how many
+# workers there are or which one runs it. Streams of different
+# batches are statistically independent.
+#
+# Parameter names are the compute_conflict_geometry keyword
+# arguments (SI units).
+# =========================================================
+
+PARAMETERS = (
+    "tcpa_sec",
+    "cpa_horiz_m",
+    "os_lat_deg",
+    "os_lon_deg",
+    "os_alt_m",
+    "os_course_deg",
+    "os_speed_mps",
+    "os_vspeed_mps",
+    "rel_speed_mps",
+    "conflict_dh_m",
+    "target_alto_m",
+    "relative_heading_deg",
+    "post_cpa_sec",
+)
+
+
+# ---------------------------------------------------------
+# Per-parameter distributions
+# ---------------------------------------------------------
+
+def sample_distribution(spec, n, rng):
+    """
+    Draw n values from one distribution spec:
+        {"dist": "constant", "value": v}
+        {"dist": "uniform", "low": a, "high": b}
+        {"dist": "normal", "mean": m, "std": s, "low": a, "high": b}
+            (low/high optional; out-of-range draws are redrawn)
+        {"dist": "triangular", "low": a, "mode": c, "high": b}
+        {"dist": "choice", "values": [...], "p": [...]}
+    A bare number is a constant.
+    """
+    if not isinstance(spec, dict):
+        return np.full(n, float(spec))
+
+    dist = spec.get("dist", "uniform")
+
+    if dist == "constant":
+        return np.full(n, float(spec["value"]))
+
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], n)
+
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], n)
+
+    if dist == "choice":
+        return rng.choice(np.asarray(spec["values"], dtype=float), size=n, p=spec.get("p"))
+
+    if dist == "normal":
+        low = spec.get("low", -np.inf)
+        high = spec.get("high", np.inf)
+        values = rng.normal(spec["mean"], spec["std"], n)
+        bad = (values < low) | (values > high)
+        for _ in range(100):
+            if not bad.any():
+                break
+            values[bad] = rng.normal(spec["mean"], spec["std"], int(bad.sum()))
+            bad = (values < low) | (values > high)
+        if bad.any():
+            raise ValueError(f"Truncation range too narrow for {spec}")
+        return values
+
+    raise ValueError(f"Unknown distribution: {dist}")
+
+
+# ---------------------------------------------------------
+# Correlated encounter-model table
+# ---------------------------------------------------------
+
+class EncounterTable:
+    """
+    Joint distribution as weighted bins. Each row holds a weight and a
+    [low, high] range for some parameters; a draw picks a row by weight,
+    then samples uniformly inside that row's ranges. Correlations live
+    in which combinations of bins carry weight.
+    """
+
+    def __init__(self, rows):
+        if not rows:
+            raise ValueError("Encounter table is empty")
+
+        self.parameters = sorted({k for row in rows for k in row if k != "weight"})
+
+        unknown = set(self.parameters) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown encounter parameters: {sorted(unknown)}")
+
+        weights = np.array([float(row.get("weight", 1.0)) for row in rows])
+        self.p = weights / weights.sum()
+
+        nan = (np.nan, np.nan)
+        self.low = {
+            k: np.array([float(row.get(k, nan)[0]) for row in rows])
+            for k in self.parameters
+        }
+        self.high = {
+            k: np.array([float(row.get(k, nan)[1]) for row in rows])
+            for k in self.parameters
+        }
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        CSV columns: weight, <param>_lo, <param>_hi, ... An empty cell
+        leaves that parameter to the per-parameter distributions.
+        """
+        rows = []
+        with open(path, newline="") as f:
+            for record in csv.DictReader(f):
+                row = {"weight": float(record.get("weight") or 1.0)}
+                for column, value in record.items():
+                    if column.endswith("_lo") and value not in ("", None):
+                        name = column[:-3]
+                        row[name] = (float(value), float(record[name + "_hi"]))
+                rows.append(row)
+        return cls(rows)
+
+    def sample(self, n, rng):
+        bins = rng.choice(len(self.p), size=n, p=self.p)
+        u = rng.random((len(self.parameters), n))
+
+        out = {}
+        for k, name in enumerate(self.parameters):
+            low = self.low[name][bins]
+            high = self.high[name][bins]
+            out[name] = low + (high - low) * u[k]
+
+        return out
+
+
+# ---------------------------------------------------------
+# Generator
+# ---------------------------------------------------------
+
+class EncounterGenerator:
+    """
+    distributions: {parameter: spec} (see sample_distribution)
+    table: optional EncounterTable; its parameters override the
+           per-parameter distributions wherever the row defines them
+    seed: master seed for every stream
+    """
+
+    def __init__(self, distributions=None, table=None, seed=0):
+        self.distributions = dict(distributions or {})
+        self.table = table
+        self.seed = seed
+
+        unknown = set(self.distributions) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown encounter parameters: {sorted(unknown)}")
+
+    def rng(self, batch_index):
+        return np.random.default_rng(
+            np.random.SeedSequence(self.seed, spawn_key=(batch_index,))
+        )
+
+    def sample(self, n, rng):
+        # Fixed order keeps draws reproducible across runs
+        params = {
+            name: sample_distribution(self.distributions[name], n, rng)
+            for name in PARAMETERS if name in self.distributions
+        }
+
+        if self.table is not None:
+            for name, values in self.table.sample(n, rng).items():
+                defined = ~np.isnan(values)
+                if name in params:
+                    params[name] = np.where(defined, values, params[name])
+                elif defined.all():
+                    params[name] = values
+                else:
+                    raise ValueError(f"'{name}' is missing from some table rows and has no distribution")
+
+        missing = set(PARAMETERS) - set(params) - {"post_cpa_sec"}
+        if missing:
+            raise ValueError(f"No distribution for: {sorted(missing)}")
+
+        return params
+
+    def batch(self, batch_index, batch_size):
+        """Parameters and solved geometry for one batch."""
+        params = self.sample(batch_size, self.rng(batch_index))
+        return params, compute_conflict_geometry_batch(**params)
+
+    def iter_batches(self, n_total, batch_size, worker=0, n_workers=1):
+        """
+        Yield (first_index, params, points) for this worker's share of
+        the campaign: batches worker, worker + n_workers, ...
+        """
+        n_batches = -(-n_total // batch_size)
+        for b in range(worker, n_batches, n_workers):
+            size = min(batch_size, n_total - b * batch_size)
+            params, points = self.batch(b, size)
+            yield b * batch_size, params, points
+
+
+def scenario_records(first_index, params, points):
+    """One JSON-ready dict per scenario of a solved batch."""
+    names = list(params)
+    columns = [np.asarray(params[k]).tolist() for k in names]
+
+    os_start = points.os_start.tolist()
+    tgt_start = points.tgt_start.tolist()
+    tgt_course = points.tgt_course_deg.tolist()
+    sep_h = points.cpa_sep_horiz_m.tolist()
+    sep_v = points.cpa_sep_vert_m.tolist()
+    sep_3d = points.cpa_sep_3d_m.tolist()
+
+    for i in range(len(os_start)):
+        yield {
+            "scenario": first_index + i,
+            "inputs": {k: col[i] for k, col in zip(names, columns)},
+            "os_start": os_start[i],
+            "tgt_start": tgt_start[i],
+            "tgt_course_deg": tgt_course[i],
+            "cpa_sep_horiz_m": sep_h[i],
+            "cpa_sep_vert_m": sep_v[i],
+            "cpa_sep_3d_m": sep_3d[i],
+        }
+
+
+def _run_batch(config, batch_index, batch_size):
+    # Worker entry point: rebuild the generator from plain config
+    gen = generator_from_config(config)
+    params, points = gen.batch(batch_index, batch_size)
+    lines = [
+        json.dumps(r) for r in scenario_records(batch_index * batch_size, params, points)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generator_from_config(config):
+    """
+    config: {"seed": int, "distributions": {...},
+             "table": [rows...] or "path/to/table.csv"}
+    """
+    table = config.get("table")
+    if isinstance(table, str):
+        table = EncounterTable.from_csv(table)
+    elif table is not None:
+        table = EncounterTable([
+            {k: (tuple(v) if k != "weight" else v) for k, v in row.items()}
+            for row in table
+        ])
+
+    return EncounterGenerator(
+        distributions=config.get("distributions"),
+        table=table,
+        seed=config.get("seed", 0)
+    )
+
+
+def run_campaign(config, n_total, out_path, batch_size=10000, workers=None):
+    """
+    Generate n_total encounters into a JSON-lines file, batches fanned
+    out over a process pool. Output order follows batch order, so the
+    file is identical for any worker count.
+    """
+    n_batches = -(-n_total // batch_size)
+    sizes = [min(batch_size, n_total - b * batch_size) for b in range(n_batches)]
+
+    with open(out_path, "w") as f:
+
+        if workers == 0:
+            for b, size in enumerate(sizes):
+                f.write(_run_batch(config, b, size))
+            return n_total
+
+        workers = workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+
+            # Bounded window of batches in flight, written in batch order:
+            # wait on the oldest, then top the window back up. At most
+            # max_in_flight batches are queued or held at once.
+            max_in_flight = 2 * workers
+            window = collections.deque()
+
+            for b, size in enumerate(sizes):
+                window.append(pool.submit(_run_batch, config, b, size))
+
+                if len(window) >= max_in_flight:
+                    f.write(window.popleft().result())
+
+            while window:
+                f.write(window.popleft().result())
+
+    return n_total
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Seeded Monte Carlo encounter generator")
+
+    parser.add_argument("--config", required=True, help="JSON model config")
+    parser.add_argument("--n", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=None, help="Overrides the config seed")
+    parser.add_argument("--out", default="encounters.jsonl")
+    parser.add_argument("--batch_size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        config = json.load(f)
+
+    if args.seed is not None:
+        config["seed"] = args.seed
+
+    # Validate once up front instead of in every worker
+    generator_from_config(config).sample(1, np.random.default_rng(0))
+
+    t0 = time.perf_counter()
+    run_campaign(config, args.n, args.out, batch_size=args.batch_size, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {args.n} encounters written to {args.out} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
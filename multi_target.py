@@ -0,0 +1,334 @@
+import argparse
+import json
+
+import numpy as np
+
+from conflict_math import compute_conflict_geometry_batch
+from plan_writer import (
+    write_plan_file,
+    write_waypoints_file,
+    write_kml_file,
+    write_multi_kml_file
+)
+from projection import LocalProjector
+from yaml_writer import write_yaml_file, write_fleet_yaml
+from units import ft_to_m, m_to_ft, kt_to_mps, mps_to_kt, fpm_to_mps, mps_to_fpm, mmss_to_sec
+
+# =========================================================
+# MULTI-INTRUDER ENCOUNTERS
+# One ownship against N targets. Every target keeps the
+# TCT (type 1) parameters of compute_conflict_geometry, so
+# all N are solved in a single batch call against the same
+# ownship state. Pairwise separations between every pair of
+# aircraft (ownship = index 0) come from the same straight-
+# line kinematics.
+# =========================================================
+
+
+def compute_multi_target_geometry(
+    os_lat_deg,
+    os_lon_deg,
+    os_alt_m,
+    os_course_deg,
+    os_speed_mps,
+    os_vspeed_mps,
+    tcpa_sec,
+    cpa_horiz_m,
+    rel_speed_mps,
+    conflict_dh_m,
+    target_alto_m,
+    relative_heading_deg,
+    post_cpa_sec=0,
+    ellipsoidal=False
+):
+    """
+    Ownship inputs are scalars; target inputs are arrays of length N
+    (or scalars shared by every target).
+
+    Returns a dict:
+        targets        ConflictGeometry with array fields, one row per target
+        ownship_track  [os_start, CPA points in time order..., os_end]
+        target_tracks  N x [tgt_start, tgt_cpa, tgt_end]
+        pairwise       (N+1, N+1) matrices, index 0 = ownship:
+                       t_cpa_sec, sep_horiz_m, sep_vert_m, sep_3d_m
+    """
+
+    tcpa_sec = np.atleast_1d(np.asarray(tcpa_sec, dtype=float))
+
+    targets = compute_conflict_geometry_batch(
+        tcpa_sec=tcpa_sec,
+        cpa_horiz_m=cpa_horiz_m,
+        os_lat_deg=os_lat_deg,
+        os_lon_deg=os_lon_deg,
+        os_alt_m=os_alt_m,
+        os_course_deg=os_course_deg,
+        os_speed_mps=os_speed_mps,
+        os_vspeed_mps=os_vspeed_mps,
+        rel_speed_mps=rel_speed_mps,
+        conflict_dh_m=conflict_dh_m,
+        target_alto_m=target_alto_m,
+        relative_heading_deg=relative_heading_deg,
+        post_cpa_sec=post_cpa_sec,
+        ellipsoidal=ellipsoidal
+    )
+
+    n = targets.tgt_start.shape[0]
+    tcpa_sec = np.broadcast_to(tcpa_sec, (n,))
+    end_sec = tcpa_sec + np.broadcast_to(np.asarray(post_cpa_sec, dtype=float), (n,))
+
+    # ---- Ownship: one straight line through every CPA ----
+    order = np.argsort(tcpa_sec, kind="stable")
+    last = order[-1]
+
+    ownship_track = [tuple(targets.os_start[0].tolist())]
+    ownship_track += [tuple(targets.os_cpa[i].tolist()) for i in order]
+
+    # The ownship must fly on until the last target's post-CPA leg ends
+    longest = int(np.argmax(end_sec))
+    ownship_track.append(tuple(targets.os_end[longest].tolist()))
+
+    target_tracks = [
+        [
+            tuple(targets.tgt_start[i].tolist()),
+            tuple(targets.tgt_cpa[i].tolist()),
+            tuple(targets.tgt_end[i].tolist()),
+        ]
+        for i in range(n)
+    ]
+
+    # ---- Pairwise CPA over every aircraft pair ----
+    projector = LocalProjector(os_lat_deg, os_lon_deg, ellipsoidal=ellipsoidal)
+
+    tgt_x, tgt_y = projector.to_local(targets.tgt_start[:, 0], targets.tgt_start[:, 1])
+
+    pos = np.empty((n + 1, 3))
+    pos[0] = (0.0, 0.0, targets.os_start[0, 2])
+    pos[1:, 0] = tgt_x
+    pos[1:, 1] = tgt_y
+    pos[1:, 2] = targets.tgt_start[:, 2]
+
+    vel = np.empty((n + 1, 3))
+    vel[0] = (targets.vx_os[last], targets.vy_os[last], targets.vz_os[last])
+    vel[1:, 0] = targets.vx_tgt
+    vel[1:, 1] = targets.vy_tgt
+    vel[1:, 2] = targets.vz_tgt
+
+    end = np.concatenate([[end_sec.max()], end_sec])
+
+    pairwise = pairwise_cpa(pos, vel, end)
+
+    return {
+        "targets": targets,
+        "ownship_track": ownship_track,
+        "target_tracks": target_tracks,
+        "pairwise": pairwise,
+    }
+
+
+def pairwise_cpa(pos, vel, end_sec):
+    """
+    Analytic closest approach for every pair of straight-line tracks.
+
+    pos, vel: (M, 3) local east/north/up at t = 0; end_sec: (M,) time
+    each track stops. The search window for a pair is [0, min(ends)].
+    Returns (M, M) matrices; the diagonal is zero.
+    """
+    r = pos[None, :, :] - pos[:, None, :]
+    v = vel[None, :, :] - vel[:, None, :]
+
+    vv = np.einsum("ijk,ijk->ij", v, v)
+    rv = np.einsum("ijk,ijk->ij", r, v)
+
+    window = np.minimum(end_sec[None, :], end_sec[:, None])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(vv > 1e-12, -rv / vv, 0.0)
+    t = np.clip(t, 0.0, window)
+
+    d = r + v * t[..., None]
+
+    return {
+        "t_cpa_sec": t,
+        "sep_horiz_m": np.hypot(d[..., 0], d[..., 1]),
+        "sep_vert_m": np.abs(d[..., 2]),
+        "sep_3d_m": np.sqrt(np.einsum("ijk,ijk->ij", d, d)),
+    }
+
+
+def write_multi_target_files(
+    result,
+    os_callsign,
+    tgt_callsigns=None,
+    os_alt_ft=None,
+    os_vspeed_fpm=None,
+    first_sysid=1,
+    fleet_layout=None
+):
+    """
+    Write plan, waypoints, KML and YAML files per vehicle plus one
+    combined KML. Sysids are allocated in order: ownship first, then
+    targets. fleet_layout ("documents" or "indexed") also writes one
+    fleet manifest for all vehicles (see yaml_writer.render_fleet_yaml).
+    os_alt_ft / os_vspeed_fpm default to the ownship's geometry.
+    Returns the list of written paths.
+    """
+    targets = result["targets"]
+    n = len(result["target_tracks"])
+
+    if tgt_callsigns is None:
+        tgt_callsigns = [f"TGT{i + 1:02d}" for i in range(n)]
+
+    if len(tgt_callsigns) != n:
+        raise ValueError(f"Expected {n} target callsigns, got {len(tgt_callsigns)}")
+
+    home = result["ownship_track"][0]
+    os_start = result["ownship_track"][0]
+
+    vehicles = [
+        {
+            "prefix": f"Ownship_{os_callsign}",
+            "callsign": os_callsign,
+            "track": result["ownship_track"],
+            "alt_ft": os_alt_ft if os_alt_ft is not None else round(m_to_ft(os_start[2]), 2),
+            "course_deg": float(targets.os_course_deg[0]),
+            "speed_kt": round(mps_to_kt(float(targets.os_speed_mps[0])), 2),
+            "vspeed_fpm": (
+                os_vspeed_fpm if os_vspeed_fpm is not None
+                else round(mps_to_fpm(float(targets.os_vspeed_mps[0])), 2)
+            ),
+        }
+    ]
+
+    for i, callsign in enumerate(tgt_callsigns):
+        track = result["target_tracks"][i]
+        vehicles.append({
+            "prefix": f"Target_{callsign}",
+            "callsign": callsign,
+            "track": track,
+            "alt_ft": round(m_to_ft(track[0][2]), 2),
+            "course_deg": float(targets.tgt_course_deg[i]),
+            "speed_kt": round(mps_to_kt(float(targets.tgt_speed_mps[i])), 2),
+            "vspeed_fpm": round(mps_to_fpm(float(targets.vz_tgt[i])), 2),
+        })
+
+    written = []
+    fleet = []
+
+    for sysid, v in enumerate(vehicles, start=first_sysid):
+
+        plan = f"{v['prefix']}.plan"
+        wp = f"{v['prefix']}.waypoints"
+        kml = f"{v['prefix']}.kml"
+        yaml = f"{v['prefix']}.yaml"
+
+        write_plan_file(plan, v["track"], home)
+        write_waypoints_file(wp, v["track"])
+        write_kml_file(kml, v["track"])
+
+        start = v["track"][0]
+
+        state = dict(
+            callsign=v["callsign"],
+            sysid=sysid,
+            lat_deg=start[0],
+            lon_deg=start[1],
+            alt_ft=v["alt_ft"],
+            course_deg=v["course_deg"],
+            ground_speed_kt=v["speed_kt"],
+            vertical_speed_fpm=v["vspeed_fpm"],
+            waypoints_file=wp
+        )
+
+        write_yaml_file(path=yaml, **state)
+        fleet.append(state)
+
+        written += [plan, wp, kml, yaml]
+
+    combined = f"Ownship_{os_callsign}_Targets.kml"
+    write_multi_kml_file(combined, [(v["prefix"], v["track"]) for v in vehicles])
+    written.append(combined)
+
+    if fleet_layout is not None:
+        manifest = f"Ownship_{os_callsign}_fleet.yaml"
+        write_fleet_yaml(manifest, fleet, layout=fleet_layout)
+        written.append(manifest)
+
+    return written
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Generate one ownship against N intruders"
+    )
+
+    # JSON list, one object per target (aviation units like app.py):
+    #   {"callsign": "TGT01", "tcpa": "01:00", "cpa": 20, "rel_speed": 10,
+    #    "conflict_dh": 30, "tgt_alto": 20, "relative_heading": 95}
+    parser.add_argument("--targets", required=True)
+
+    parser.add_argument("--os_callsign", default="OWN01")
+    parser.add_argument("--post_cpa", default="10:00")
+
+    parser.add_argument("--os_lat", type=float, required=True)
+    parser.add_argument("--os_lon", type=float, required=True)
+    parser.add_argument("--os_alt", type=float, default=50)
+    parser.add_argument("--os_course", type=float, default=90)
+    parser.add_argument("--os_speed", type=float, default=20)
+    parser.add_argument("--os_vspeed", type=float, default=1)
+
+    parser.add_argument("--fleet", choices=["documents", "indexed"], default=None, help="Also write one fleet manifest")
+
+    args = parser.parse_args(argv)
+
+    with open(args.targets) as f:
+        specs = json.load(f)
+
+    def column(key, default):
+        return np.array([float(t.get(key, default)) for t in specs])
+
+    result = compute_multi_target_geometry(
+        os_lat_deg=args.os_lat,
+        os_lon_deg=args.os_lon,
+        os_alt_m=ft_to_m(args.os_alt),
+        os_course_deg=args.os_course,
+        os_speed_mps=kt_to_mps(args.os_speed),
+        os_vspeed_mps=fpm_to_mps(args.os_vspeed),
+        tcpa_sec=np.array([mmss_to_sec(t.get("tcpa", "01:00")) for t in specs], dtype=float),
+        cpa_horiz_m=ft_to_m(column("cpa", 20)),
+        rel_speed_mps=kt_to_mps(column("rel_speed", 10)),
+        conflict_dh_m=ft_to_m(column("conflict_dh", 30)),
+        target_alto_m=ft_to_m(column("tgt_alto", 20)),
+        relative_heading_deg=column("relative_heading", 95),
+        post_cpa_sec=mmss_to_sec(args.post_cpa)
+    )
+
+    callsigns = [t.get("callsign", f"TGT{i + 1:02d}") for i, t in enumerate(specs)]
+
+    write_multi_target_files(
+        result,
+        os_callsign=args.os_callsign,
+        tgt_callsigns=callsigns,
+        os_alt_ft=args.os_alt,
+        os_vspeed_fpm=args.os_vspeed,
+        fleet_layout=args.fleet
+    )
+
+    sep_ft = m_to_ft(result["pairwise"]["sep_3d_m"])
+
+    for i, callsign in enumerate(callsigns, start=1):
+        print(f"{callsign}: 3D CPA separation from ownship (ft): {round(sep_ft[0, i], 3)}")
+
+    if len(callsigns) > 1:
+        off_diag = sep_ft[1:, 1:][~np.eye(len(callsigns), dtype=bool)]
+        print("Closest intruder-intruder approach (ft):", round(off_diag.min(), 3))
+
+    print("✅ All files generated successfully!")
+
+
+if __name__ == "__main__":
+    main()
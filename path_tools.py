@@ -0,0 +1,226 @@
+import argparse
+import json
+
+import numpy as np
+
+from projection import LocalProjector
+from units import ft_to_m
+
+# =========================================================
+# PATH CONDITIONING
+# Shape waypoint lists before they become missions:
+#
+#   simplify_path  - Douglas-Peucker: drop points while the
+#                    path stays within a cross-track (and
+#                    optional vertical) tolerance
+#   densify_path   - split legs longer than max_leg_m so the
+#                    autopilot tracks straight encounters
+#                    closely
+#
+# Both take and return (N, 3) lat/lon/alt, the layout the
+# plan_writer functions accept. Distances are measured in
+# the local tangent plane of the first point.
+# =========================================================
+
+
+def _as_points(points):
+    return np.array(points, dtype=float).reshape(-1, 3)
+
+
+def _check_positive(name, value):
+    # Tolerances and leg lengths are divisors: 0 or less means NaN / inf
+    if value is not None and not value > 0:
+        raise ValueError(f"{name} must be positive: {value}")
+
+
+def _segment_error(x, y, z, a, b, tol_m, vertical_tol_m):
+    # Deviation of every point i from its segment a[i] -> b[i], in units
+    # of the tolerance (> 1 means the point must stay)
+    sx = x[b] - x[a]
+    sy = y[b] - y[a]
+    px = x - x[a]
+    py = y - y[a]
+
+    seg_len2 = sx * sx + sy * sy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.where(seg_len2 > 0, (px * sx + py * sy) / seg_len2, 0.0)
+    frac = np.clip(frac, 0.0, 1.0)
+
+    error = np.hypot(px - frac * sx, py - frac * sy) / tol_m
+
+    if vertical_tol_m is not None:
+        dz = np.abs(z - (z[a] + frac * (z[b] - z[a])))
+        error = np.maximum(error, dz / vertical_tol_m)
+
+    return error
+
+
+def simplify_path(points, tol_m, vertical_tol_m=None, keep=None, ellipsoidal=False):
+    """
+    Douglas-Peucker simplification of (N, 3) lat/lon/alt points.
+
+    A point is dropped only if it lies within tol_m (horizontal
+    cross-track distance) and, when given, vertical_tol_m of the
+    simplified path. keep: indices that always survive (e.g. the CPA
+    waypoint). The first and last points are always kept.
+
+    All open segments are split in the same pass, so each pass is one
+    set of array operations over the whole path.
+    """
+    _check_positive("tol_m", tol_m)
+    _check_positive("vertical_tol_m", vertical_tol_m)
+
+    pts = _as_points(points)
+    n = pts.shape[0]
+
+    if n <= 2:
+        return pts
+
+    projector = LocalProjector(pts[0, 0], pts[0, 1], ellipsoidal=ellipsoidal)
+    x, y = projector.to_local(pts[:, 0], pts[:, 1])
+    z = pts[:, 2]
+
+    kept = np.zeros(n, dtype=bool)
+    kept[[0, -1]] = True
+    if keep is not None:
+        kept[np.asarray(keep, dtype=int)] = True
+
+    positions = np.arange(n)
+
+    while True:
+        idx = np.flatnonzero(kept)
+
+        seg = np.minimum(np.searchsorted(idx, positions, side="right") - 1, idx.size - 2)
+
+        error = _segment_error(x, y, z, idx[seg], idx[seg + 1], tol_m, vertical_tol_m)
+        error[kept] = 0.0
+
+        seg_max = np.maximum.reduceat(error, idx[:-1])
+
+        candidates = np.flatnonzero((error > 1.0) & (error == seg_max[seg]))
+        if candidates.size == 0:
+            break
+
+        # Farthest point of each segment (first one on ties)
+        _, first = np.unique(seg[candidates], return_index=True)
+        kept[candidates[first]] = True
+
+    return pts[kept]
+
+
+def densify_path(points, max_leg_m, ellipsoidal=False):
+    """
+    Split every leg longer than max_leg_m (horizontal) into equal parts.
+    Original points are kept exactly; new ones are interpolated linearly
+    in lat/lon/alt.
+    """
+    _check_positive("max_leg_m", max_leg_m)
+
+    pts = _as_points(points)
+    n = pts.shape[0]
+
+    if n < 2:
+        return pts
+
+    projector = LocalProjector(pts[0, 0], pts[0, 1], ellipsoidal=ellipsoidal)
+    x, y = projector.to_local(pts[:, 0], pts[:, 1])
+
+    leg_len = np.hypot(np.diff(x), np.diff(y))
+    parts = np.maximum(np.ceil(leg_len / max_leg_m), 1).astype(int)
+
+    leg = np.repeat(np.arange(n - 1), parts)
+    step = np.arange(leg.size) - np.repeat(np.cumsum(parts) - parts, parts)
+    frac = (step / parts[leg])[:, None]
+
+    out = np.empty((leg.size + 1, 3))
+    out[:-1] = pts[leg] + frac * (pts[leg + 1] - pts[leg])
+    out[:-1][step == 0] = pts[:-1]
+    out[-1] = pts[-1]
+
+    return out
+
+
+def condition_path(
+    points,
+    simplify_tol_m=None,
+    max_leg_m=None,
+    vertical_tol_m=None,
+    keep=None,
+    ellipsoidal=False
+):
+    """
+    Simplify, then densify, (N, 3) lat/lon/alt points. Either step is
+    skipped when its parameter is None. Returns a list of (lat, lon, alt)
+    tuples ready for render_plan / render_waypoints.
+    """
+    # Fail before doing any work, not halfway through
+    _check_positive("simplify_tol_m", simplify_tol_m)
+    _check_positive("max_leg_m", max_leg_m)
+    _check_positive("vertical_tol_m", vertical_tol_m)
+
+    pts = _as_points(points)
+
+    if simplify_tol_m is not None:
+        pts = simplify_path(
+            pts, simplify_tol_m,
+            vertical_tol_m=vertical_tol_m, keep=keep, ellipsoidal=ellipsoidal
+        )
+
+    if max_leg_m is not None:
+        pts = densify_path(pts, max_leg_m, ellipsoidal=ellipsoidal)
+
+    return [tuple(p) for p in pts.tolist()]
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    from kml_tracks import telemetry_tracks
+    from mission_reader import read_mission
+    from plan_writer import write_plan_file, write_waypoints_file
+
+    parser = argparse.ArgumentParser(description="Simplify / densify a path into a mission file")
+
+    parser.add_argument("path", help=".plan / .waypoints / .kml / .kmz, or a telemetry log (.json)")
+    parser.add_argument("--vehicle", default="ownship", choices=["ownship", "target"], help="Telemetry track to use")
+    parser.add_argument("--tol_ft", type=float, default=None, help="Cross-track tolerance")
+    parser.add_argument("--vertical_tol_ft", type=float, default=None)
+    parser.add_argument("--max_leg_ft", type=float, default=None)
+    parser.add_argument("--out", required=True, help="Output .plan or .waypoints")
+
+    args = parser.parse_args(argv)
+
+    for name in ("tol_ft", "vertical_tol_ft", "max_leg_ft"):
+        value = getattr(args, name)
+        if value is not None and not value > 0:
+            parser.error(f"--{name} must be positive")
+
+    if args.path.lower().endswith(".json"):
+        with open(args.path) as f:
+            _, points = telemetry_tracks(json.load(f)["frames"])[args.vehicle]
+    else:
+        points = read_mission(args.path)
+
+    def to_m(value):
+        return None if value is None else ft_to_m(value)
+
+    waypoints = condition_path(
+        points,
+        simplify_tol_m=to_m(args.tol_ft),
+        max_leg_m=to_m(args.max_leg_ft),
+        vertical_tol_m=to_m(args.vertical_tol_ft)
+    )
+
+    if args.out.lower().endswith(".waypoints"):
+        write_waypoints_file(args.out, waypoints)
+    else:
+        write_plan_file(args.out, waypoints, waypoints[0])
+
+    print(f"✅ {len(points)} points -> {len(waypoints)} waypoints written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import io
 import json
+import zipfile
 
 def make_waypoint(lat, lon, alt, idx):
     return {
@@ -27,7 +29,11 @@ def make_waypoint(lat, lon, alt, idx):
 #        "type": "SimpleItem"
 #    }
 
-def write_plan_file(path, waypoints, home_position):
+def render_plan(waypoints, home_position, compact=False):
+    """
+    QGroundControl .plan JSON as a string. compact=True drops the
+    indentation and spaces (same data, roughly half the size).
+    """
     data = {
         "fileType": "Plan",
         "geoFence": {"circles": [], "polygons": [], "version": 2},
@@ -50,15 +56,22 @@ def write_plan_file(path, waypoints, home_position):
         "version": 1
     }
 
+    if compact:
+        return json.dumps(data, separators=(",", ":"))
+
+    return json.dumps(data, indent=4)
+
+
+def write_plan_file(path, waypoints, home_position, compact=False):
     with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+        f.write(render_plan(waypoints, home_position, compact=compact))
 
-def write_waypoints_file(path, waypoints):
+def render_waypoints(waypoints):
     """
-    Write ArduPilot .waypoints file for QGroundControl (text format).
+    ArduPilot .waypoints file for QGroundControl (text format).
     Each entry is a standard MAVLink waypoint.
     """
-    with open(path, "w") as f:
+    with io.StringIO() as f:
         f.write("QGC WPL 110\n")
 
         # ✅ ADDED: TAKEOFF command (index 0)
@@ -78,131 +91,217 @@ def write_waypoints_file(path, waypoints):
                 f"{param1}\t{param2}\t{param3}\t{param4}\t"
                 f"{lat:.8f}\t{lon:.8f}\t{alt:.2f}\t{autocontinue}\n"
             )
+
+        return f.getvalue()
+
+
+def write_waypoints_file(path, waypoints):
+    """
+    Write ArduPilot .waypoints file for QGroundControl (text format).
+    """
+    with open(path, "w") as f:
+        f.write(render_waypoints(waypoints))
             
-def write_kml_file(path, waypoints, name="CPA Mission"):
+def render_kml(waypoints, name="CPA Mission"):
     """
-    Write a standard flight KML file compatible with Google Earth.
+    Standard flight KML compatible with Google Earth, as a string.
+    Built as one list of lines and joined once.
     """
 
     def kml_coord(lat, lon, alt):
         return f"{lon},{lat},{alt}"
 
-    with open(path, "w") as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write('<kml xmlns="http://www.opengis.net/kml/2.2">\n')
-        f.write('  <Document>\n')
-        f.write(f'    <name>{name}</name>\n')
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<kml xmlns="http://www.opengis.net/kml/2.2">',
+        '  <Document>',
+        f'    <name>{name}</name>',
 
         # ---- Style for flight path ----
-        f.write('    <Style id="flightPath">\n')
-        f.write('      <LineStyle>\n')
-        f.write('        <color>ff0000ff</color>\n')  # Red line (AABBGGRR)
-        f.write('        <width>3</width>\n')
-        f.write('      </LineStyle>\n')
-        f.write('    </Style>\n')
+        '    <Style id="flightPath">',
+        '      <LineStyle>',
+        '        <color>ff0000ff</color>',  # Red line (AABBGGRR)
+        '        <width>3</width>',
+        '      </LineStyle>',
+        '    </Style>',
 
         # ---- Flight path LineString ----
-        f.write('    <Placemark>\n')
-        f.write('      <name>Flight Path</name>\n')
-        f.write('      <styleUrl>#flightPath</styleUrl>\n')
-        f.write('      <LineString>\n')
-        f.write('        <tessellate>1</tessellate>\n')
-        f.write('        <altitudeMode>absolute</altitudeMode>\n')
-        f.write('        <coordinates>\n')
-
-        for lat, lon, alt in waypoints:
-            f.write(f'          {kml_coord(lat, lon, alt)}\n')
-
-        f.write('        </coordinates>\n')
-        f.write('      </LineString>\n')
-        f.write('    </Placemark>\n')
-
-        # ---- Individual waypoints ----
-        for i, (lat, lon, alt) in enumerate(waypoints):
-            f.write('    <Placemark>\n')
-            f.write(f'      <name>WP {i}</name>\n')
-            f.write('      <Point>\n')
-            f.write('        <altitudeMode>absolute</altitudeMode>\n')
-            f.write(f'        <coordinates>{kml_coord(lat, lon, alt)}</coordinates>\n')
-            f.write('      </Point>\n')
-            f.write('    </Placemark>\n')
-
-        f.write('  </Document>\n')
-        f.write('</kml>\n')
+        '    <Placemark>',
+        '      <name>Flight Path</name>',
+        '      <styleUrl>#flightPath</styleUrl>',
+        '      <LineString>',
+        '        <tessellate>1</tessellate>',
+        '        <altitudeMode>absolute</altitudeMode>',
+        '        <coordinates>',
+    ]
+
+    lines += [f'          {kml_coord(lat, lon, alt)}' for lat, lon, alt in waypoints]
+
+    lines += [
+        '        </coordinates>',
+        '      </LineString>',
+        '    </Placemark>',
+    ]
+
+    # ---- Individual waypoints ----
+    for i, (lat, lon, alt) in enumerate(waypoints):
+        lines += [
+            '    <Placemark>',
+            f'      <name>WP {i}</name>',
+            '      <Point>',
+            '        <altitudeMode>absolute</altitudeMode>',
+            f'        <coordinates>{kml_coord(lat, lon, alt)}</coordinates>',
+            '      </Point>',
+            '    </Placemark>',
+        ]
+
+    lines += ['  </Document>', '</kml>']
+
+    return "\n".join(lines) + "\n"
+
+
+def kml_to_kmz(kml_text):
+    """KMZ bytes: the KML deflated into a zip as doc.kml."""
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("doc.kml", kml_text)
+
+    return buffer.getvalue()
+
+
+def _write_kml_text(path, kml_text):
+    # A .kmz path gets the zipped form
+    if path.lower().endswith(".kmz"):
+        with open(path, "wb") as f:
+            f.write(kml_to_kmz(kml_text))
+    else:
+        with open(path, "w") as f:
+            f.write(kml_text)
+
+
+def write_kml_file(path, waypoints, name="CPA Mission"):
+    """
+    Write a standard flight KML file compatible with Google Earth
+    (KMZ when path ends in .kmz).
+    """
+    _write_kml_text(path, render_kml(waypoints, name=name))
         
         
         
-def write_combined_kml_file(path, ownship_wps, target_wps):
+def render_combined_kml(ownship_wps, target_wps):
 
     def kml_coord(lat, lon, alt):
         return f"{lon},{lat},{alt}"
 
-    with open(path, "w") as f:
-
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write('<kml xmlns="http://www.opengis.net/kml/2.2">\n')
-        f.write('<Document>\n')
+    def path(name, style_id, waypoints):
+        return [
+            '<Placemark>',
+            f'<name>{name}</name>',
+            f'<styleUrl>#{style_id}</styleUrl>',
+            '<LineString>',
+            '<tessellate>1</tessellate>',
+            '<altitudeMode>absolute</altitudeMode>',
+            '<coordinates>',
+            *[kml_coord(lat, lon, alt) for lat, lon, alt in waypoints],
+            '</coordinates>',
+            '</LineString>',
+            '</Placemark>',
+        ]
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<kml xmlns="http://www.opengis.net/kml/2.2">',
+        '<Document>',
 
         # -----------------------
         # Ownship style (BLUE)
         # -----------------------
 
-        f.write('<Style id="ownshipPath">\n')
-        f.write('<LineStyle>\n')
-        f.write('<color>ffff0000</color>\n') # Blue
-        f.write('<width>3</width>\n')
-        f.write('</LineStyle>\n')
-        f.write('</Style>\n')
+        '<Style id="ownshipPath">',
+        '<LineStyle>',
+        '<color>ffff0000</color>',  # Blue
+        '<width>3</width>',
+        '</LineStyle>',
+        '</Style>',
 
         # -----------------------
         # Target style (RED)
         # -----------------------
 
-        f.write('<Style id="targetPath">\n')
-        f.write('<LineStyle>\n')
-        f.write('<color>ff0000ff</color>\n') # Red
-        f.write('<width>3</width>\n')
-        f.write('</LineStyle>\n')
-        f.write('</Style>\n')
+        '<Style id="targetPath">',
+        '<LineStyle>',
+        '<color>ff0000ff</color>',  # Red
+        '<width>3</width>',
+        '</LineStyle>',
+        '</Style>',
+    ]
 
-        # -----------------------
-        # Ownship Path
-        # -----------------------
+    lines += path("Ownship Path", "ownshipPath", ownship_wps)
+    lines += path("Target Path", "targetPath", target_wps)
 
-        f.write('<Placemark>\n')
-        f.write('<name>Ownship Path</name>\n')
-        f.write('<styleUrl>#ownshipPath</styleUrl>\n')
-        f.write('<LineString>\n')
-        f.write('<tessellate>1</tessellate>\n')
-        f.write('<altitudeMode>absolute</altitudeMode>\n')
-        f.write('<coordinates>\n')
+    lines += ['</Document>', '</kml>']
 
-        for lat, lon, alt in ownship_wps:
-            f.write(f"{kml_coord(lat,lon,alt)}\n")
+    return "\n".join(lines) + "\n"
 
-        f.write('</coordinates>\n')
-        f.write('</LineString>\n')
-        f.write('</Placemark>\n')
 
-        # -----------------------
-        # Target Path
-        # -----------------------
+def write_combined_kml_file(path, ownship_wps, target_wps):
+    _write_kml_text(path, render_combined_kml(ownship_wps, target_wps))
+
 
-        f.write('<Placemark>\n')
-        f.write('<name>Target Path</name>\n')
-        f.write('<styleUrl>#targetPath</styleUrl>\n')
-        f.write('<LineString>\n')
-        f.write('<tessellate>1</tessellate>\n')
-        f.write('<altitudeMode>absolute</altitudeMode>\n')
-        f.write('<coordinates>\n')
+# Cycled for multi-vehicle tracks (AABBGGRR): blue, red, green, yellow, magenta, cyan
+TRACK_COLORS = ["ffff0000", "ff0000ff", "ff00ff00", "ff00ffff", "ffff00ff", "ffffff00"]
 
-        for lat, lon, alt in target_wps:
-            f.write(f"{kml_coord(lat,lon,alt)}\n")
 
-        f.write('</coordinates>\n')
-        f.write('</LineString>\n')
-        f.write('</Placemark>\n')
+def render_multi_kml(tracks):
+    """
+    One KML with a styled LineString per vehicle, as a string.
+    tracks: list of (name, waypoints) in draw order.
+    """
 
-        f.write('</Document>\n')
-        f.write('</kml>\n')
+    def kml_coord(lat, lon, alt):
+        return f"{lon},{lat},{alt}"
 
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<kml xmlns="http://www.opengis.net/kml/2.2">',
+        '<Document>',
+    ]
+
+    for i, (name, waypoints) in enumerate(tracks):
+        lines += [
+            f'<Style id="path{i}">',
+            '<LineStyle>',
+            f'<color>{TRACK_COLORS[i % len(TRACK_COLORS)]}</color>',
+            '<width>3</width>',
+            '</LineStyle>',
+            '</Style>',
+        ]
+
+    for i, (name, waypoints) in enumerate(tracks):
+        lines += [
+            '<Placemark>',
+            f'<name>{name}</name>',
+            f'<styleUrl>#path{i}</styleUrl>',
+            '<LineString>',
+            '<tessellate>1</tessellate>',
+            '<altitudeMode>absolute</altitudeMode>',
+            '<coordinates>',
+        ]
+        lines += [kml_coord(lat, lon, alt) for lat, lon, alt in waypoints]
+        lines += [
+            '</coordinates>',
+            '</LineString>',
+            '</Placemark>',
+        ]
+
+    lines += ['</Document>', '</kml>']
+
+    return "\n".join(lines) + "\n"
+
+
+def write_multi_kml_file(path, tracks):
+    """
+    Write one KML with a styled LineString per vehicle.
+    """
+    _write_kml_text(path, render_multi_kml(tracks))
@@ -0,0 +1,212 @@
+import math
+
+import numpy as np
+
+# =========================================================
+# LOCAL TANGENT-PLANE PROJECTION
+# One projector per reference point (ownship start, CPA
+# location, ...). The reference trig is computed once and
+# reused for every conversion. Inputs may be scalars or
+# NumPy arrays; the reference point may itself be an array
+# (one origin per batch row).
+# =========================================================
+
+# WGS-84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)
+
+
+def _is_array(*values):
+    return any(isinstance(v, np.ndarray) for v in values)
+
+
+class LocalProjector:
+    """
+    Convert between lat/lon (deg) and local east/north offsets (m) about
+    a fixed reference point.
+
+    Default backend: the spherical equirectangular approximation used
+    since the first release (R = 6378137 m). Fast and exact enough for
+    short encounters.
+
+    ellipsoidal=True: WGS-84 East-North-Up tangent plane. Offsets are
+    true ENU east/north components; converted points are placed on the
+    ellipsoid surface. Stays accurate for long-range encounters at the
+    same vectorized cost.
+    """
+
+    __slots__ = (
+        "ref_lat_deg", "ref_lon_deg", "ellipsoidal",
+        "_cos_lat", "_sin_lat", "_cos_lon", "_sin_lon", "_ref_ecef",
+    )
+
+    R = WGS84_A
+
+    def __init__(self, ref_lat_deg, ref_lon_deg, ellipsoidal=False):
+
+        self.ref_lat_deg = ref_lat_deg
+        self.ref_lon_deg = ref_lon_deg
+        self.ellipsoidal = ellipsoidal
+
+        if _is_array(ref_lat_deg, ref_lon_deg):
+            lat_rad = np.radians(ref_lat_deg)
+            lon_rad = np.radians(ref_lon_deg)
+            self._cos_lat = np.cos(lat_rad)
+            self._sin_lat = np.sin(lat_rad)
+            self._cos_lon = np.cos(lon_rad)
+            self._sin_lon = np.sin(lon_rad)
+        else:
+            lat_rad = math.radians(ref_lat_deg)
+            lon_rad = math.radians(ref_lon_deg)
+            self._cos_lat = math.cos(lat_rad)
+            self._sin_lat = math.sin(lat_rad)
+            self._cos_lon = math.cos(lon_rad)
+            self._sin_lon = math.sin(lon_rad)
+
+        self._ref_ecef = None
+        if ellipsoidal:
+            self._ref_ecef = _geodetic_to_ecef(
+                self._sin_lat, self._cos_lat, self._sin_lon, self._cos_lon
+            )
+
+    # -----------------------------------------------------
+    # local (m) -> lat/lon (deg)
+    # -----------------------------------------------------
+
+    def to_latlon(self, dx_m, dy_m):
+
+        if self.ellipsoidal:
+            return self._enu_to_latlon(dx_m, dy_m)
+
+        R = self.R
+
+        dlat = dy_m / R
+        dlon = dx_m / (R * self._cos_lat)
+
+        if _is_array(dx_m, dy_m, self._cos_lat):
+            return (
+                self.ref_lat_deg + np.degrees(dlat),
+                self.ref_lon_deg + np.degrees(dlon),
+            )
+
+        return (
+            self.ref_lat_deg + math.degrees(dlat),
+            self.ref_lon_deg + math.degrees(dlon),
+        )
+
+    # -----------------------------------------------------
+    # lat/lon (deg) -> local (m)
+    # -----------------------------------------------------
+
+    def to_local(self, lat_deg, lon_deg):
+
+        if self.ellipsoidal:
+            return self._latlon_to_enu(lat_deg, lon_deg)
+
+        R = self.R
+
+        if _is_array(lat_deg, lon_deg, self._cos_lat):
+            dlat = np.radians(lat_deg - self.ref_lat_deg)
+            dlon = np.radians(lon_deg - self.ref_lon_deg)
+        else:
+            dlat = math.radians(lat_deg - self.ref_lat_deg)
+            dlon = math.radians(lon_deg - self.ref_lon_deg)
+
+        dy_m = dlat * R
+        dx_m = dlon * R * self._cos_lat
+
+        return dx_m, dy_m
+
+    # -----------------------------------------------------
+    # WGS-84 ENU backend (always evaluated with NumPy)
+    # -----------------------------------------------------
+
+    def _latlon_to_enu(self, lat_deg, lon_deg):
+
+        lat_rad = np.radians(lat_deg)
+        lon_rad = np.radians(lon_deg)
+
+        x, y, z = _geodetic_to_ecef(
+            np.sin(lat_rad), np.cos(lat_rad), np.sin(lon_rad), np.cos(lon_rad)
+        )
+        x0, y0, z0 = self._ref_ecef
+
+        dx, dy, dz = x - x0, y - y0, z - z0
+
+        east = -self._sin_lon * dx + self._cos_lon * dy
+        north = (
+            -self._sin_lat * self._cos_lon * dx
+            - self._sin_lat * self._sin_lon * dy
+            + self._cos_lat * dz
+        )
+
+        if _is_array(lat_deg, lon_deg, self._cos_lat):
+            return east, north
+        return float(east), float(north)
+
+    def _enu_to_latlon(self, east_m, north_m):
+
+        scalar = not _is_array(east_m, north_m, self._cos_lat)
+
+        x0, y0, z0 = self._ref_ecef
+        sl, cl = self._sin_lat, self._cos_lat
+        so, co = self._sin_lon, self._cos_lon
+
+        east_m = np.asarray(east_m, dtype=float)
+        north_m = np.asarray(north_m, dtype=float)
+
+        # Start on the tangent plane (up = 0) and drop along the local
+        # vertical until the point sits on the ellipsoid (h = 0).
+        up = np.zeros(np.broadcast(east_m, north_m, cl).shape)
+
+        for _ in range(3):
+            x = x0 - so * east_m - sl * co * north_m + cl * co * up
+            y = y0 + co * east_m - sl * so * north_m + cl * so * up
+            z = z0 + cl * north_m + sl * up
+
+            lat_rad, lon_rad, h = _ecef_to_geodetic(x, y, z)
+            up = up - h
+
+        lat = np.degrees(lat_rad)
+        lon = np.degrees(lon_rad)
+
+        if scalar:
+            return float(lat), float(lon)
+        return lat, lon
+
+
+def _geodetic_to_ecef(sin_lat, cos_lat, sin_lon, cos_lon):
+    # Points on the ellipsoid surface (h = 0)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    return (
+        n * cos_lat * cos_lon,
+        n * cos_lat * sin_lon,
+        n * (1.0 - WGS84_E2) * sin_lat,
+    )
+
+
+def _ecef_to_geodetic(x, y, z):
+    # Bowring's closed form: sub-millimetre near the surface
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+
+    st = np.sin(theta)
+    ct = np.cos(theta)
+
+    lat = np.arctan2(
+        z + WGS84_EP2 * WGS84_B * st**3,
+        p - WGS84_E2 * WGS84_A * ct**3,
+    )
+    lon = np.arctan2(y, x)
+
+    sin_lat = np.sin(lat)
+    h = (
+        p * np.cos(lat) + z * sin_lat
+        - WGS84_A * np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    )
+
+    return lat, lon, h
+
@@ -0,0 +1,316 @@
+import argparse
+import datetime
+import json
+import sqlite3
+import threading
+
+# =========================================================
+# SCENARIO CATALOG
+# Append-only SQLite history of every generated scenario
+# (validation logs from build_validation_log). One row per
+# scenario with the CPA metrics and initial states as
+# indexed columns, the full log as JSON, and every numeric
+# input in a (name, value) side table, so lookups by id,
+# date or parameter range are index scans instead of a walk
+# over thousands of scenario_log.json files.
+# =========================================================
+
+DEFAULT_PATH = "scenario_catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    scenario_id TEXT NOT NULL UNIQUE,
+    generated_utc TEXT NOT NULL,
+    source TEXT,
+    tcpa_sec REAL,
+    horizontal_sep_ft REAL,
+    vertical_sep_ft REAL,
+    sep_3d_ft REAL,
+    os_lat_deg REAL,
+    os_lon_deg REAL,
+    os_alt_ft REAL,
+    tgt_lat_deg REAL,
+    tgt_lon_deg REAL,
+    tgt_alt_ft REAL,
+    log TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_generated ON scenarios (generated_utc);
+CREATE INDEX IF NOT EXISTS scenarios_sep_3d ON scenarios (sep_3d_ft);
+
+CREATE TABLE IF NOT EXISTS inputs (
+    scenario INTEGER NOT NULL REFERENCES scenarios (id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inputs_name_value ON inputs (name, value);
+"""
+
+# Columns of the scenarios table usable in find(ranges=...)
+COLUMNS = (
+    "tcpa_sec",
+    "horizontal_sep_ft",
+    "vertical_sep_ft",
+    "sep_3d_ft",
+    "os_lat_deg",
+    "os_lon_deg",
+    "os_alt_ft",
+    "tgt_lat_deg",
+    "tgt_lon_deg",
+    "tgt_alt_ft",
+)
+
+_INSERT = (
+    "INSERT OR IGNORE INTO scenarios (scenario_id, generated_utc, source, "
+    + ", ".join(COLUMNS)
+    + ", log) VALUES (" + ", ".join("?" * (len(COLUMNS) + 4)) + ")"
+)
+
+
+def _row(log, source):
+    meta = log["metadata"]
+    metrics = log.get("cpa_metrics", {})
+    state = log.get("computed_initial_state", {})
+    own = state.get("ownship", {})
+    tgt = state.get("target", {})
+
+    return (
+        meta["scenario_id"],
+        meta["generated_utc"],
+        source,
+        log.get("inputs", {}).get("tcpa_sec"),
+        metrics.get("horizontal_sep_ft"),
+        metrics.get("vertical_sep_ft"),
+        metrics.get("3d_sep_ft"),
+        own.get("lat_deg"),
+        own.get("lon_deg"),
+        own.get("alt_ft"),
+        tgt.get("lat_deg"),
+        tgt.get("lon_deg"),
+        tgt.get("alt_ft"),
+        json.dumps(log, separators=(",", ":")),
+    )
+
+
+def _numeric_inputs(log):
+    return [
+        (name, float(value))
+        for name, value in log.get("inputs", {}).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+
+
+def _utc_text(value):
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    return str(value)
+
+
+class ScenarioCatalog:
+    """
+    with ScenarioCatalog("scenario_catalog.sqlite") as catalog:
+        catalog.add(log)
+        catalog.find(ranges={"sep_3d_ft": (0, 100)}, since="2026-01-01")
+
+    Rows are only ever inserted; re-adding a known scenario_id is a
+    no-op. Safe to share between threads (e.g. Streamlit reruns).
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    # ---------------------------------------------------------
+    # Insert
+    # ---------------------------------------------------------
+
+    def add(self, log, source=None):
+        """Append one validation log. Returns its scenario_id."""
+        self.add_many([log], source=source)
+        return log["metadata"]["scenario_id"]
+
+    def add_many(self, logs, source=None):
+        """
+        Append validation logs in one transaction. Returns the number of
+        new scenarios (already catalogued ids are skipped).
+        """
+        added = 0
+
+        with self._lock, self.db:
+            for log in logs:
+                cursor = self.db.execute(_INSERT, _row(log, source))
+                if cursor.rowcount == 0:
+                    continue
+
+                rowid = cursor.lastrowid
+                self.db.executemany(
+                    "INSERT INTO inputs (scenario, name, value) VALUES (?, ?, ?)",
+                    [(rowid, name, value) for name, value in _numeric_inputs(log)]
+                )
+                added += 1
+
+        return added
+
+    def import_files(self, paths, source=None):
+        """Backfill from existing scenario_log.json files."""
+        logs = []
+        for path in paths:
+            with open(path) as f:
+                logs.append(json.load(f))
+        return self.add_many(logs, source=source or "import")
+
+    # ---------------------------------------------------------
+    # Lookup
+    # ---------------------------------------------------------
+
+    def get(self, scenario_id):
+        """Validation log dict for scenario_id, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT log FROM scenarios WHERE scenario_id = ?", (scenario_id,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def latest(self, source=None):
+        """Most recently generated log (optionally of one source), or None."""
+        sql = "SELECT log FROM scenarios"
+        args = []
+        if source is not None:
+            sql += " WHERE source = ?"
+            args.append(source)
+        sql += " ORDER BY generated_utc DESC, id DESC LIMIT 1"
+
+        with self._lock:
+            row = self.db.execute(sql, args).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def _where(self, ranges, since, until, source):
+        clauses = []
+        args = []
+
+        for name, (lo, hi) in (ranges or {}).items():
+            if name in COLUMNS:
+                if lo is not None:
+                    clauses.append(f"{name} >= ?")
+                    args.append(lo)
+                if hi is not None:
+                    clauses.append(f"{name} <= ?")
+                    args.append(hi)
+                continue
+
+            # Input parameter: range over the indexed (name, value) table
+            sub = "SELECT scenario FROM inputs WHERE name = ?"
+            args.append(name)
+            if lo is not None:
+                sub += " AND value >= ?"
+                args.append(lo)
+            if hi is not None:
+                sub += " AND value <= ?"
+                args.append(hi)
+            clauses.append(f"id IN ({sub})")
+
+        if since is not None:
+            clauses.append("generated_utc >= ?")
+            args.append(_utc_text(since))
+        if until is not None:
+            clauses.append("generated_utc < ?")
+            args.append(_utc_text(until))
+        if source is not None:
+            clauses.append("source = ?")
+            args.append(source)
+
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, args
+
+    def find(self, ranges=None, since=None, until=None, source=None, limit=None):
+        """
+        Validation logs matching every condition, oldest first.
+
+        ranges: {name: (lo, hi)} inclusive, either bound may be None.
+            name is a column in COLUMNS or any numeric input
+            (tcpa_sec, cpa_ft, rel_speed_mps, ...)
+        since / until: generated_utc bounds (datetime or ISO text)
+        """
+        where, args = self._where(ranges, since, until, source)
+
+        sql = f"SELECT log FROM scenarios{where} ORDER BY generated_utc, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        with self._lock:
+            rows = self.db.execute(sql, args).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, ranges=None, since=None, until=None, source=None):
+        where, args = self._where(ranges, since, until, source)
+
+        with self._lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM scenarios{where}", args).fetchone()[0]
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Query or backfill the scenario catalog")
+
+    parser.add_argument("--catalog", default=DEFAULT_PATH)
+    parser.add_argument("--import_logs", nargs="+", default=None, help="Add existing scenario_log.json files")
+    parser.add_argument("--id", default=None, help="Print one scenario log")
+    parser.add_argument("--since", default=None)
+    parser.add_argument("--until", default=None)
+    parser.add_argument("--max_sep_ft", type=float, default=None)
+    parser.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    with ScenarioCatalog(args.catalog) as catalog:
+
+        if args.import_logs:
+            added = catalog.import_files(args.import_logs)
+            print(f"✅ {added} scenarios added to {args.catalog}")
+            return
+
+        if args.id:
+            print(json.dumps(catalog.get(args.id), indent=4))
+            return
+
+        ranges = {}
+        if args.max_sep_ft is not None:
+            ranges["sep_3d_ft"] = (None, args.max_sep_ft)
+
+        total = catalog.count(ranges, args.since, args.until)
+
+        for log in catalog.find(ranges, args.since, args.until, limit=args.limit):
+            meta = log["metadata"]
+            print(f"{meta['scenario_id']}  {meta['generated_utc']}  3D sep {log['cpa_metrics']['3d_sep_ft']} ft")
+
+        print(f"{total} matching scenarios")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+import numpy as np
+
+from projection import LocalProjector
+
+# =========================================================
+# CROSS-SCENARIO SEPARATION SCREENING
+# Many generated encounters flown at once in one shared SITL
+# world must not interfere: aircraft from different scenarios
+# must never lose separation. Every aircraft flies one
+# straight-line track (the same kinematics as conflict_math),
+# so screening is:
+#
+#   1. bin each track into a space-time grid (x, y, z, t)
+#      using per-time-slice bounding boxes inflated by half
+#      the separation thresholds
+#   2. keep only pairs that share a cell
+#   3. exact analytic CPA / loss-of-separation check for the
+#      surviving pairs only
+# =========================================================
+
+
+def tracks_from_geometry(points, tcpa_sec, post_cpa_sec, start_time_sec=0.0):
+    """
+    Flatten a batch ConflictGeometry (N scenarios) into 2N tracks:
+    ownship rows first, then targets. Returns a dict of arrays suitable
+    for screen_tracks(**tracks, ...). Each scenario may start at its own
+    start_time_sec in the shared world.
+    """
+    n = np.asarray(points.os_start).shape[0]
+
+    tcpa_sec = np.broadcast_to(np.asarray(tcpa_sec, dtype=float), (n,))
+    post_cpa_sec = np.broadcast_to(np.asarray(post_cpa_sec, dtype=float), (n,))
+    t0 = np.broadcast_to(np.asarray(start_time_sec, dtype=float), (n,))
+    t1 = t0 + tcpa_sec + post_cpa_sec
+
+    def both(os_value, tgt_value):
+        return np.concatenate([
+            np.broadcast_to(os_value, (n,)),
+            np.broadcast_to(tgt_value, (n,)),
+        ])
+
+    return {
+        "lat_deg": both(points.os_start[:, 0], points.tgt_start[:, 0]),
+        "lon_deg": both(points.os_start[:, 1], points.tgt_start[:, 1]),
+        "alt_m": both(points.os_start[:, 2], points.tgt_start[:, 2]),
+        "vx_mps": both(points.vx_os, points.vx_tgt),
+        "vy_mps": both(points.vy_os, points.vy_tgt),
+        "vz_mps": both(points.vz_os, points.vz_tgt),
+        "t0_sec": both(t0, t0),
+        "t1_sec": both(t1, t1),
+        "group": both(np.arange(n), np.arange(n)),
+    }
+
+
+def screen_tracks(
+    lat_deg,
+    lon_deg,
+    alt_m,
+    vx_mps,
+    vy_mps,
+    vz_mps,
+    t0_sec,
+    t1_sec,
+    sep_horiz_m,
+    sep_vert_m,
+    group=None,
+    cell_m=None,
+    slice_sec=None,
+    ellipsoidal=False
+):
+    """
+    Find every pair of tracks that loses separation (horizontal distance
+    below sep_horiz_m AND vertical below sep_vert_m at the same time).
+
+    Track k starts at (lat_deg, lon_deg, alt_m) at time t0_sec and flies
+    east/north/up velocity (vx, vy, vz) until t1_sec. Pairs that share a
+    group id (e.g. the ownship and target of one scenario) are not
+    reported. All tracks are placed in one tangent plane about their mean
+    position, so keep the batch within a few hundred km.
+
+    Returns a dict of arrays, one row per violating pair:
+        i, j                  track indices (i < j)
+        t_cpa_sec             time of 3D closest approach
+        sep_horiz_m, sep_vert_m, sep_3d_m   separations at t_cpa_sec
+        los_start_sec, los_end_sec          loss-of-separation interval
+    plus "candidates": how many pairs survived the grid.
+    """
+
+    # Thresholds size the grid cells and divide the exact-CPA intervals
+    for name, value in (
+        ("sep_horiz_m", sep_horiz_m),
+        ("sep_vert_m", sep_vert_m),
+        ("cell_m", cell_m),
+        ("slice_sec", slice_sec),
+    ):
+        if value is not None and not value > 0:
+            raise ValueError(f"{name} must be positive: {value}")
+
+    lat_deg = np.asarray(lat_deg, dtype=float)
+    lon_deg = np.asarray(lon_deg, dtype=float)
+    n = lat_deg.shape[0]
+
+    vel = np.column_stack([
+        np.broadcast_to(np.asarray(vx_mps, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(vy_mps, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(vz_mps, dtype=float), (n,)),
+    ])
+    t0 = np.broadcast_to(np.asarray(t0_sec, dtype=float), (n,))
+    t1 = np.broadcast_to(np.asarray(t1_sec, dtype=float), (n,))
+
+    projector = LocalProjector(
+        float(lat_deg.mean()), float(lon_deg.mean()), ellipsoidal=ellipsoidal
+    )
+    x, y = projector.to_local(lat_deg, lon_deg)
+    pos = np.column_stack([x, y, np.broadcast_to(np.asarray(alt_m, dtype=float), (n,))])
+
+    # ---- Grid resolution ----
+    if cell_m is None:
+        cell_m = 4.0 * sep_horiz_m
+
+    if slice_sec is None:
+        speed = np.hypot(vel[:, 0], vel[:, 1])
+        slice_sec = cell_m / max(float(np.median(speed)), 1.0)
+
+    cell_z = 4.0 * sep_vert_m
+
+    # ---- 1. Space-time binning ----
+    track, key = _space_time_cells(
+        pos, vel, t0, t1,
+        cell_m, cell_z, slice_sec,
+        sep_horiz_m / 2.0, sep_vert_m / 2.0
+    )
+
+    # ---- 2. Candidate pairs: tracks sharing a cell ----
+    i, j = _pairs_sharing_cells(track, key)
+
+    if group is not None:
+        group = np.asarray(group)
+        keep = group[i] != group[j]
+        i, j = i[keep], j[keep]
+
+    # ---- 3. Exact check on the survivors ----
+    result = _exact_cpa(pos, vel, t0, t1, i, j, sep_horiz_m, sep_vert_m)
+    result["candidates"] = int(i.size)
+
+    return result
+
+
+def _space_time_cells(pos, vel, t0, t1, cell_m, cell_z, slice_sec, pad_h, pad_v):
+    # One row per (track, time slice): the slice's own time range
+    it0 = np.floor(t0 / slice_sec).astype(np.int64)
+    it1 = np.floor(t1 / slice_sec).astype(np.int64)
+    n_slices = it1 - it0 + 1
+
+    track = np.repeat(np.arange(pos.shape[0]), n_slices)
+    first = np.repeat(np.cumsum(n_slices) - n_slices, n_slices)
+    it = np.repeat(it0, n_slices) + (np.arange(track.size) - first)
+
+    ta = np.maximum(it * slice_sec, t0[track]) - t0[track]
+    tb = np.minimum((it + 1) * slice_sec, t1[track]) - t0[track]
+
+    p = pos[track]
+    v = vel[track]
+    pa = p + v * ta[:, None]
+    pb = p + v * tb[:, None]
+
+    lo = np.minimum(pa, pb)
+    hi = np.maximum(pa, pb)
+
+    pad = np.array([pad_h, pad_h, pad_v])
+    size = np.array([cell_m, cell_m, cell_z])
+
+    c_lo = np.floor((lo - pad) / size).astype(np.int64)
+    c_hi = np.floor((hi + pad) / size).astype(np.int64)
+    span = c_hi - c_lo + 1
+
+    # Expand every slice box into the cells it touches
+    counts = span.prod(axis=1)
+    row = np.repeat(np.arange(track.size), counts)
+    local = np.arange(row.size) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    s = span[row]
+    cz = local % s[:, 2]
+    cy = (local // s[:, 2]) % s[:, 1]
+    cx = local // (s[:, 2] * s[:, 1])
+
+    cells = np.column_stack([
+        c_lo[row, 0] + cx,
+        c_lo[row, 1] + cy,
+        c_lo[row, 2] + cz,
+        it[row],
+    ])
+
+    return track[row], _cell_keys(cells)
+
+
+def _cell_keys(cells):
+    # Pack (x, y, z, t) cell indices into one int64 when the occupied
+    # ranges allow it; fall back to row-wise unique otherwise
+    cells = cells - cells.min(axis=0)
+    extent = cells.max(axis=0) + 1
+
+    if np.prod(extent.astype(float)) < 2.0**62:
+        key = cells[:, 0]
+        for axis in range(1, cells.shape[1]):
+            key = key * extent[axis] + cells[:, axis]
+        return key
+
+    _, key = np.unique(cells, axis=0, return_inverse=True)
+    return key.ravel()
+
+
+def _pairs_sharing_cells(track, key):
+    # Sort entries by cell; each entry pairs with every later entry of
+    # the same cell, generated with repeat/cumsum (no Python loop)
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    track = track[order]
+
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    sizes = np.diff(np.r_[starts, key.size])
+    group_end = np.repeat(starts + sizes, sizes)
+
+    later = group_end - np.arange(key.size) - 1
+    first = np.repeat(np.arange(key.size), later)
+    second = first + 1 + (np.arange(first.size) - np.repeat(np.cumsum(later) - later, later))
+
+    a = track[first]
+    b = track[second]
+    lo = np.minimum(a, b)
+    hi = np.maximum(a, b)
+
+    n = np.int64(track.max() + 1) if track.size else np.int64(1)
+    code = np.unique(lo[lo != hi] * n + hi[lo != hi])
+
+    return code // n, code % n
+
+
+def _exact_cpa(pos, vel, t0, t1, i, j, sep_h, sep_v):
+
+    ta = np.maximum(t0[i], t0[j])
+    tb = np.minimum(t1[i], t1[j])
+
+    # Relative state of j w.r.t. i at time ta
+    r = (pos[j] + vel[j] * (ta - t0[j])[:, None]) - (pos[i] + vel[i] * (ta - t0[i])[:, None])
+    v = vel[j] - vel[i]
+    window = tb - ta
+
+    # 3D closest approach inside the shared window
+    vv = np.einsum("ij,ij->i", v, v)
+    rv = np.einsum("ij,ij->i", r, v)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tc = np.where(vv > 1e-12, -rv / vv, 0.0)
+    tc = np.clip(tc, 0.0, np.maximum(window, 0.0))
+    d = r + v * tc[:, None]
+
+    # Horizontal: |r_h + v_h t| < sep_h  ->  quadratic in t
+    a = v[:, 0] ** 2 + v[:, 1] ** 2
+    b = 2.0 * (r[:, 0] * v[:, 0] + r[:, 1] * v[:, 1])
+    c = r[:, 0] ** 2 + r[:, 1] ** 2 - sep_h ** 2
+    disc = b * b - 4.0 * a * c
+
+    still = a < 1e-12
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = np.sqrt(np.maximum(disc, 0.0))
+        h_lo = np.where(still, -np.inf, (-b - root) / (2.0 * a))
+        h_hi = np.where(still, np.inf, (-b + root) / (2.0 * a))
+    h_ok = np.where(still, c < 0.0, disc > 0.0)
+
+    # Vertical: |r_z + v_z t| < sep_v  ->  linear in t
+    vz = v[:, 2]
+    flat = np.abs(vz) < 1e-12
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z1 = (-sep_v - r[:, 2]) / vz
+        z2 = (sep_v - r[:, 2]) / vz
+    v_lo = np.where(flat, -np.inf, np.minimum(z1, z2))
+    v_hi = np.where(flat, np.inf, np.maximum(z1, z2))
+    v_ok = np.where(flat, np.abs(r[:, 2]) < sep_v, True)
+
+    los_lo = np.maximum.reduce([h_lo, v_lo, np.zeros_like(window)])
+    los_hi = np.minimum.reduce([h_hi, v_hi, window])
+
+    hit = h_ok & v_ok & (window >= 0.0) & (los_lo < los_hi)
+
+    return {
+        "i": i[hit],
+        "j": j[hit],
+        "t_cpa_sec": (ta + tc)[hit],
+        "sep_horiz_m": np.hypot(d[:, 0], d[:, 1])[hit],
+        "sep_vert_m": np.abs(d[:, 2])[hit],
+        "sep_3d_m": np.sqrt(np.einsum("ij,ij->i", d, d))[hit],
+        "los_start_sec": (ta + los_lo)[hit],
+        "los_end_sec": (ta + los_hi)[hit],
+    }
@@ -0,0 +1,129 @@
+import collections
+
+# =========================================================
+# SESSION STORE
+# In-memory artifact store for one UI session (one per
+# Streamlit st.session_state). Holds the scenario bundles a
+# session generated, keyed by scenario_key, plus derived
+# download payloads (zips) built from them, under a byte
+# budget. Nothing touches the filesystem, so concurrent
+# sessions can never see each other's files.
+#
+# slots name what each tab currently shows ("type1",
+# "type2"); those bundles are pinned, older generations are
+# evicted least recently used first.
+# =========================================================
+
+DEFAULT_SESSION_BYTES = 32 * 1024 * 1024
+
+
+def approx_bytes(value):
+    """Rough in-memory size of a meta value: arrays by nbytes, containers summed."""
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(approx_bytes(k) + approx_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(approx_bytes(v) for v in value)
+    return 8
+
+
+class SessionStore:
+
+    def __init__(self, max_bytes=DEFAULT_SESSION_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()   # key -> ScenarioBundle
+        self.payloads = {}                          # (key, label) -> bytes
+        self.slots = {}                             # slot -> key
+        self.meta = {}                              # key -> JSON-able extra (e.g. plot points)
+        self.meta_bytes = {}                        # key -> approx_bytes(meta)
+
+    # ---------------------------------------------------------
+    # Bundles
+    # ---------------------------------------------------------
+
+    def put(self, slot, key, bundle, meta=None):
+        """Store bundle under key and make it slot's current bundle."""
+        self.entries[key] = bundle
+        self.entries.move_to_end(key)
+        self.meta[key] = meta
+        self.meta_bytes[key] = approx_bytes(meta)
+        self.slots[slot] = key
+        self.evict()
+
+    def get(self, key):
+        """(bundle, meta) for key, or None. A hit counts as a use."""
+        bundle = self.entries.get(key)
+        if bundle is None:
+            return None
+        self.entries.move_to_end(key)
+        return bundle, self.meta.get(key)
+
+    def select(self, slot, key):
+        """Point slot at an already stored key. Returns False on a miss."""
+        if self.get(key) is None:
+            return False
+        self.slots[slot] = key
+        return True
+
+    def current(self, slot):
+        """The bundle slot currently shows, or None."""
+        key = self.slots.get(slot)
+        return self.entries.get(key) if key is not None else None
+
+    # ---------------------------------------------------------
+    # Download payloads
+    # ---------------------------------------------------------
+
+    def payload(self, slot, label, build):
+        """
+        Bytes derived from slot's current bundle, e.g.
+        payload("type1", "plan.zip", lambda b: b.to_zip(names=b.names(".plan"))).
+        Built once per bundle and kept (counted against the budget).
+        """
+        key = self.slots.get(slot)
+        if key is None:
+            return None
+
+        data = self.payloads.get((key, label))
+        if data is None:
+            data = build(self.entries[key])
+            self.payloads[(key, label)] = data
+            self.evict()
+
+        return data
+
+    # ---------------------------------------------------------
+    # Budget
+    # ---------------------------------------------------------
+
+    def total_bytes(self):
+        return (
+            sum(bundle.total_bytes() for bundle in self.entries.values())
+            + sum(len(data) for data in self.payloads.values())
+            + sum(self.meta_bytes.values())
+        )
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        self.meta.pop(key, None)
+        self.meta_bytes.pop(key, None)
+        for payload_key in [k for k in self.payloads if k[0] == key]:
+            del self.payloads[payload_key]
+
+    def evict(self):
+        """Drop least recently used unpinned bundles until within max_bytes."""
+        pinned = set(self.slots.values())
+        total = self.total_bytes()
+
+        for key in list(self.entries):
+            if total <= self.max_bytes:
+                break
+            if key in pinned:
+                continue
+            self._drop(key)
+            total = self.total_bytes()
+
+        return total
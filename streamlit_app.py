@@ -1,16 +1,22 @@
 import streamlit as st
 import base64
-import zipfile
 import io
-import matplotlib.pyplot as plt
-import pandas as pd
-
-from conflict_math import compute_conflict_geometry, compute_initial_positions_type2
-from plan_writer import write_plan_file, write_waypoints_file, write_kml_file
-from yaml_writer import write_yaml_file
-from units import ft_to_m, m_to_ft, kt_to_mps, mps_to_kt, fpm_to_mps
-from validation_logger import save_validation_log
-from plan_writer import write_combined_kml_file
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from conflict_math import (
+    compute_conflict_geometry,
+    compute_initial_positions_type2,
+    print_conflict_summary
+)
+from bundle import ScenarioBundle, build_scenario_bundle
+from units import ft_to_m, m_to_ft, kt_to_mps, mps_to_kt, fpm_to_mps, mmss_to_sec
+from validation_logger import build_validation_log
+from artifact_cache import ArtifactCache, scenario_key
+from scenario_catalog import ScenarioCatalog
+from session_store import SessionStore
+from sweep import RESULT_COLUMNS, axis_values, solve_sweep, sweep_csv, sweep_size
 
 
 # -------------------------------------------------
@@ -29,26 +35,79 @@ if "files_generated_type2" not in st.session_state:
 if "generated_points_type2" not in st.session_state:
     st.session_state.generated_points_type2 = None
 
+if "sweep_result" not in st.session_state:
+    st.session_state.sweep_result = None
+
+# Generated files live in memory only, in a store private to this session
+if "artifact_store" not in st.session_state:
+    st.session_state.artifact_store = SessionStore()
+
+store = st.session_state.artifact_store
+
+
+def session_zip(slot, suffix):
+    # Zip of one file type, built once per generated bundle
+    return store.payload(slot, suffix + ".zip", lambda b: b.to_zip(names=b.names(suffix)))
+
 
 # -------------------------------------------------
-# TIME CONVERSION
+# ARTIFACT CACHE
 # -------------------------------------------------
 
-def mmss_to_sec(mmss: str) -> int:
+# Identical inputs reuse the stored files instead of regenerating
+@st.cache_resource
+def get_artifact_cache():
+    # Built once per server process rather than on every rerun
+    return ArtifactCache(".artifact_cache")
 
-    mmss = mmss.strip()
-    parts = mmss.split(":")
 
-    if len(parts) != 2:
-        raise ValueError("TCPA must be in mm:ss format (example: 01:30)")
+artifact_cache = get_artifact_cache()
 
-    minutes = int(parts[0])
-    seconds = int(parts[1])
+# Every freshly generated scenario is also appended to the history
+@st.cache_resource
+def get_catalog():
+    # One connection per server process, shared by every session and
+    # rerun (ScenarioCatalog is thread-safe)
+    return ScenarioCatalog()
 
-    if seconds < 0 or seconds >= 60:
-        raise ValueError("Seconds must be between 0 and 59")
 
-    return minutes * 60 + seconds
+scenario_catalog = get_catalog()
+
+
+PLOT_KEYS = ("os_start", "os_cpa", "os_end", "tgt_start", "tgt_cpa", "tgt_end")
+
+
+def points_meta(points):
+    # JSON-friendly copy of the geometry, enough to redraw the plot
+    return {k: points[k] for k in PLOT_KEYS}
+
+
+# -------------------------------------------------
+# RESULT CACHE
+# -------------------------------------------------
+
+# Shared by all sessions of this server process. Entries are keyed on
+# the (normalized) inputs, so a rerun with unchanged widgets is a lookup
+CACHE_TTL_SEC = 3600
+CACHE_MAX_ENTRIES = 256
+
+
+@st.cache_data(ttl=CACHE_TTL_SEC, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def solve_geometry(**inputs):
+    return compute_conflict_geometry(**inputs)
+
+
+def cached_geometry(**inputs):
+    # The console summary prints on every generate, cached or not
+    points = solve_geometry(**inputs)
+    print_conflict_summary(points, inputs["conflict_dh_m"], inputs["target_alto_m"])
+    return points
+
+
+def plot_key(points):
+    # Plain float tuples: hashes the same whether points came from a
+    # fresh solve (numpy) or from a cache entry (JSON lists)
+    return tuple(tuple(float(v) for v in points[k]) for k in PLOT_KEYS)
 
 
 # -------------------------------------------------
@@ -57,6 +116,9 @@ def mmss_to_sec(mmss: str) -> int:
 
 def plot_cpa_encounter(points):
 
+    # matplotlib loads on the first plot, not on every app start
+    import matplotlib.pyplot as plt
+
     os_start = points["os_start"]
     os_cpa = points["os_cpa"]
     os_end = points["os_end"]
@@ -103,14 +165,153 @@ def plot_cpa_encounter(points):
     return fig
 
 
+@st.cache_data(ttl=CACHE_TTL_SEC, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cpa_plot_png(geometry):
+
+    import matplotlib.pyplot as plt
+
+    fig = plot_cpa_encounter(dict(zip(PLOT_KEYS, geometry)))
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+
+    # The server process is long-lived: never leave figures open
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
+# -------------------------------------------------
+# PARAMETER SWEEP
+# -------------------------------------------------
+
+def same_units(value):
+    return value
+
+
+# label -> (geometry kwarg, to SI units, default range, default fixed value)
+SWEEP_PARAMETERS = {
+    "Relative Heading (deg)": ("relative_heading_deg", same_units, "0:350:10", 95.0),
+    "Relative Speed (kt)": ("rel_speed_mps", kt_to_mps, "-10:30:2", 10.0),
+    "TCPA (sec)": ("tcpa_sec", same_units, "30:120:10", 60.0),
+    "CPA Distance (ft)": ("cpa_horiz_m", ft_to_m, "0:500:50", 20.0),
+    "Conflict Relative Altitude (ft)": ("conflict_dh_m", ft_to_m, "0:100:10", 30.0),
+    "Target Alt Offset (ft)": ("target_alto_m", ft_to_m, "0:40:10", 20.0),
+}
+
+# Keeps the grid, its CSV and the zip well inside the session budget
+MAX_SWEEP_POINTS = 100000
+SWEEP_CHUNK_SIZE = 5000
+
+SEPARATION_PLOTS = (
+    ("Horizontal CPA Separation (ft)", "cpa_sep_horiz_m"),
+    ("Vertical CPA Separation (ft)", "cpa_sep_vert_m"),
+    ("3D CPA Separation (ft)", "cpa_sep_3d_m"),
+)
+
+
+@st.cache_resource
+def sweep_executor():
+    # One solver thread per server process; sessions queue behind it
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="sweep")
+
+
+class SweepCancelled(Exception):
+    pass
+
+
+def solve_sweep_with_progress(axes, base):
+
+    total = sweep_size(axes)
+    state = {"started": False, "rows": 0, "cancelled": False}
+
+    def progress(rows, _total):
+        # Checked between chunks, so a sweep whose session moved on stops early
+        if state["cancelled"]:
+            raise SweepCancelled()
+        state["rows"] = rows
+
+    def run():
+        if state["cancelled"]:
+            return None
+        state["started"] = True
+        return solve_sweep(axes, base, SWEEP_CHUNK_SIZE, progress)
+
+    future = sweep_executor().submit(run)
+
+    queued = "Queued: waiting for other sweeps to finish"
+    bar = st.progress(0.0, text=queued)
+
+    try:
+        # Update the bar on every tick, queued or not: Streamlit only
+        # interrupts the script (rerun, disconnect) at an st call
+        while not wait([future], timeout=0.1).done:
+            if state["started"]:
+                bar.progress(state["rows"] / total, text=f"{state['rows']} / {total} encounters")
+            else:
+                bar.progress(0.0, text=queued)
+    finally:
+        # A rerun or disconnect stops the script inside this loop: drop the
+        # sweep whether it is still queued or already running
+        state["cancelled"] = True
+        future.cancel()
+
+    bar.empty()
+
+    return future.result()
+
+
+@st.cache_data(ttl=CACHE_TTL_SEC, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def sweep_heatmap_png(sweep_key, slice_index, _sweep):
+
+    import matplotlib.pyplot as plt
+
+    labels = _sweep["labels"]
+    values = _sweep["values"]
+    rows = _sweep["rows"]
+
+    shape = [len(v) for v in values]
+    first_result = 1 + len(labels)
+
+    # 1440 px wide: st.image re-encodes anything over its 1460 px limit on every rerun
+    fig, axes = plt.subplots(1, len(SEPARATION_PLOTS), figsize=(14.4, 4.3), constrained_layout=True)
+
+    for ax, (title, column) in zip(axes, SEPARATION_PLOTS):
+
+        grid = m_to_ft(rows[:, first_result + RESULT_COLUMNS.index(column)].reshape(shape))
+        if grid.ndim == 3:
+            grid = grid[:, :, slice_index]
+
+        # Rows of the grid run along the X axis
+        mesh = ax.pcolormesh(values[0], values[1], grid.T, shading="nearest", cmap="viridis")
+        fig.colorbar(mesh, ax=ax, label="ft")
+
+        ax.set_title(title)
+        ax.set_xlabel(labels[0])
+        ax.set_ylabel(labels[1])
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100)
+
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+
 # -------------------------------------------------
 # LOGO
 # -------------------------------------------------
 
-def show_logo_top_left(image_path, width=120):
+@st.cache_data(show_spinner=False)
+def logo_base64(image_path):
 
     with open(image_path, "rb") as image_file:
-        encoded = base64.b64encode(image_file.read()).decode()
+        return base64.b64encode(image_file.read()).decode()
+
+
+def show_logo_top_left(image_path, width=120):
+
+    encoded = logo_base64(image_path)
 
     st.markdown(
         f"""
@@ -142,7 +343,7 @@ st.set_page_config(page_title="Conflict Plan Generator")
 
 st.title("✈ Conflict Plan Generator")
 
-tab1, tab2 = st.tabs(["TCT", "TCT+"])
+tab1, tab2, tab3 = st.tabs(["TCT", "TCT+", "Sweep"])
 
 
 # =========================================================
@@ -195,7 +396,46 @@ with tab1:
     # GENERATE FILES
     # -------------------------------------------------
 
-    if st.button("Generate Plan Files"):
+    generate_t1 = st.button("Generate Plan Files")
+
+    cache_key_t1 = scenario_key({
+        "mode": "type1",
+        "os_callsign": os_callsign,
+        "tgt_callsign": tgt_callsign,
+        "tcpa": tcpa_mmss,
+        "post_cpa": post_cpa_mmss,
+        "cpa": cpa_dist_ft,
+        "os_lat": os_lat,
+        "os_lon": os_lon,
+        "os_alt": os_alt_ft,
+        "os_course": os_course,
+        "os_speed": os_speed_kt,
+        "os_vspeed": os_vspeed_fpm,
+        "rel_speed": rel_speed_kt,
+        "conflict_dh": conflict_dh_ft,
+        "tgt_alto": tgt_alt_offset_ft,
+        "relative_heading": relative_heading
+    })
+
+    restored_t1 = generate_t1 and store.select("type1", cache_key_t1)
+    cached_t1 = artifact_cache.get(cache_key_t1) if generate_t1 and not restored_t1 else None
+
+    if restored_t1:
+
+        st.session_state.files_generated = True
+        st.session_state.generated_points = store.get(cache_key_t1)[1]
+
+        st.success("Files restored from this session!")
+
+    elif cached_t1 is not None:
+
+        st.session_state.files_generated = True
+        st.session_state.generated_points = cached_t1["meta"]
+        store.put("type1", cache_key_t1, ScenarioBundle(cached_t1["files"]), meta=cached_t1["meta"])
+
+        st.success("All files restored from cache!")
+
+    elif generate_t1:
 
         try:
 
@@ -212,7 +452,7 @@ with tab1:
             conflict_dh_m = ft_to_m(conflict_dh_ft)
             tgt_alt_offset_m = ft_to_m(tgt_alt_offset_ft)
 
-            points = compute_conflict_geometry(
+            points = cached_geometry(
                 tcpa_sec=tcpa_sec,
                 cpa_horiz_m=cpa_dist_m,
                 os_lat_deg=os_lat,
@@ -228,58 +468,9 @@ with tab1:
                 post_cpa_sec=post_cpa_sec
             )
 
-            positions_df = pd.DataFrame([
-                {
-                    "start_lat": points["os_start"][0],
-                    "start_lon": points["os_start"][1],
-                    "start_alt": points["os_start"][2],
-
-                    "end_lat": points["os_end"][0],
-                    "end_lon": points["os_end"][1],
-                    "end_alt": points["os_end"][2],
-
-                    "gspeed": os_speed_kt,
-                    "vspeed": os_vspeed_fpm,
-                    "course": os_course
-                },
-                {
-                    "start_lat": points["tgt_start"][0],
-                    "start_lon": points["tgt_start"][1],
-                    "start_alt": points["tgt_start"][2],
-
-                    "end_lat": points["tgt_end"][0],
-                    "end_lon": points["tgt_end"][1],
-                    "end_alt": points["tgt_end"][2],
-
-                    "gspeed": os_speed_kt + rel_speed_kt,
-                    "vspeed": 0.0,
-                    "course": points["tgt_course_deg"]
-                }
-            ])
-
-            positions_df.to_csv("positions.csv", index=False)
-
-            print("positions.csv generated successfully")
-
             st.session_state.generated_points = points
 
-            # NEW FILENAMES
-            ownship_plan = f"Ownship_{os_callsign}.plan"
-            target_plan = f"Target_{tgt_callsign}.plan"
-
-            ownship_wp = f"Ownship_{os_callsign}.waypoints"
-            target_wp = f"Target_{tgt_callsign}.waypoints"
-
-            ownship_yaml = f"Ownship_{os_callsign}.yaml"
-            target_yaml = f"Target_{tgt_callsign}.yaml"
-
-            ownship_kml = f"Ownship_{os_callsign}.kml"
-            target_kml = f"Target_{tgt_callsign}.kml"
-
-            combined_kml = f"Ownship_{os_callsign}_Target_{tgt_callsign}.kml"
-
-            save_validation_log(
-                "scenario_log.json",
+            log = build_validation_log(
                 {
                     "tcpa_mmss": tcpa_mmss,
                     "tcpa_sec": tcpa_sec,
@@ -289,50 +480,65 @@ with tab1:
                 tcpa_sec
             )
 
-            home = points["os_start"]
-
-            write_plan_file(ownship_plan, [points["os_start"], points["os_cpa"], points["os_end"]], home)
-            write_plan_file(target_plan, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]], home)
-
-            write_waypoints_file(ownship_wp, [points["os_start"], points["os_cpa"], points["os_end"]])
-            write_waypoints_file(target_wp, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]])
-
-            write_kml_file(ownship_kml, [points["os_start"], points["os_cpa"], points["os_end"]])
-            write_kml_file(target_kml, [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]])
-
-            write_combined_kml_file(combined_kml,
-                                   [points["os_start"], points["os_cpa"], points["os_end"]],
-                                   [points["tgt_start"], points["tgt_cpa"], points["tgt_end"]])
-
-            write_yaml_file(
-                path=ownship_yaml,
-                callsign=os_callsign,
-                sysid=1,
-                lat_deg=os_lat,
-                lon_deg=os_lon,
-                alt_ft=os_alt_ft,
-                course_deg=os_course,
-                ground_speed_kt=os_speed_kt,
-                vertical_speed_fpm=os_vspeed_fpm,
-                waypoints_file=ownship_wp
-            )
-
             tgt_start = points["tgt_start"]
             tgt_alt_ft = round(m_to_ft(tgt_start[2]), 2)
 
-            write_yaml_file(
-                path=target_yaml,
-                callsign=tgt_callsign,
-                sysid=2,
-                lat_deg=tgt_start[0],
-                lon_deg=tgt_start[1],
-                alt_ft=tgt_alt_ft,
-                course_deg=points["tgt_course_deg"],
-                ground_speed_kt=round(mps_to_kt(rel_speed_mps), 2),
-                vertical_speed_fpm=0.0,
-                waypoints_file=target_wp
+            bundle = build_scenario_bundle(
+                points,
+                os_callsign=os_callsign,
+                tgt_callsign=tgt_callsign,
+                os_state={
+                    "lat_deg": os_lat,
+                    "lon_deg": os_lon,
+                    "alt_ft": os_alt_ft,
+                    "course_deg": os_course,
+                    "ground_speed_kt": os_speed_kt,
+                    "vertical_speed_fpm": os_vspeed_fpm
+                },
+                tgt_state={
+                    "lat_deg": tgt_start[0],
+                    "lon_deg": tgt_start[1],
+                    "alt_ft": tgt_alt_ft,
+                    "course_deg": points["tgt_course_deg"],
+                    "ground_speed_kt": round(mps_to_kt(rel_speed_mps), 2),
+                    "vertical_speed_fpm": 0.0
+                },
+                positions_rows=[
+                    {
+                        "start_lat": points["os_start"][0],
+                        "start_lon": points["os_start"][1],
+                        "start_alt": points["os_start"][2],
+
+                        "end_lat": points["os_end"][0],
+                        "end_lon": points["os_end"][1],
+                        "end_alt": points["os_end"][2],
+
+                        "gspeed": os_speed_kt,
+                        "vspeed": os_vspeed_fpm,
+                        "course": os_course
+                    },
+                    {
+                        "start_lat": points["tgt_start"][0],
+                        "start_lon": points["tgt_start"][1],
+                        "start_alt": points["tgt_start"][2],
+
+                        "end_lat": points["tgt_end"][0],
+                        "end_lon": points["tgt_end"][1],
+                        "end_alt": points["tgt_end"][2],
+
+                        "gspeed": os_speed_kt + rel_speed_kt,
+                        "vspeed": 0.0,
+                        "course": points["tgt_course_deg"]
+                    }
+                ],
+                log=log
             )
 
+            store.put("type1", cache_key_t1, bundle, meta=points_meta(points))
+
+            artifact_cache.put(cache_key_t1, bundle.files, meta=points_meta(points))
+            scenario_catalog.add(log, source="streamlit_type1")
+
             st.success("All files generated successfully!")
 
         except Exception as e:
@@ -348,64 +554,33 @@ with tab1:
         st.markdown("---")
         st.subheader("CPA Encounter Visualization")
 
-        fig = plot_cpa_encounter(st.session_state.generated_points)
-        st.pyplot(fig)
+        st.image(cpa_plot_png(plot_key(st.session_state.generated_points)), width="stretch")
 
 
     # -------------------------------------------------
     # DOWNLOAD BUTTONS
     # -------------------------------------------------
 
-    if st.session_state.files_generated:
-
-        ownship_plan = f"Ownship_{os_callsign}.plan"
-        target_plan = f"Target_{tgt_callsign}.plan"
-
-        ownship_wp = f"Ownship_{os_callsign}.waypoints"
-        target_wp = f"Target_{tgt_callsign}.waypoints"
-
-        ownship_yaml = f"Ownship_{os_callsign}.yaml"
-        target_yaml = f"Target_{tgt_callsign}.yaml"
+    bundle = store.current("type1")
 
-        ownship_kml = f"Ownship_{os_callsign}.kml"
-        target_kml = f"Target_{tgt_callsign}.kml"
-
-        combined_kml = f"Ownship_{os_callsign}_Target_{tgt_callsign}.kml"
+    if st.session_state.files_generated and bundle is not None:
 
         st.markdown("---")
         st.subheader(".PLAN FILES")
 
-        plan_zip = io.BytesIO()
-
-        with zipfile.ZipFile(plan_zip, "w") as z:
-            z.write(ownship_plan)
-            z.write(target_plan)
-
-        st.download_button("Download Plan Files", plan_zip.getvalue(), "plan_files.zip", key="t1_plan")
+        st.download_button("Download Plan Files", session_zip("type1", ".plan"), "plan_files.zip", key="t1_plan")
 
         st.markdown("---")
         st.subheader(".WAYPOINT FILES")
 
-        wp_zip = io.BytesIO()
-
-        with zipfile.ZipFile(wp_zip, "w") as z:
-            z.write(ownship_wp)
-            z.write(target_wp)
-
-        st.download_button("Download Waypoint Files", wp_zip.getvalue(), "waypoints.zip", key="t1_wp")
+        st.download_button("Download Waypoint Files", session_zip("type1", ".waypoints"), "waypoints.zip", key="t1_wp")
 
         st.markdown("---")
         st.subheader(".YAML FILES")
 
-        yaml_zip = io.BytesIO()
-
-        with zipfile.ZipFile(yaml_zip, "w") as z:
-            z.write(ownship_yaml)
-            z.write(target_yaml)
-
         st.download_button(
             "Download YAML Files",
-            data=yaml_zip.getvalue(),
+            data=session_zip("type1", ".yaml"),
             file_name="yaml_files.zip",
             mime="application/zip",
             key="t1_yaml"
@@ -414,39 +589,29 @@ with tab1:
         st.markdown("---")
         st.subheader(". KML FILES")
 
-        kml_zip = io.BytesIO()
-
-        with zipfile.ZipFile(kml_zip, "w") as z:
-            z.write(ownship_kml)
-            z.write(target_kml)
-            z.write(combined_kml)
-
         st.download_button(
             "Download KML Files",
-            data=kml_zip.getvalue(),
+            data=session_zip("type1", ".kml"),
             file_name="kml_files.zip",
             mime="application/zip",
             key="t1_kml"
         )
 
-        with open("scenario_log.json", "rb") as f:
-
-            st.markdown("---")
-            st.subheader("VALIDATION LOG")
+        st.markdown("---")
+        st.subheader("VALIDATION LOG")
 
-            st.download_button("Download Validation Log", f, "scenario_log.json", key="t1_log")
+        st.download_button("Download Validation Log", bundle["scenario_log.json"], "scenario_log.json", key="t1_log")
 
         st.markdown("---")
         st.subheader("POSITIONS FILE (FOR WORLD PLOT)")
 
-        with open("positions.csv", "rb") as f:
-            st.download_button(
-                "Download positions.csv",
-                data=f,
-                file_name="positions.csv",
-                mime="text/csv",
-                key="t1_csv"
-            )
+        st.download_button(
+            "Download positions.csv",
+            data=bundle["positions.csv"],
+            file_name="positions.csv",
+            mime="text/csv",
+            key="t1_csv"
+        )
 
 
 # =========================================================
@@ -500,7 +665,51 @@ with tab2:
     # GENERATE FILES
     # -------------------------------------------------
 
-    if st.button("Generate Plan File"):
+    generate_t2 = st.button("Generate Plan File")
+
+    cache_key_t2 = scenario_key({
+        "mode": "type2",
+        "os_callsign": os_callsign_t2,
+        "tgt_callsign": tgt_callsign_t2,
+        "tcpa": tcpa_mmss_t2,
+        "post_cpa": post_cpa_mmss_t2,
+        "cpa_lat": cpa_lat_t2,
+        "cpa_lon": cpa_lon_t2,
+        "os_start_lat": os_path_start_lat,
+        "os_start_lon": os_path_start_lon,
+        "os_end_lat": os_path_end_lat,
+        "os_end_lon": os_path_end_lon,
+        "os_speed": os_speed_kt_t2,
+        "os_alt": os_alt_ft_t2,
+        "os_vspeed": os_vspeed_fpm_t2,
+        "tgt_start_lat": tgt_path_start_lat,
+        "tgt_start_lon": tgt_path_start_lon,
+        "tgt_end_lat": tgt_path_end_lat,
+        "tgt_end_lon": tgt_path_end_lon,
+        "tgt_speed": tgt_speed_kt_t2,
+        "conflict_dh": conflict_dh_ft_t2,
+        "tgt_alto": tgt_alt_offset_ft_t2
+    })
+
+    restored_t2 = generate_t2 and store.select("type2", cache_key_t2)
+    cached_t2 = artifact_cache.get(cache_key_t2) if generate_t2 and not restored_t2 else None
+
+    if restored_t2:
+
+        st.session_state.files_generated_type2 = True
+        st.session_state.generated_points_type2 = store.get(cache_key_t2)[1]
+
+        st.success("Files restored from this session!")
+
+    elif cached_t2 is not None:
+
+        st.session_state.files_generated_type2 = True
+        st.session_state.generated_points_type2 = cached_t2["meta"]
+        store.put("type2", cache_key_t2, ScenarioBundle(cached_t2["files"]), meta=cached_t2["meta"])
+
+        st.success("Files restored from cache!")
+
+    elif generate_t2:
 
         try:
 
@@ -544,7 +753,7 @@ with tab2:
             relative_heading_t2 = (tgt_course_t2 - os_course_t2 + 360.0) % 360.0
             rel_speed_mps_t2 = tgt_speed_mps_t2 - os_speed_mps_t2
 
-            points_t2 = compute_conflict_geometry(
+            points_t2 = cached_geometry(
                 tcpa_sec=tcpa_sec_t2,
                 cpa_horiz_m=0.0,
                 os_lat_deg=os_init_lat_t2,
@@ -562,39 +771,7 @@ with tab2:
 
             st.session_state.generated_points_type2 = points_t2
 
-            positions_df_t2 = pd.DataFrame([
-                {
-                    "start_lat": points_t2["os_start"][0],
-                    "start_lon": points_t2["os_start"][1],
-                    "start_alt": points_t2["os_start"][2],
-
-                    "end_lat": points_t2["os_end"][0],
-                    "end_lon": points_t2["os_end"][1],
-                    "end_alt": points_t2["os_end"][2],
-
-                    "gspeed": os_speed_kt_t2,
-                    "vspeed": os_vspeed_fpm_t2,
-                    "course": os_course_t2
-                },
-                {
-                    "start_lat": points_t2["tgt_start"][0],
-                    "start_lon": points_t2["tgt_start"][1],
-                    "start_alt": points_t2["tgt_start"][2],
-
-                    "end_lat": points_t2["tgt_end"][0],
-                    "end_lon": points_t2["tgt_end"][1],
-                    "end_alt": points_t2["tgt_end"][2],
-
-                    "gspeed": tgt_speed_kt_t2,
-                    "vspeed": 0.0,
-                    "course": tgt_course_t2
-                }
-            ])
-
-            positions_df_t2.to_csv("positions_type2.csv", index=False)
-
-            save_validation_log(
-                "scenario_log_type2.json",
+            log_t2 = build_validation_log(
                 {
                     "tcpa_mmss": tcpa_mmss_t2,
                     "tcpa_sec": tcpa_sec_t2,
@@ -605,66 +782,65 @@ with tab2:
                 tcpa_sec_t2
             )
 
-            ownship_plan_t2 = f"Ownship_{os_callsign_t2}.plan"
-            target_plan_t2 = f"Target_{tgt_callsign_t2}.plan"
-
-            ownship_wp_t2 = f"Ownship_{os_callsign_t2}.waypoints"
-            target_wp_t2 = f"Target_{tgt_callsign_t2}.waypoints"
-
-            ownship_yaml_t2 = f"Ownship_{os_callsign_t2}.yaml"
-            target_yaml_t2 = f"Target_{tgt_callsign_t2}.yaml"
-
-            ownship_kml_t2 = f"Ownship_{os_callsign_t2}.kml"
-            target_kml_t2 = f"Target_{tgt_callsign_t2}.kml"
-
-            combined_kml_t2 = f"Ownship_{os_callsign_t2}_Target_{tgt_callsign_t2}.kml"
-
-            home_t2 = points_t2["os_start"]
-
-            write_plan_file(ownship_plan_t2, [points_t2["os_start"], points_t2["os_cpa"], points_t2["os_end"]], home_t2)
-            write_plan_file(target_plan_t2, [points_t2["tgt_start"], points_t2["tgt_cpa"], points_t2["tgt_end"]], home_t2)
-
-            write_waypoints_file(ownship_wp_t2, [points_t2["os_start"], points_t2["os_cpa"], points_t2["os_end"]])
-            write_waypoints_file(target_wp_t2, [points_t2["tgt_start"], points_t2["tgt_cpa"], points_t2["tgt_end"]])
-
-            write_kml_file(ownship_kml_t2, [points_t2["os_start"], points_t2["os_cpa"], points_t2["os_end"]])
-            write_kml_file(target_kml_t2, [points_t2["tgt_start"], points_t2["tgt_cpa"], points_t2["tgt_end"]])
-
-            write_combined_kml_file(
-                combined_kml_t2,
-                [points_t2["os_start"], points_t2["os_cpa"], points_t2["os_end"]],
-                [points_t2["tgt_start"], points_t2["tgt_cpa"], points_t2["tgt_end"]]
-            )
-
-            write_yaml_file(
-                path=ownship_yaml_t2,
-                callsign=os_callsign_t2,
-                sysid=1,
-                lat_deg=os_init_lat_t2,
-                lon_deg=os_init_lon_t2,
-                alt_ft=os_alt_ft_t2,
-                course_deg=os_course_t2,
-                ground_speed_kt=os_speed_kt_t2,
-                vertical_speed_fpm=os_vspeed_fpm_t2,
-                waypoints_file=ownship_wp_t2
-            )
-
             tgt_start_t2 = points_t2["tgt_start"]
             tgt_alt_ft_t2 = round(m_to_ft(tgt_start_t2[2]), 2)
 
-            write_yaml_file(
-                path=target_yaml_t2,
-                callsign=tgt_callsign_t2,
-                sysid=2,
-                lat_deg=tgt_start_t2[0],
-                lon_deg=tgt_start_t2[1],
-                alt_ft=tgt_alt_ft_t2,
-                course_deg=tgt_course_t2,
-                ground_speed_kt=tgt_speed_kt_t2,
-                vertical_speed_fpm=0.0,
-                waypoints_file=target_wp_t2
+            bundle_t2 = build_scenario_bundle(
+                points_t2,
+                os_callsign=os_callsign_t2,
+                tgt_callsign=tgt_callsign_t2,
+                os_state={
+                    "lat_deg": os_init_lat_t2,
+                    "lon_deg": os_init_lon_t2,
+                    "alt_ft": os_alt_ft_t2,
+                    "course_deg": os_course_t2,
+                    "ground_speed_kt": os_speed_kt_t2,
+                    "vertical_speed_fpm": os_vspeed_fpm_t2
+                },
+                tgt_state={
+                    "lat_deg": tgt_start_t2[0],
+                    "lon_deg": tgt_start_t2[1],
+                    "alt_ft": tgt_alt_ft_t2,
+                    "course_deg": tgt_course_t2,
+                    "ground_speed_kt": tgt_speed_kt_t2,
+                    "vertical_speed_fpm": 0.0
+                },
+                positions_rows=[
+                    {
+                        "start_lat": points_t2["os_start"][0],
+                        "start_lon": points_t2["os_start"][1],
+                        "start_alt": points_t2["os_start"][2],
+
+                        "end_lat": points_t2["os_end"][0],
+                        "end_lon": points_t2["os_end"][1],
+                        "end_alt": points_t2["os_end"][2],
+
+                        "gspeed": os_speed_kt_t2,
+                        "vspeed": os_vspeed_fpm_t2,
+                        "course": os_course_t2
+                    },
+                    {
+                        "start_lat": points_t2["tgt_start"][0],
+                        "start_lon": points_t2["tgt_start"][1],
+                        "start_alt": points_t2["tgt_start"][2],
+
+                        "end_lat": points_t2["tgt_end"][0],
+                        "end_lon": points_t2["tgt_end"][1],
+                        "end_alt": points_t2["tgt_end"][2],
+
+                        "gspeed": tgt_speed_kt_t2,
+                        "vspeed": 0.0,
+                        "course": tgt_course_t2
+                    }
+                ],
+                log=log_t2
             )
 
+            store.put("type2", cache_key_t2, bundle_t2, meta=points_meta(points_t2))
+
+            artifact_cache.put(cache_key_t2, bundle_t2.files, meta=points_meta(points_t2))
+            scenario_catalog.add(log_t2, source="streamlit_type2")
+
             st.success("Files generated successfully!")
 
         except Exception as e:
@@ -680,64 +856,33 @@ with tab2:
         st.markdown("---")
         st.subheader("CPA Encounter Visualization")
 
-        fig_t2 = plot_cpa_encounter(st.session_state.generated_points_type2)
-        st.pyplot(fig_t2)
+        st.image(cpa_plot_png(plot_key(st.session_state.generated_points_type2)), width="stretch")
 
 
     # -------------------------------------------------
     # DOWNLOAD BUTTONS
     # -------------------------------------------------
 
-    if st.session_state.files_generated_type2:
-
-        ownship_plan_t2 = f"Ownship_{os_callsign_t2}.plan"
-        target_plan_t2 = f"Target_{tgt_callsign_t2}.plan"
-
-        ownship_wp_t2 = f"Ownship_{os_callsign_t2}.waypoints"
-        target_wp_t2 = f"Target_{tgt_callsign_t2}.waypoints"
-
-        ownship_yaml_t2 = f"Ownship_{os_callsign_t2}.yaml"
-        target_yaml_t2 = f"Target_{tgt_callsign_t2}.yaml"
+    bundle_t2 = store.current("type2")
 
-        ownship_kml_t2 = f"Ownship_{os_callsign_t2}.kml"
-        target_kml_t2 = f"Target_{tgt_callsign_t2}.kml"
-
-        combined_kml_t2 = f"Ownship_{os_callsign_t2}_Target_{tgt_callsign_t2}.kml"
+    if st.session_state.files_generated_type2 and bundle_t2 is not None:
 
         st.markdown("---")
         st.subheader(".PLAN FILES")
 
-        plan_zip_t2 = io.BytesIO()
-
-        with zipfile.ZipFile(plan_zip_t2, "w") as z:
-            z.write(ownship_plan_t2)
-            z.write(target_plan_t2)
-
-        st.download_button("Download Plan Files", plan_zip_t2.getvalue(), "plan_files.zip", key="t2_plan")
+        st.download_button("Download Plan Files", session_zip("type2", ".plan"), "plan_files.zip", key="t2_plan")
 
         st.markdown("---")
         st.subheader(".WAYPOINT FILES")
 
-        wp_zip_t2 = io.BytesIO()
-
-        with zipfile.ZipFile(wp_zip_t2, "w") as z:
-            z.write(ownship_wp_t2)
-            z.write(target_wp_t2)
-
-        st.download_button("Download Waypoint Files", wp_zip_t2.getvalue(), "waypoints.zip", key="t2_wp")
+        st.download_button("Download Waypoint Files", session_zip("type2", ".waypoints"), "waypoints.zip", key="t2_wp")
 
         st.markdown("---")
         st.subheader(".YAML FILES")
 
-        yaml_zip_t2 = io.BytesIO()
-
-        with zipfile.ZipFile(yaml_zip_t2, "w") as z:
-            z.write(ownship_yaml_t2)
-            z.write(target_yaml_t2)
-
         st.download_button(
             "Download YAML Files",
-            data=yaml_zip_t2.getvalue(),
+            data=session_zip("type2", ".yaml"),
             file_name="yaml_files.zip",
             mime="application/zip",
             key="t2_yaml"
@@ -746,34 +891,206 @@ with tab2:
         st.markdown("---")
         st.subheader(".KML FILES")
 
-        kml_zip_t2 = io.BytesIO()
-
-        with zipfile.ZipFile(kml_zip_t2, "w") as z:
-            z.write(ownship_kml_t2)
-            z.write(target_kml_t2)
-            z.write(combined_kml_t2)
-
         st.download_button(
             "Download KML Files",
-            data=kml_zip_t2.getvalue(),
+            data=session_zip("type2", ".kml"),
             file_name="kml_files.zip",
             mime="application/zip",
             key="t2_kml"
         )
 
-        with open("scenario_log_type2.json", "rb") as f:
-            st.markdown("---")
-            st.subheader("VALIDATION LOG")
-            st.download_button("Validation Log", f, "scenario_log.json", key="t2_log")
+        st.markdown("---")
+        st.subheader("VALIDATION LOG")
+        st.download_button("Validation Log", bundle_t2["scenario_log.json"], "scenario_log.json", key="t2_log")
 
         st.markdown("---")
         st.subheader("POSITIONS FILE (FOR WORLD PLOT)")
 
-        with open("positions_type2.csv", "rb") as f:
-            st.download_button(
-                "Download positions.csv",
-                data=f,
-                file_name="positions.csv",
-                mime="text/csv",
-                key="t2_csv"
+        st.download_button(
+            "Download positions.csv",
+            data=bundle_t2["positions.csv"],
+            file_name="positions.csv",
+            mime="text/csv",
+            key="t2_csv"
+        )
+
+
+# =========================================================
+# ===================== SWEEP ==============================
+# =========================================================
+
+with tab3:
+
+    # -------------------------------------------------
+    # SWEPT PARAMETERS
+    # -------------------------------------------------
+
+    st.subheader("Swept Parameters")
+    st.caption("Ranges are start:stop:step (stop inclusive) or a list a,b,c")
+
+    sweep_labels = list(SWEEP_PARAMETERS)
+
+    sweep_x = st.selectbox("X Axis", sweep_labels, index=0, key="sw_x")
+    sweep_x_range = st.text_input(f"{sweep_x} Range", value=SWEEP_PARAMETERS[sweep_x][2], key=f"sw_range_x_{sweep_x}")
+
+    sweep_y = st.selectbox("Y Axis", sweep_labels, index=1, key="sw_y")
+    sweep_y_range = st.text_input(f"{sweep_y} Range", value=SWEEP_PARAMETERS[sweep_y][2], key=f"sw_range_y_{sweep_y}")
+
+    sweep_z = st.selectbox("Slice Axis (optional)", ["None"] + sweep_labels, index=0, key="sw_z")
+    sweep_z_range = None
+    if sweep_z != "None":
+        sweep_z_range = st.text_input(f"{sweep_z} Range", value=SWEEP_PARAMETERS[sweep_z][2], key=f"sw_range_z_{sweep_z}")
+
+    swept = {sweep_x: sweep_x_range, sweep_y: sweep_y_range}
+    if sweep_z_range is not None:
+        swept[sweep_z] = sweep_z_range
+
+
+    # -------------------------------------------------
+    # FIXED PARAMETERS
+    # -------------------------------------------------
+
+    st.subheader("Fixed Parameters")
+
+    fixed = {}
+    for label, (_, _, _, default) in SWEEP_PARAMETERS.items():
+        if label not in swept:
+            fixed[label] = st.number_input(label, value=default, key=f"sw_fixed_{label}")
+
+    post_cpa_sec_sw = st.number_input("Post-CPA Time (sec)", value=600.0, key="sw_post_cpa")
+
+    os_lat_sw = st.number_input("Ownship Latitude", value=37.618805, format="%.6f", key="sw_os_lat")
+    os_lon_sw = st.number_input("Ownship Longitude", value=-122.375416, format="%.6f", key="sw_os_lon")
+
+    os_alt_ft_sw = st.number_input("Ownship Altitude (ft)", value=50.0, key="sw_os_alt")
+    os_course_sw = st.number_input("Ownship Course (deg)", value=90.0, key="sw_os_course")
+    os_speed_kt_sw = st.number_input("Ownship Speed (kt)", value=20.0, key="sw_os_speed")
+    os_vspeed_fpm_sw = st.number_input("Ownship Vertical Speed (ft/min)", value=1.0, key="sw_os_vspeed")
+
+
+    # -------------------------------------------------
+    # RUN SWEEP
+    # -------------------------------------------------
+
+    run_sweep_sw = st.button("Run Sweep")
+
+    if run_sweep_sw:
+
+        try:
+
+            if len(set([sweep_x, sweep_y, sweep_z])) < 3:
+                raise ValueError("Pick a different parameter for each axis")
+
+            values_sw = [axis_values(text) for text in swept.values()]
+
+            if min(len(values_sw[0]), len(values_sw[1])) < 2:
+                raise ValueError("X and Y ranges need at least two values each")
+
+            spec_sw = {
+                "swept": swept,
+                "fixed": fixed,
+                "ownship": {
+                    "post_cpa_sec": post_cpa_sec_sw,
+                    "lat_deg": os_lat_sw,
+                    "lon_deg": os_lon_sw,
+                    "alt_ft": os_alt_ft_sw,
+                    "course_deg": os_course_sw,
+                    "ground_speed_kt": os_speed_kt_sw,
+                    "vertical_speed_fpm": os_vspeed_fpm_sw
+                }
+            }
+
+            axes_sw = {
+                SWEEP_PARAMETERS[label][0]: SWEEP_PARAMETERS[label][1](values)
+                for label, values in zip(swept, values_sw)
+            }
+
+            encounters_sw = sweep_size(axes_sw)
+            if encounters_sw > MAX_SWEEP_POINTS:
+                raise ValueError(f"{encounters_sw} encounters; the sweep tab is limited to {MAX_SWEEP_POINTS} (use sweep.py)")
+
+            key_sw = scenario_key({"mode": "sweep", **spec_sw})
+
+            if store.select("sweep", key_sw):
+
+                st.session_state.sweep_result = store.get(key_sw)[1]
+
+                st.success("Sweep restored from this session!")
+
+            else:
+
+                base_sw = {
+                    SWEEP_PARAMETERS[label][0]: SWEEP_PARAMETERS[label][1](value)
+                    for label, value in fixed.items()
+                }
+                base_sw.update(
+                    os_lat_deg=os_lat_sw,
+                    os_lon_deg=os_lon_sw,
+                    os_alt_m=ft_to_m(os_alt_ft_sw),
+                    os_course_deg=os_course_sw,
+                    os_speed_mps=kt_to_mps(os_speed_kt_sw),
+                    os_vspeed_mps=fpm_to_mps(os_vspeed_fpm_sw),
+                    post_cpa_sec=post_cpa_sec_sw
+                )
+
+                rows_sw = solve_sweep_with_progress(axes_sw, base_sw)
+
+                sweep_bundle = ScenarioBundle()
+                sweep_bundle.add("sweep_results.csv", sweep_csv(axes_sw, rows_sw))
+                sweep_bundle.add("sweep_spec.json", json.dumps({**spec_sw, "encounters": encounters_sw}, indent=4))
+
+                st.session_state.sweep_result = {
+                    "key": key_sw,
+                    "labels": list(swept),
+                    "values": values_sw,
+                    "rows": rows_sw
+                }
+
+                store.put("sweep", key_sw, sweep_bundle, meta=st.session_state.sweep_result)
+
+                st.success(f"{encounters_sw} encounters solved!")
+
+        except Exception as e:
+            st.error(f"Error: {e}")
+
+
+    # -------------------------------------------------
+    # HEATMAPS
+    # -------------------------------------------------
+
+    sweep_result = st.session_state.sweep_result
+
+    if sweep_result is not None:
+
+        st.markdown("---")
+        st.subheader("CPA Separation Heatmaps")
+
+        slice_index = 0
+        if len(sweep_result["labels"]) == 3:
+            slice_values = sweep_result["values"][2]
+            slice_index = st.select_slider(
+                sweep_result["labels"][2],
+                options=list(range(len(slice_values))),
+                format_func=lambda i: f"{slice_values[i]:g}",
+                key=f"sw_slice_{sweep_result['key']}"
             )
+
+        st.image(sweep_heatmap_png(sweep_result["key"], slice_index, sweep_result), width="stretch")
+
+
+    # -------------------------------------------------
+    # DOWNLOAD
+    # -------------------------------------------------
+
+    if sweep_result is not None and store.current("sweep") is not None:
+
+        st.markdown("---")
+        st.subheader("SWEEP BUNDLE")
+
+        st.download_button(
+            "Download Sweep Bundle",
+            data=store.payload("sweep", "sweep.zip", lambda b: b.to_zip(compression=zipfile.ZIP_DEFLATED)),
+            file_name="sweep_bundle.zip",
+            mime="application/zip",
+            key="sw_zip"
+        )
@@ -0,0 +1,274 @@
+import argparse
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from conflict_math import compute_conflict_geometry_batch
+from units import ft_to_m, kt_to_mps, fpm_to_mps
+
+# =========================================================
+# PARAMETER SWEEP
+# Expands the Cartesian product of the swept encounter
+# parameters lazily (by flat index, never as a full grid),
+# solves it chunk by chunk through the batch geometry and
+# streams each chunk to CSV as soon as it finishes.
+# =========================================================
+
+SWEEP_AXES = (
+    "tcpa_sec",
+    "cpa_horiz_m",
+    "relative_heading_deg",
+    "rel_speed_mps",
+    "conflict_dh_m",
+    "target_alto_m",
+)
+
+RESULT_COLUMNS = (
+    "tgt_course_deg",
+    "tgt_start_lat",
+    "tgt_start_lon",
+    "tgt_start_alt_m",
+    "cpa_sep_horiz_m",
+    "cpa_sep_vert_m",
+    "cpa_sep_3d_m",
+)
+
+
+def axis_values(spec):
+    """
+    Parse one axis: "start:stop:step" (stop inclusive), "a,b,c" or a
+    single number.
+    """
+    spec = str(spec).strip()
+
+    if ":" in spec:
+        start, stop, step = (float(p) for p in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Sweep step must be positive: {spec}")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        return start + step * np.arange(max(count, 0))
+
+    return np.array([float(p) for p in spec.split(",")])
+
+
+def sweep_size(axes):
+    size = 1
+    for values in axes.values():
+        size *= len(values)
+    return size
+
+
+def sweep_chunk(axes, start, stop):
+    """
+    Materialize flat indices [start, stop) of the product as arrays.
+    Axes vary in declaration order, the last one fastest.
+    """
+    names = list(axes)
+    shape = tuple(len(axes[n]) for n in names)
+
+    idx = np.unravel_index(np.arange(start, stop), shape)
+
+    return {name: np.asarray(axes[name])[i] for name, i in zip(names, idx)}
+
+
+def iter_sweep_chunks(axes, chunk_size):
+    """Yield (start, stop) index ranges covering the whole product."""
+    total = sweep_size(axes)
+    for start in range(0, total, chunk_size):
+        yield start, min(start + chunk_size, total)
+
+
+def run_sweep_chunk(axes, base, start, stop):
+    """
+    Solve one chunk. Runs in a worker process; axes/base are small, so
+    only the index range travels per task.
+    """
+    swept = sweep_chunk(axes, start, stop)
+
+    points = compute_conflict_geometry_batch(**{**base, **swept})
+
+    n = stop - start
+    columns = [np.arange(start, stop)]
+    columns += [np.broadcast_to(swept[name], n) for name in axes]
+    columns += [
+        points["tgt_course_deg"],
+        points["tgt_start"][..., 0],
+        points["tgt_start"][..., 1],
+        points["tgt_start"][..., 2],
+        points["cpa_sep_horiz_m"],
+        points["cpa_sep_vert_m"],
+        points["cpa_sep_3d_m"],
+    ]
+
+    return np.column_stack(columns)
+
+
+def check_axes(axes, base):
+    unknown = set(axes) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Unsupported sweep axes: {sorted(unknown)}")
+
+    overlap = set(axes) & set(base)
+    if overlap:
+        raise ValueError(f"Parameters both swept and fixed: {sorted(overlap)}")
+
+
+def sweep_header(axes):
+    return ["index", *axes, *RESULT_COLUMNS]
+
+
+def solve_sweep(axes, base, chunk_size=50000, progress=None):
+    """
+    In-memory run_sweep for sweeps that fit in RAM (e.g. the Streamlit
+    sweep tab): one array of rows (sweep_header columns) in flat index
+    order, so a result column reshapes to the axis grid with
+    rows[:, k].reshape([len(v) for v in axes.values()]).
+    """
+    check_axes(axes, base)
+
+    total = sweep_size(axes)
+    rows = np.empty((total, 1 + len(axes) + len(RESULT_COLUMNS)))
+
+    for start, stop in iter_sweep_chunks(axes, chunk_size):
+        rows[start:stop] = run_sweep_chunk(axes, base, start, stop)
+        if progress is not None:
+            progress(stop, total)
+
+    return rows
+
+
+def sweep_csv(axes, rows):
+    """rows of solve_sweep as CSV bytes, same layout as run_sweep."""
+    text = io.StringIO(newline="")
+    csv.writer(text).writerow(sweep_header(axes))
+    np.savetxt(text, rows, delimiter=",", fmt="%.10g")
+    return text.getvalue().encode("utf-8")
+
+
+def run_sweep(axes, base, out_path, chunk_size=50000, workers=None, progress=None):
+    """
+    Run a full sweep and stream results to out_path (CSV).
+
+    axes: {geometry kwarg: values} for the swept parameters (SI units,
+          any subset of SWEEP_AXES)
+    base: geometry kwargs held fixed for every point
+    workers: process count; 0 solves inline in this process
+    progress: optional callable(done_rows, total_rows)
+
+    Rows are written in completion order; the leading "index" column is
+    the flat position in the product.
+    """
+    check_axes(axes, base)
+
+    total = sweep_size(axes)
+    done = 0
+
+    with open(out_path, "w", newline="") as f:
+
+        csv.writer(f).writerow(sweep_header(axes))
+
+        def emit(rows):
+            nonlocal done
+            np.savetxt(f, rows, delimiter=",", fmt="%.10g")
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+
+        chunks = iter_sweep_chunks(axes, chunk_size)
+
+        if workers == 0:
+            for start, stop in chunks:
+                emit(run_sweep_chunk(axes, base, start, stop))
+            return total
+
+        workers = workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+
+            # Keep a bounded window of chunks in flight so the product is
+            # never queued (or held) in full
+            max_in_flight = 2 * workers
+            pending = set()
+
+            for start, stop in chunks:
+                pending.add(pool.submit(run_sweep_chunk, axes, base, start, stop))
+
+                if len(pending) >= max_in_flight:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        emit(fut.result())
+
+            for fut in wait(pending).done:
+                emit(fut.result())
+
+    return total
+
+
+# =========================================================
+# CLI
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Sweep encounter parameters through the batch geometry"
+    )
+
+    parser.add_argument("--out", default="sweep_results.csv")
+    parser.add_argument("--chunk_size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None)
+
+    # Swept axes: "start:stop:step", "a,b,c" or a single value
+    # (negative values need the --flag=value form)
+    parser.add_argument("--tcpa_sec", default="60")
+    parser.add_argument("--cpa", default="20")
+    parser.add_argument("--relative_heading", default="95")
+    parser.add_argument("--rel_speed", default="10")
+    parser.add_argument("--conflict_dh", default="30")
+    parser.add_argument("--tgt_alto", default="20")
+
+    # Fixed ownship state
+    parser.add_argument("--post_cpa_sec", type=float, default=600)
+    parser.add_argument("--os_lat", type=float, default=37.618805)
+    parser.add_argument("--os_lon", type=float, default=-122.375416)
+    parser.add_argument("--os_alt", type=float, default=50)
+    parser.add_argument("--os_course", type=float, default=90)
+    parser.add_argument("--os_speed", type=float, default=20)
+    parser.add_argument("--os_vspeed", type=float, default=1)
+
+    args = parser.parse_args(argv)
+
+    axes = {
+        "tcpa_sec": axis_values(args.tcpa_sec),
+        "cpa_horiz_m": ft_to_m(axis_values(args.cpa)),
+        "relative_heading_deg": axis_values(args.relative_heading),
+        "rel_speed_mps": kt_to_mps(axis_values(args.rel_speed)),
+        "conflict_dh_m": ft_to_m(axis_values(args.conflict_dh)),
+        "target_alto_m": ft_to_m(axis_values(args.tgt_alto)),
+    }
+
+    base = {
+        "os_lat_deg": args.os_lat,
+        "os_lon_deg": args.os_lon,
+        "os_alt_m": ft_to_m(args.os_alt),
+        "os_course_deg": args.os_course,
+        "os_speed_mps": kt_to_mps(args.os_speed),
+        "os_vspeed_mps": fpm_to_mps(args.os_vspeed),
+        "post_cpa_sec": args.post_cpa_sec,
+    }
+
+    print(f"Sweeping {sweep_size(axes)} encounters...")
+
+    t0 = time.perf_counter()
+    total = run_sweep(axes, base, args.out, chunk_size=args.chunk_size, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {total} encounters written to {args.out} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ import argparse
 import time
 import json
 import math
-from pymavlink import mavutil
 
 # ==========================================
 # UNIT CONVERSIONS (AVIATION)
@@ -56,6 +55,9 @@ def main():
 
     args = parser.parse_args()
 
+    # Imported here so the helpers above load without pymavlink installed
+    from pymavlink import mavutil
+
     connection_string = f"udpin:{args.mcast_ip}:{args.port}"
 
     print(f"Connecting to {connection_string}...")
@@ -0,0 +1,91 @@
+import numpy as np
+
+from projection import LocalProjector
+
+# =========================================================
+# DENSE TRAJECTORIES
+# Straight-line state propagation from the velocities that
+# compute_conflict_geometry returns. Time t = 0 is the
+# encounter start (os_start / tgt_start); t = tcpa is CPA.
+#
+# Works for a single ConflictGeometry (scalars) and for the
+# batch result (arrays): output shape is
+#   (*batch_shape, len(t), 3)   with columns (lat, lon, alt)
+# =========================================================
+
+
+def time_vector(duration_sec, rate_hz, start_sec=0.0):
+    """Sample times at a fixed rate, both ends included."""
+    count = int(np.floor(duration_sec * rate_hz + 1e-9)) + 1
+    return start_sec + np.arange(count) / rate_hz
+
+
+def _column(value):
+    # Batch fields get a trailing time axis; scalars broadcast as-is
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def _setup(points, ellipsoidal):
+    # Shared by every chunk: start states, the target start as an
+    # east/north offset from the ownship start, and a projector whose
+    # reference trig already carries the time axis
+    os_start = np.asarray(points.os_start, dtype=float)
+    tgt_start = np.asarray(points.tgt_start, dtype=float)
+
+    projector = LocalProjector(
+        os_start[..., 0, None], os_start[..., 1, None], ellipsoidal=ellipsoidal
+    )
+    r0_x, r0_y = projector.to_local(tgt_start[..., 0, None], tgt_start[..., 1, None])
+
+    return os_start, tgt_start, r0_x, r0_y, projector
+
+
+def propagate_states(points, t_sec, ellipsoidal=False):
+    """
+    Ownship and target positions at times t_sec (seconds from start).
+
+    points: ConflictGeometry from compute_conflict_geometry(_batch);
+    ellipsoidal must match the flag the geometry was solved with.
+
+    Returns {"t": t, "os": (..., N, 3), "tgt": (..., N, 3)}.
+    """
+    t = np.asarray(t_sec, dtype=float)
+
+    return _propagate(points, _setup(points, ellipsoidal), t)
+
+
+def iter_states(points, duration_sec, rate_hz, chunk_size=10000, start_sec=0.0, ellipsoidal=False):
+    """
+    Lazy version of propagate_states at a fixed rate: yields the same
+    dicts chunk by chunk (chunk_size samples along the time axis), so
+    hour-long post-CPA windows never sit in memory at once.
+    """
+    count = int(np.floor(duration_sec * rate_hz + 1e-9)) + 1
+
+    state = _setup(points, ellipsoidal)
+
+    for first in range(0, count, chunk_size):
+        t = start_sec + np.arange(first, min(first + chunk_size, count)) / rate_hz
+        yield _propagate(points, state, t)
+
+
+def _propagate(points, state, t):
+
+    os_start, tgt_start, r0_x, r0_y, projector = state
+
+    os_dx = _column(points.vx_os) * t
+    os_dy = _column(points.vy_os) * t
+    os_alt = os_start[..., 2, None] + _column(points.vz_os) * t
+
+    tgt_dx = r0_x + _column(points.vx_tgt) * t
+    tgt_dy = r0_y + _column(points.vy_tgt) * t
+    tgt_alt = tgt_start[..., 2, None] + _column(points.vz_tgt) * t
+
+    os_lat, os_lon = projector.to_latlon(os_dx, os_dy)
+    tgt_lat, tgt_lon = projector.to_latlon(tgt_dx, tgt_dy)
+
+    return {
+        "t": t,
+        "os": np.stack(np.broadcast_arrays(os_lat, os_lon, os_alt), axis=-1),
+        "tgt": np.stack(np.broadcast_arrays(tgt_lat, tgt_lon, tgt_alt), axis=-1),
+    }
@@ -16,4 +16,22 @@ def mps_to_kt(mps):
     return mps / KT_TO_MPS
 
 def fpm_to_mps(fpm):
-    return ft_to_m(fpm) / 60.0
\ No newline at end of file
+    return ft_to_m(fpm) / 60.0
+
+def mps_to_fpm(mps):
+    return m_to_ft(mps) * 60.0
+
+def mmss_to_sec(mmss):
+
+    parts = str(mmss).strip().split(":")
+
+    if len(parts) != 2:
+        raise ValueError(f"Time must be in mm:ss format (example: 01:30), got {mmss!r}")
+
+    minutes = int(parts[0])
+    seconds = int(parts[1])
+
+    if seconds < 0 or seconds >= 60:
+        raise ValueError(f"Seconds must be between 0 and 59, got {mmss!r}")
+
+    return minutes * 60 + seconds
\ No newline at end of file
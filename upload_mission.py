@@ -1,10 +1,11 @@
-from pymavlink import mavutil
 from pathlib import Path
 import time
 
 BASE_DIR = Path(__file__).resolve().parent
 
 def upload(port, filename):
+    from pymavlink import mavutil
+
     m = mavutil.mavlink_connection(port)
     m.wait_heartbeat()
     time.sleep(1)
@@ -18,5 +19,6 @@ def upload(port, filename):
     m.waypoint_set_current_send(0)
     print(f"Uploaded {filename}")
 
-upload("udp:127.0.0.1:14550", "ownership.waypoints")
-upload("udp:127.0.0.1:14551", "target.waypoints")
+if __name__ == "__main__":
+    upload("udp:127.0.0.1:14550", "ownership.waypoints")
+    upload("udp:127.0.0.1:14551", "target.waypoints")
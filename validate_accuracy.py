@@ -1,3 +1,4 @@
+import argparse
 import json
 import math
 import os
@@ -16,12 +17,35 @@ def load_json(path):
 # -------------------------------------------------
 # Main Validation
 # -------------------------------------------------
-def main():
+def load_scenario(args):
+    # From the scenario catalog (by id, or the latest entry) or a log file
+    if args.catalog is None:
+        return load_json(args.scenario)
+
+    from scenario_catalog import ScenarioCatalog
+
+    with ScenarioCatalog(args.catalog) as catalog:
+        scenario = catalog.get(args.scenario_id) if args.scenario_id else catalog.latest()
+
+    if scenario is None:
+        raise ValueError(f"Scenario not found in {args.catalog}: {args.scenario_id or 'latest'}")
+
+    return scenario
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Compare telemetry against the theoretical CPA")
+    parser.add_argument("--scenario", default="scenario_log.json")
+    parser.add_argument("--telemetry", default="telemetry_log.json")
+    parser.add_argument("--catalog", default=None, help="Read the scenario from a scenario catalog instead")
+    parser.add_argument("--scenario_id", default=None, help="Catalog entry (default: latest)")
+    args = parser.parse_args(argv)
 
     print("\nLoading files...\n")
 
-    scenario = load_json("scenario_log.json")
-    telemetry = load_json("telemetry_log.json")
+    scenario = load_scenario(args)
+    telemetry = load_json(args.telemetry)
 
     # -------------------------------------------------
     # Extract Theoretical Values
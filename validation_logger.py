@@ -13,9 +13,9 @@ def sec_to_mmss(seconds: int) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
-def save_validation_log(filename, inputs_dict, points_dict, tcpa_sec):
+def build_validation_log(inputs_dict, points_dict, tcpa_sec):
     """
-    Save aviation-friendly validation log.
+    Build the aviation-friendly validation log as a dict.
     All outputs converted to:
         - feet
         - knots
@@ -96,11 +96,29 @@ def save_validation_log(filename, inputs_dict, points_dict, tcpa_sec):
         }
     }
 
+    return log_data
+
+
+def save_validation_log(filename, inputs_dict, points_dict, tcpa_sec, compact=False, catalog=None):
+    """
+    Save aviation-friendly validation log (see build_validation_log).
+    compact=True writes it without indentation. catalog (a
+    scenario_catalog.ScenarioCatalog) also appends it to the history.
+    """
+
+    log_data = build_validation_log(inputs_dict, points_dict, tcpa_sec)
+
+    if catalog is not None:
+        catalog.add(log_data, source=filename)
+
     # ==============================
     # WRITE FILE
     # ==============================
 
     with open(filename, "w") as f:
-        json.dump(log_data, f, indent=4)
+        if compact:
+            json.dump(log_data, f, separators=(",", ":"))
+        else:
+            json.dump(log_data, f, indent=4)
 
     return filename
\ No newline at end of file
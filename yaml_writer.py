@@ -1,7 +1,21 @@
 # yaml_writer.py
 
-def write_yaml_file(
-    path,
+YAML_HEADER = """# Vehicle initialization file for multi-SITL runner
+# Units:
+#   - heading/course: degrees true (0–360)
+#   - ground_speed: knots
+#   - vertical_speed: feet per minute (positive = climb)
+#   - waypoint_index: define in runner (recommended: 0-based)
+"""
+
+# ArduPilot SITL: instance i listens on 5760 + 10 * i
+SITL_BASE_PORT = 5760
+SITL_PORT_STRIDE = 10
+
+MAX_SYSID = 255
+
+
+def _vehicle_document(
     callsign,
     lat_deg,
     lon_deg,
@@ -10,16 +24,18 @@ def write_yaml_file(
     ground_speed_kt,
     vertical_speed_fpm,
     waypoints_file,
-    sysid
+    sysid,
+    instance=None,
+    port=None
 ):
 
-    content = f"""# Vehicle initialization file for multi-SITL runner
-# Units:
-#   - heading/course: degrees true (0–360)
-#   - ground_speed: knots
-#   - vertical_speed: feet per minute (positive = climb)
-#   - waypoint_index: define in runner (recommended: 0-based)
+    sitl_slot = ""
+    if instance is not None:
+        sitl_slot += f"  instance: {instance}\n"
+    if port is not None:
+        sitl_slot += f"  port: {port}\n"
 
+    return f"""
 version: 1
 
 vehicle:
@@ -27,7 +43,7 @@ vehicle:
   sysid: {sysid}
 
 sitl:
-  home:
+{sitl_slot}  home:
     lat_deg: {lat_deg}
     lon_deg: {lon_deg}
     alt_ft: {alt_ft}
@@ -45,5 +61,177 @@ mission:
   start_automatically: true
 """
 
+
+def render_yaml(
+    callsign,
+    lat_deg,
+    lon_deg,
+    alt_ft,
+    course_deg,
+    ground_speed_kt,
+    vertical_speed_fpm,
+    waypoints_file,
+    sysid,
+    instance=None,
+    port=None
+):
+
+    content = YAML_HEADER + _vehicle_document(
+        callsign=callsign,
+        lat_deg=lat_deg,
+        lon_deg=lon_deg,
+        alt_ft=alt_ft,
+        course_deg=course_deg,
+        ground_speed_kt=ground_speed_kt,
+        vertical_speed_fpm=vertical_speed_fpm,
+        waypoints_file=waypoints_file,
+        sysid=sysid,
+        instance=instance,
+        port=port
+    )
+
+    return content
+
+
+def write_yaml_file(
+    path,
+    callsign,
+    lat_deg,
+    lon_deg,
+    alt_ft,
+    course_deg,
+    ground_speed_kt,
+    vertical_speed_fpm,
+    waypoints_file,
+    sysid
+):
+
+    content = render_yaml(
+        callsign=callsign,
+        lat_deg=lat_deg,
+        lon_deg=lon_deg,
+        alt_ft=alt_ft,
+        course_deg=course_deg,
+        ground_speed_kt=ground_speed_kt,
+        vertical_speed_fpm=vertical_speed_fpm,
+        waypoints_file=waypoints_file,
+        sysid=sysid
+    )
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+# ---------------------------------------------------------
+# Fleet manifests
+# One file for N vehicles instead of one file per vehicle.
+# Vehicle dicts carry the render_yaml keywords; sysid may be
+# omitted (allocated here), instance / port always are.
+# ---------------------------------------------------------
+
+def allocate_fleet(
+    vehicles,
+    first_sysid=1,
+    base_port=SITL_BASE_PORT,
+    port_stride=SITL_PORT_STRIDE
+):
+    """
+    Copies of the vehicle dicts with sysid, instance and port filled in.
+    Explicit sysids are kept; the rest get the lowest free ids from
+    first_sysid up. Vehicle i is SITL instance i on
+    base_port + port_stride * i.
+    """
+    explicit = [v["sysid"] for v in vehicles if v.get("sysid") is not None]
+    if len(set(explicit)) != len(explicit):
+        raise ValueError("Duplicate sysid in fleet")
+
+    taken = set(explicit)
+    next_sysid = first_sysid
+
+    fleet = []
+
+    for instance, vehicle in enumerate(vehicles):
+        vehicle = dict(vehicle)
+
+        if vehicle.get("sysid") is None:
+            while next_sysid in taken:
+                next_sysid += 1
+            vehicle["sysid"] = next_sysid
+            taken.add(next_sysid)
+
+        if not 1 <= vehicle["sysid"] <= MAX_SYSID:
+            raise ValueError(f"sysid {vehicle['sysid']} out of range 1..{MAX_SYSID} ({len(vehicles)} vehicles)")
+
+        vehicle["instance"] = instance
+        vehicle["port"] = base_port + port_stride * instance
+
+        fleet.append(vehicle)
+
+    return fleet
+
+
+def render_fleet_yaml(vehicles, layout="documents", **allocation):
+    """
+    Fleet manifest for the multi-SITL runner as a string.
+
+    layout="documents": one YAML document per vehicle (same fields as
+        render_yaml, plus sitl instance / port), separated by ---
+    layout="indexed": a single document; waypoint files are listed once
+        and vehicles refer to them by index
+
+    allocation: keywords for allocate_fleet (first_sysid, base_port,
+    port_stride).
+    """
+    fleet = allocate_fleet(vehicles, **allocation)
+
+    if layout == "documents":
+        return YAML_HEADER + "---".join(
+            _vehicle_document(**vehicle) for vehicle in fleet
+        )
+
+    if layout != "indexed":
+        raise ValueError(f"Unknown fleet layout: {layout}")
+
+    files = {}
+    for vehicle in fleet:
+        files.setdefault(vehicle["waypoints_file"], len(files))
+
+    lines = [
+        YAML_HEADER,
+        "\n",
+        "version: 1\n",
+        "\n",
+        "fleet:\n",
+        f"  count: {len(fleet)}\n",
+        "  waypoint_files:\n",
+    ]
+    lines += [f'    - "{name}"\n' for name in files]
+    lines.append("  vehicles:\n")
+
+    for v in fleet:
+        lines.append(
+            f'    - {{callsign: "{v["callsign"]}", sysid: {v["sysid"]}, '
+            f'instance: {v["instance"]}, port: {v["port"]}, '
+            f'lat_deg: {v["lat_deg"]}, lon_deg: {v["lon_deg"]}, alt_ft: {v["alt_ft"]}, '
+            f'course_heading_deg: {v["course_deg"]}, ground_speed_kt: {v["ground_speed_kt"]}, '
+            f'vertical_speed_fpm: {v["vertical_speed_fpm"]}, '
+            f'waypoints_file: {files[v["waypoints_file"]]}}}\n'
+        )
+
+    lines += [
+        "  defaults:\n",
+        '    start_mode: "midflight"\n',
+        "    starting_waypoint_index: 0\n",
+        '    auto_set_mode: "AUTO"\n',
+        "    start_automatically: true\n",
+    ]
+
+    return "".join(lines)
+
+
+def write_fleet_yaml(path, vehicles, layout="documents", **allocation):
+
+    content = render_fleet_yaml(vehicles, layout=layout, **allocation)
+
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
\ No newline at end of file